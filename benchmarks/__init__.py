@@ -0,0 +1 @@
+"""Benchmarks of the costs of XCSP Launcher itself (see benchmarks/README.md)."""
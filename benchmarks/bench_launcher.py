@@ -0,0 +1,333 @@
+"""Benchmarks of the overhead of XCSP Launcher.
+
+Synthetic solvers (instances of the simulator bundled in ``xcsp/tools/simulator``) are registered in a temporary solver cache,
+so that the benchmarks only measure the costs of the launcher: starting the CLI, looking up
+solvers, spawning them, parsing their output, killing them on timeout and emitting JSON.
+
+Usage::
+
+    python -m benchmarks.bench_launcher --output results.json
+    python -m benchmarks.bench_launcher --compare results.json --fail-on-regression
+
+Results are stored with the commit they were measured on, so that runs on different
+commits (on the same machine) can be compared.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict
+
+from platformdirs import user_cache_dir, user_data_dir
+from rich.console import Console
+from rich.table import Table
+
+import xcsp.solver.solver as solver_module
+from xcsp import __title__
+from xcsp.solver.registry import SolverRegistry
+from xcsp.solver.solver import Solver
+from xcsp.utils.json import CustomEncoder
+from xcsp.utils.log import init_log
+
+ROOT = Path(__file__).resolve().parent.parent
+SIMULATOR = ROOT / "xcsp" / "tools" / "simulator" / "simulator.py"
+
+SCALES = {
+    "quick": {"repeat": 3, "lookups": 2_000, "solvers": 50, "lines": 20_000, "assignments": 200, "variables": 200},
+    "full": {"repeat": 7, "lookups": 50_000, "solvers": 500, "lines": 500_000, "assignments": 5_000, "variables": 1_000},
+}
+
+
+class SyntheticEnvironment:
+    """Temporary launcher directories whose solver cache contains synthetic solvers."""
+
+    def __init__(self, nb_solvers: int):
+        self._tmp = tempfile.TemporaryDirectory(prefix="xcsp-bench-")
+        root = Path(self._tmp.name)
+        self._environ = {name: os.environ.get(name) for name in ("XDG_CACHE_HOME", "XDG_DATA_HOME", "XDG_CONFIG_HOME")}
+        self.env = dict(os.environ, XDG_CACHE_HOME=str(root / "cache"), XDG_DATA_HOME=str(root / "data"),
+                        XDG_CONFIG_HOME=str(root / "config"), PYTHONPATH=str(ROOT))
+        os.environ.update({name: self.env[name] for name in self._environ})
+        self.instance = root / "instance.xml"
+        self.instance.write_text("<instance format='XCSP3' type='CSP'/>\n")
+        # The CLI asks to bootstrap solvers when none is installed.
+        (Path(user_data_dir(__title__, __title__)) / "solvers" / "synthetic").mkdir(parents=True)
+        self.cache_file = Path(user_cache_dir(__title__, __title__)) / "solver_cache.json"
+        self.cache_file.parent.mkdir(parents=True)
+        self._content = dict()
+        for i in range(nb_solvers):
+            self.register(f"synthetic{i}", ["--solutions=0"], save=False)
+        self._save()
+        self.registry = None
+        self._previous_registry = None
+
+    def register(self, name: str, args, versions=("1.0", "2.0", "3.0"), save: bool = True):
+        """Register a synthetic solver running with the given arguments."""
+        cmd = [sys.executable, str(SIMULATOR), "{{instance}}", *args]
+        self._content[name] = {
+            "path_solver": str(SIMULATOR.parent),
+            "name_solver": name,
+            "id_solver": f"org.xcsp.bench.{name}",
+            "versions": {v: {"cmd": cmd, "options": {"time": "--time={{value}}"},
+                             "alias": ["latest"] if v == versions[-1] else []} for v in versions},
+        }
+        if save:
+            self._save()
+
+    def _save(self):
+        # The registry reloads the cache file when its modification time or size changes.
+        with open(self.cache_file, "w") as f:
+            json.dump(self._content, f)
+
+    def __enter__(self):
+        self.registry = SolverRegistry(self.cache_file)
+        self._previous_registry = solver_module.REGISTRY
+        solver_module.REGISTRY = self.registry
+        return self
+
+    def __exit__(self, *exc):
+        solver_module.REGISTRY = self._previous_registry
+        for name, value in self._environ.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        self._tmp.cleanup()
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Discard what the launcher prints on stdout (results are printed by Solver.solve)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+BENCHMARKS: Dict[str, dict] = {}
+
+
+def benchmark(name: str, unit: str, higher_is_better: bool = False):
+    """Register a benchmark function, which returns one sample per repetition."""
+
+    def decorator(function: Callable):
+        BENCHMARKS[name] = {"function": function, "unit": unit, "higher_is_better": higher_is_better}
+        return function
+
+    return decorator
+
+
+def _solve(name: str, env: SyntheticEnvironment, time_limit=None, delay=None):
+    solver = Solver.lookup(name)
+    solver.set_time_limit(time_limit)
+    if delay is not None:
+        solver.set_delay(delay)
+    with _quiet():
+        solver.solve(str(env.instance))
+    return solver
+
+
+@benchmark("cli_cold_start_version", "ms")
+def bench_cli_version(env, scale):
+    samples = []
+    for _ in range(scale["repeat"]):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(ROOT / "bin" / "main.py"), "--version"], env=env.env,
+                       stdin=subprocess.DEVNULL, capture_output=True, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+@benchmark("cli_cold_start_list_solvers", "ms")
+def bench_cli_list(env, scale):
+    samples = []
+    for _ in range(scale["repeat"]):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(ROOT / "bin" / "main.py"), "-l", "ERROR", "solver", "--solvers", "-j"],
+                       env=env.env, stdin=subprocess.DEVNULL, capture_output=True, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+@benchmark("lookup", "us")
+def bench_lookup(env, scale):
+    names = [f"synthetic{i % scale['solvers']}@{'latest' if i % 2 else '2.0'}" for i in range(scale["lookups"])]
+    samples = []
+    for _ in range(scale["repeat"]):
+        start = time.perf_counter()
+        for name in names:
+            Solver.lookup(name)
+        samples.append((time.perf_counter() - start) / len(names) * 1e6)
+    return samples
+
+
+@benchmark("spawn_latency", "ms")
+def bench_spawn(env, scale):
+    env.register("trivial", ["--solutions=0"])
+    samples = []
+    for _ in range(scale["repeat"]):
+        start = time.perf_counter()
+        _solve("trivial", env)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+@benchmark("parse_throughput", "lines/s", higher_is_better=True)
+def bench_parse(env, scale):
+    objectives = scale["lines"] // 2
+    env.register("verbose", [f"--solutions={objectives}", "--assignment-size=10", "--intermediate"])
+    samples = []
+    for _ in range(scale["repeat"]):
+        start = time.perf_counter()
+        _solve("verbose", env)
+        samples.append(2 * objectives / (time.perf_counter() - start))
+    return samples
+
+
+@benchmark("timeout_kill_latency", "ms")
+def bench_kill(env, scale):
+    env.register("stubborn", ["--solutions=0", "--hang", "--on-sigterm=ignore"])
+    time_limit = 2
+    samples = []
+    for _ in range(min(scale["repeat"], 3)):
+        start = time.perf_counter()
+        _solve("stubborn", env, time_limit=time_limit, delay=1)
+        samples.append((time.perf_counter() - start - time_limit) * 1000)
+    return samples
+
+
+@benchmark("json_emission", "ms")
+def bench_json(env, scale):
+    env.register("large", [f"--solutions={scale['assignments']}", f"--assignment-size={scale['variables']}",
+                           "--intermediate"])
+    solutions = _solve("large", env)._solutions
+    samples = []
+    for _ in range(scale["repeat"]):
+        start = time.perf_counter()
+        json.dumps(solutions.to_dict(), indent=2, cls=CustomEncoder)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scale_name: str = "quick", selected=None) -> dict:
+    """
+    Run the benchmarks.
+
+    Args:
+        scale_name (str): The scale of the benchmarks (one of SCALES).
+        selected: Names of the benchmarks to run (all of them by default).
+
+    Returns:
+        dict: The results, with the environment they were measured in.
+    """
+    scale = SCALES[scale_name]
+    results = {}
+    with SyntheticEnvironment(scale["solvers"]) as env:
+        for name, bench in BENCHMARKS.items():
+            if selected and name not in selected:
+                continue
+            samples = bench["function"](env, scale)
+            results[name] = {
+                "unit": bench["unit"],
+                "higher_is_better": bench["higher_is_better"],
+                "median": statistics.median(samples),
+                "min": min(samples),
+                "max": max(samples),
+                "samples": samples,
+            }
+    return {
+        "commit": _commit(),
+        "date": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "scale": scale_name,
+        "benchmarks": results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Print the comparison of results with a baseline, and return the regressions.
+
+    Args:
+        results (dict): The current results.
+        baseline (dict): The results to compare with.
+        threshold (float): Relative change of the median above which a change is significant.
+
+    Returns:
+        list: The names of the benchmarks which regressed.
+    """
+    table = Table(title=f"Benchmarks: {str(results.get('commit'))[:10]} vs {str(baseline.get('commit'))[:10]}")
+    for column in ["Benchmark", "Unit", "Baseline", "Current", "Change", ""]:
+        table.add_column(column, justify="left" if column == "Benchmark" else "right")
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        reference = baseline.get("benchmarks", {}).get(name)
+        if reference is None or not reference["median"]:
+            continue
+        change = current["median"] / reference["median"] - 1
+        worse = -change if current["higher_is_better"] else change
+        verdict = ""
+        if worse > threshold:
+            verdict = "[red]regression[/red]"
+            regressions.append(name)
+        elif worse < -threshold:
+            verdict = "[green]improvement[/green]"
+        table.add_row(name, current["unit"], f"{reference['median']:.4g}", f"{current['median']:.4g}",
+                      f"{100 * change:+.1f}%", verdict)
+    Console().print(table)
+    return regressions
+
+
+def print_results(results: dict):
+    table = Table(title=f"Launcher benchmarks ({results['scale']}, commit {str(results['commit'])[:10]})")
+    for column in ["Benchmark", "Unit", "Median", "Min", "Max"]:
+        table.add_column(column, justify="left" if column == "Benchmark" else "right")
+    for name, r in results["benchmarks"].items():
+        table.add_row(name, r["unit"], f"{r['median']:.4g}", f"{r['min']:.4g}", f"{r['max']:.4g}")
+    Console().print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the overhead of XCSP Launcher.")
+    parser.add_argument("--scale", choices=list(SCALES), default="quick")
+    parser.add_argument("--only", nargs="*", choices=list(BENCHMARKS), help="Benchmarks to run.")
+    parser.add_argument("--output", type=Path, help="File in which the results are written (JSON).")
+    parser.add_argument("--compare", type=Path, help="Results (JSON) to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative change considered significant when comparing (default: 0.10).")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with a non-zero code if a benchmark regressed.")
+    args = parser.parse_args()
+
+    init_log("ERROR")
+    results = run_benchmarks(args.scale, args.only)
+    print_results(results)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare is not None:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xcsp.analysis.anytime import Timelines, anytime_metrics, load_references, primal_gap, reference_arrays
+
+
+def _bounds(*pairs):
+    return [{"value": v, "wall_clock_time": t, "cpu_time": t} for t, v in pairs]
+
+
+RUNS = [
+    _bounds((1.0, 100), (2.0, 50), (4.0, 10)),
+    [],
+    _bounds((0.5, 20), (3.0, 12), (2.0, 15)),
+]
+
+
+class TestAnytime:
+    def test_primal_gap(self):
+        assert primal_gap([10, 0, -5, 5, np.nan], [10, 0, 5, 10, 10]).tolist() == [0.0, 0.0, 1.0, 0.5, 1.0]
+        assert np.isnan(primal_gap(5, np.nan))
+
+    def test_times(self):
+        timelines = Timelines.from_bounds(RUNS)
+        assert np.array_equal(timelines.first_times(), [1.0, np.nan, 0.5], equal_nan=True)
+        assert np.array_equal(timelines.best_values(), [10, np.nan, 12], equal_nan=True)
+        assert np.array_equal(timelines.times_to_best(), [4.0, np.nan, 3.0], equal_nan=True)
+        assert np.array_equal(timelines.times_to_target(15), [4.0, np.nan, 2.0], equal_nan=True)
+        assert np.array_equal(timelines.best_values(minimize=False), [100, np.nan, 20], equal_nan=True)
+
+    def test_many_runs_with_large_values(self):
+        # Shifting 20000 runs of values around 1e12 into a single range would exceed the precision of floats.
+        counts = [1] * 20000 + [3]
+        values = [float(i) for i in range(20000)] + [10 ** 12, 10 ** 12 - 1, 10 ** 12 - 3]
+        timelines = Timelines(np.arange(len(values), dtype=float), values, counts)
+        assert timelines.running_best()[-3:].tolist() == [10 ** 12, 10 ** 12 - 1, 10 ** 12 - 3]
+        assert timelines.running_best(minimize=False)[-3:].tolist() == [10 ** 12] * 3
+        assert timelines.best_values()[-1] == 10 ** 12 - 3 and timelines.best_values()[5] == 5
+
+    def test_primal_integral(self):
+        timelines = Timelines.from_bounds(RUNS)
+        integrals = timelines.primal_integrals(10, [10, 10, 3], minimize=True)
+        # Run 0: 1 on [0, 1), 0.9 on [1, 2), 0.8 on [2, 4), then 0.
+        assert integrals[0] == pytest.approx(1 + 0.9 + 2 * 0.8)
+        assert integrals[1] == pytest.approx(10)
+        # Run 2 is cut at its horizon: 1 on [0, 0.5), 0.5 on [0.5, 2), 1/3 on [2, 3).
+        assert integrals[2] == pytest.approx(0.5 + 1.5 * 0.5 + 1 / 3)
+        curves = timelines.gap_curves(10, [0.0, 1.0, 5.0])
+        assert curves.tolist() == [[1.0, 0.9, 0.0], [1.0, 1.0, 1.0], [1.0, 0.5, pytest.approx(1 / 6)]]
+
+    def test_single_run_matches_batch(self):
+        metrics = anytime_metrics(RUNS[0], reference=10, horizon=10)
+        assert metrics == {"best": 10.0, "time_to_first": 1.0, "time_to_best": 4.0, "primal_gap": 0.0,
+                           "time_to_reference": 4.0, "primal_integral": pytest.approx(3.5)}
+        assert anytime_metrics([], reference=10)["time_to_first"] is None
+
+    def test_references(self, tmp_path):
+        path = tmp_path / "solutions.json"
+        path.write_text(json.dumps({
+            "a@1": {"x.xml": {"solutions": [9, 7], "last_is_optimum": False},
+                    "y.xml": {"solutions": [1, 2, 3], "last_is_optimum": True}},
+            "b@1": {"x.xml": {"solutions": [8, 5], "last_is_optimum": False},
+                    "y.xml": {"solutions": [2], "last_is_optimum": False}},
+        }))
+        references = load_references(path)
+        assert references["x.xml"] == {"value": 5, "optimal": False, "minimize": True}
+        assert references["y.xml"] == {"value": 3, "optimal": True, "minimize": False}
+        values, minimize = reference_arrays(references, ["dir/y.xml", "z.xml"])
+        assert np.array_equal(values, [3, np.nan], equal_nan=True)
+        assert minimize.tolist() == [False, True]
+
+    def test_repository_references(self):
+        references = load_references(Path(__file__).parent / "xcsp3" / "cop" / "SAT" / "solutions.json")
+        assert references["StillLife-wastage-05-05_c24.xml"]["optimal"]
@@ -0,0 +1,126 @@
+import io
+import queue
+import tarfile
+import threading
+import zipfile
+
+import pytest
+
+from xcsp.utils.archive import _ChunkPipe, extract_archive, download_and_extract
+
+
+def _make_tar(path, members, mode="w:gz"):
+    """Create a tar archive; members maps names to contents (None for directories, a tuple for hard links)."""
+    with tarfile.open(path, mode) as tar:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            if content is None:
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                tar.addfile(info)
+            elif isinstance(content, tuple):
+                info.type = tarfile.LNKTYPE
+                info.linkname = content[0]
+                tar.addfile(info)
+            else:
+                info.size = len(content)
+                info.mode = 0o755
+                tar.addfile(info, io.BytesIO(content))
+    return path
+
+
+class _ChunkedManager:
+    """Download manager serving a local file, feeding the sink chunk by chunk."""
+
+    def __init__(self, source, abort=False):
+        self._source = source
+        self._abort = abort
+
+    def download(self, url, into, sha256=None, sink=None):
+        data = self._source.read_bytes()
+        into.parent.mkdir(parents=True, exist_ok=True)
+        into.write_bytes(data)
+        for i in range(0, len(data), 100):
+            if self._abort and i > 0:
+                sink.abort()
+                break
+            sink.write(data[i:i + 100])
+        return into
+
+
+class TestExtractArchive:
+    def test_single_root_directory_is_flattened(self, tmp_path):
+        archive = _make_tar(tmp_path / "solver.tar.gz", {
+            "solver-1.0": None,
+            "solver-1.0/src/main.c": b"int main() {}",
+            "solver-1.0/run.sh": b"#!/bin/sh",
+            "solver-1.0/run-link": ("solver-1.0/run.sh",),
+        })
+        extract_archive(archive, tmp_path / "dst")
+        assert sorted(p.name for p in (tmp_path / "dst").iterdir()) == ["run-link", "run.sh", "src"]
+        assert (tmp_path / "dst" / "src" / "main.c").read_bytes() == b"int main() {}"
+        assert (tmp_path / "dst" / "run-link").read_bytes() == b"#!/bin/sh"
+
+    def test_several_top_level_entries_are_kept(self, tmp_path):
+        archive = _make_tar(tmp_path / "solver.tar", {
+            "solver/main.c": b"main",
+            "solver/lib/util.c": b"util",
+            "README": b"readme",
+        }, mode="w")
+        extract_archive(archive, tmp_path / "dst")
+        assert sorted(p.name for p in (tmp_path / "dst").iterdir()) == ["README", "solver"]
+        assert (tmp_path / "dst" / "solver" / "lib" / "util.c").read_bytes() == b"util"
+
+    def test_zip(self, tmp_path):
+        with zipfile.ZipFile(tmp_path / "solver.zip", "w") as z:
+            z.writestr("solver/", "")
+            z.writestr("solver/bin/solver.jar", b"jar")
+        extract_archive(tmp_path / "solver.zip", tmp_path / "dst")
+        assert (tmp_path / "dst" / "bin" / "solver.jar").read_bytes() == b"jar"
+
+    def test_unsupported_format(self, tmp_path):
+        (tmp_path / "solver.rar").write_bytes(b"")
+        with pytest.raises(ValueError):
+            extract_archive(tmp_path / "solver.rar", tmp_path / "dst")
+
+
+class TestDownloadAndExtract:
+    @pytest.mark.parametrize("abort", [False, True])
+    def test_streaming_extraction(self, tmp_path, abort):
+        members = {f"solver/file{i}.txt": bytes([i]) * 1000 for i in range(20)}
+        source = _make_tar(tmp_path / "source.tar.xz", members, mode="w:xz")
+        path = download_and_extract("http://example.org/solver.tar.xz", tmp_path / "tmp" / "solver.tar.xz",
+                                    tmp_path / "dst", manager=_ChunkedManager(source, abort))
+        assert path.read_bytes() == source.read_bytes()
+        assert sorted(p.name for p in (tmp_path / "dst").iterdir()) == sorted(f"file{i}.txt" for i in range(20))
+        assert (tmp_path / "dst" / "file7.txt").read_bytes() == bytes([7]) * 1000
+
+
+class TestChunkPipe:
+    def test_close_right_after_last_write(self):
+        pipe = _ChunkPipe()
+        get = pipe._chunks.get
+
+        def racing_get(timeout=None):
+            # The reader times out, then the writer writes its last chunk and closes before the reader checks again.
+            pipe._chunks.get = get
+            pipe.write(b"last")
+            pipe.close()
+            raise queue.Empty
+
+        pipe._chunks.get = racing_get
+        assert pipe.read() == b"last"
+
+    def test_threaded_writer(self):
+        pipe = _ChunkPipe(max_chunks=2)
+        chunks = [bytes([i]) * 1000 for i in range(50)]
+
+        def writer():
+            for chunk in chunks:
+                pipe.write(chunk)
+            pipe.close()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        assert pipe.read() == b"".join(chunks)
+        thread.join()
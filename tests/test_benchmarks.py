@@ -0,0 +1,31 @@
+import pytest
+
+from benchmarks import bench_launcher
+
+
+@pytest.fixture
+def tiny_scale(monkeypatch):
+    monkeypatch.setitem(bench_launcher.SCALES, "tiny", {"repeat": 1, "lookups": 10, "solvers": 3, "lines": 100,
+                                                        "assignments": 5, "variables": 5})
+    return "tiny"
+
+
+class TestLauncherBenchmarks:
+    def test_run(self, tiny_scale):
+        results = bench_launcher.run_benchmarks(tiny_scale, ["lookup", "spawn_latency", "parse_throughput",
+                                                             "json_emission"])
+        assert set(results["benchmarks"]) == {"lookup", "spawn_latency", "parse_throughput", "json_emission"}
+        assert all(r["median"] > 0 for r in results["benchmarks"].values())
+        assert results["python"]
+
+    def test_compare(self):
+        def results(lookup, throughput):
+            return {"commit": None, "benchmarks": {
+                "lookup": {"unit": "us", "higher_is_better": False, "median": lookup},
+                "parse_throughput": {"unit": "lines/s", "higher_is_better": True, "median": throughput},
+            }}
+
+        assert bench_launcher.compare(results(1.0, 100), results(1.0, 100), 0.1) == []
+        assert bench_launcher.compare(results(1.5, 100), results(1.0, 100), 0.1) == ["lookup"]
+        assert bench_launcher.compare(results(1.0, 50), results(1.0, 100), 0.1) == ["parse_throughput"]
+        assert bench_launcher.compare(results(0.5, 200), results(1.0, 100), 0.1) == []
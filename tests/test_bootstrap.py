@@ -0,0 +1,38 @@
+import yaml
+
+from xcsp.utils.bootstrap import build_install_plan, load_install_tasks, dependency_key
+
+
+def _config(tmp_path, id_solver, deps):
+    path = tmp_path / f"{id_solver}.solver.yaml"
+    with open(path, "w") as f:
+        yaml.safe_dump({"id": id_solver, "name": id_solver, "build": {"dependencies": deps}}, f)
+    return path
+
+
+class TestBootstrapPlan:
+    def test_dependency_key(self):
+        assert dependency_key({"git": "https://github.com/xcsp3team/XCSP3-Java-Tools.git"}) == \
+               dependency_key({"git": "https://github.com/xcsp3team/xcsp3-java-tools/"})
+        assert dependency_key({"dir": "lib"}) is None
+
+    def test_shared_dependencies_are_grouped(self, tmp_path):
+        files = [
+            _config(tmp_path, "a", [{"git": "https://example.org/lib.git"}]),
+            _config(tmp_path, "b", [{"url": "https://example.org/other.zip"}]),
+            _config(tmp_path, "c", [{"git": "https://example.org/lib"}, {"url": "https://example.org/x.jar"}]),
+            _config(tmp_path, "d", [{"url": "https://example.org/x.jar"}]),
+            _config(tmp_path, "e", []),
+        ]
+        plan = build_install_plan(load_install_tasks(files))
+        groups = sorted([[t.id_solver for t in g] for g in plan])
+        assert groups == [["a", "c", "d"], ["b"], ["e"]]
+
+    def test_duplicated_ids_are_ignored(self, tmp_path):
+        first = _config(tmp_path, "a", [])
+        other_dir = tmp_path / "other"
+        other_dir.mkdir()
+        second = _config(other_dir, "a", [])
+        tasks = load_install_tasks([first, second])
+        assert len(tasks) == 1
+        assert tasks[0].config_path == first
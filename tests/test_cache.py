@@ -0,0 +1,61 @@
+import json
+import multiprocessing
+import sys
+
+import pytest
+
+import xcsp.utils.paths as paths
+from xcsp.commands.install import set_latest_alias
+from xcsp.solver.cache import Cache
+
+
+def _entry(id_solver, versions):
+    return {
+        "path_solver": f"/tmp/{id_solver}",
+        "name_solver": id_solver.upper(),
+        "id_solver": id_solver,
+        "versions": {v: {"cmd": [id_solver], "options": {}, "alias": []} for v in versions},
+    }
+
+
+def _install_worker(cache_dir, index):
+    paths.get_cache_dir = lambda: cache_dir
+    for v in range(5):
+        Cache.update_entries({f"solver{index}": _entry(f"solver{index}", [str(v)])})
+
+
+class TestCache:
+    def test_update_merges_versions(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(paths, "get_cache_dir", lambda: tmp_path)
+        Cache.update_entries({"ace": _entry("ace", ["2.3"])})
+        Cache.update_entries({"choco": _entry("choco", ["4.10"])})
+        merged = Cache.update_entries({"ace": _entry("ace", ["2.4"])})
+
+        assert set(merged) == {"ace", "choco"}
+        assert set(merged["ace"]["versions"]) == {"2.3", "2.4"}
+        with open(tmp_path / "solver_cache.json") as f:
+            assert json.load(f) == merged
+        assert not list(tmp_path.glob(".solver_cache.json.*"))
+
+    def test_latest_alias_is_decided_on_merged_entry(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(paths, "get_cache_dir", lambda: tmp_path)
+        # Two installations of different versions, each from a snapshot of the cache without any of them.
+        Cache.update_entries({"ace": _entry("ace", ["2.3"])}, normalize=set_latest_alias)
+        merged = Cache.update_entries({"ace": _entry("ace", ["2.4"])}, normalize=set_latest_alias)
+        aliases = {v: e["alias"] for v, e in merged["ace"]["versions"].items()}
+        assert aliases == {"2.3": ["latest"], "2.4": []}
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="relies on the fork start method")
+    def test_concurrent_updates(self, tmp_path):
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_install_worker, args=(tmp_path, i)) for i in range(8)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        assert all(w.exitcode == 0 for w in workers)
+
+        with open(tmp_path / "solver_cache.json") as f:
+            content = json.load(f)
+        assert set(content) == {f"solver{i}" for i in range(8)}
+        assert all(len(e["versions"]) == 5 for e in content.values())
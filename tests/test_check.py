@@ -0,0 +1,15 @@
+import pytest
+
+from xcsp.builder import check
+from xcsp.builder.check import check_available_builder_for_language
+
+
+class TestBuilderCheck:
+    @pytest.mark.parametrize("installed, available", [({"python3"}, True), ({"python"}, True), (set(), False)])
+    def test_python_builders(self, monkeypatch, installed, available):
+        # Many systems only provide python3: each builder is looked up by its whole name.
+        monkeypatch.setattr(check.shutil, "which", lambda name: f"/usr/bin/{name}" if name in installed else None)
+        assert check_available_builder_for_language("python") is available
+
+    def test_builders_are_lists(self):
+        assert all(isinstance(builders, list) for builders in check.MAP_BUILDER.values())
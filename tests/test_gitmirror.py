@@ -0,0 +1,96 @@
+import shutil
+import subprocess
+
+import pytest
+from git import Repo
+
+from xcsp.utils.gitmirror import GitMirrors
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is required")
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def remote(tmp_path):
+    repo = tmp_path / "remote"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "test@example.org")
+    _git(repo, "config", "user.name", "test")
+    (repo / "solver.c").write_text("int main() {}\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "initial")
+    _git(repo, "tag", "1.0")
+    return repo
+
+
+class TestGitMirrors:
+    def test_clone_through_mirror(self, tmp_path, remote):
+        mirrors = GitMirrors(tmp_path / "mirrors", enabled=True)
+        url = remote.as_uri()
+        repo = mirrors.clone(url, tmp_path / "clone")
+
+        mirror = mirrors.mirror_path(url)
+        assert mirror.exists()
+        assert repo.remotes.origin.url == url
+        assert (tmp_path / "clone" / "solver.c").exists()
+        assert "1.0" in [t.name for t in repo.tags]
+
+    def test_fetch_new_tags(self, tmp_path, remote):
+        mirrors = GitMirrors(tmp_path / "mirrors", enabled=True)
+        url = remote.as_uri()
+        repo = mirrors.clone(url, tmp_path / "clone")
+
+        (remote / "solver.c").write_text("int main() { return 0; }\n")
+        _git(remote, "commit", "-q", "-am", "second")
+        _git(remote, "tag", "2.0")
+        mirrors.fetch(repo, url)
+        assert "2.0" in [t.name for t in repo.tags]
+        assert "2.0" in [t.name for t in Repo(mirrors.mirror_path(url)).tags]
+
+    def test_disabled(self, tmp_path, remote):
+        mirrors = GitMirrors(tmp_path / "mirrors", enabled=False)
+        mirrors.clone(remote.as_uri(), tmp_path / "clone", partial=True)
+        assert not (tmp_path / "mirrors").exists()
+        assert (tmp_path / "clone" / "solver.c").exists()
+
+    def test_partial_clone_through_blobless_mirror(self, tmp_path, remote):
+        _git(remote, "config", "uploadpack.allowFilter", "true")
+        mirrors = GitMirrors(tmp_path / "mirrors", enabled=True)
+        url = remote.as_uri()
+        repo = mirrors.clone(url, tmp_path / "clone", partial=True)
+
+        mirror = Repo(mirrors.mirror_path(url))
+        assert mirror.git.config("remote.origin.partialclonefilter") == "blob:none"
+        assert repo.remotes.origin.url == url and repo.git.config("remote.origin.promisor") == "true"
+        assert (tmp_path / "clone" / "solver.c").read_text() == "int main() {}\n"
+
+        (remote / "solver.c").write_text("int main() { return 0; }\n")
+        _git(remote, "commit", "-q", "-am", "second")
+        _git(remote, "tag", "2.0")
+        mirrors.fetch(repo, url)
+        repo.git.checkout("2.0")
+        assert (tmp_path / "clone" / "solver.c").read_text() == "int main() { return 0; }\n"
+
+    def test_submodules_through_mirrors(self, tmp_path, remote):
+        library = tmp_path / "library"
+        library.mkdir()
+        _git(library, "init", "-q")
+        _git(library, "config", "user.email", "test@example.org")
+        _git(library, "config", "user.name", "test")
+        (library / "library.c").write_text("int f() { return 1; }\n")
+        _git(library, "add", ".")
+        _git(library, "commit", "-q", "-m", "initial")
+        _git(remote, "-c", "protocol.file.allow=always", "submodule", "add", "-q", library.as_uri(), "library")
+        _git(remote, "commit", "-q", "-m", "add library")
+
+        mirrors = GitMirrors(tmp_path / "mirrors", enabled=True)
+        repo = mirrors.clone(remote.as_uri(), tmp_path / "clone")
+        assert (tmp_path / "clone" / "library" / "library.c").exists()
+        # The submodule is cloned from its own mirror, but still refers to its remote repository.
+        assert mirrors.mirror_path(library.as_uri()).exists()
+        assert repo.git.config("submodule.library.url") == library.as_uri()
+        assert Repo(tmp_path / "clone" / "library").remotes.origin.url == library.as_uri()
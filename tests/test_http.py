@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from xcsp.utils.http import ChecksumError, DownloadCache, DownloadManager, OfflineError
+
+CONTENT = bytes(range(256)) * 4096
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve CONTENT, supporting Range requests; the first response can be cut midway."""
+
+    def do_GET(self):
+        start = 0
+        content = CONTENT
+        if self.server.gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+            # As servers compressing on the fly, ranges are offsets in the compressed content.
+            content = gzip.compress(CONTENT)
+        range_header = self.headers.get("Range")
+        if range_header is not None:
+            start = int(range_header.split("=")[1].split("-")[0])
+            if start >= len(content):
+                self.send_response(416)
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+        else:
+            self.send_response(200)
+        if content is not CONTENT:
+            self.send_header("Content-Encoding", "gzip")
+        body = content[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.server.ranges.append(range_header)
+        if self.server.fail_once:
+            self.server.fail_once = False
+            self.wfile.write(body[:len(body) // 3])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.fail_once = False
+    httpd.gzip = False
+    httpd.ranges = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, name="solver.tar.gz"):
+    return f"http://127.0.0.1:{server.server_address[1]}/{name}"
+
+
+class TestDownloadManager:
+    def test_download_into_directory(self, server, tmp_path):
+        path = DownloadManager().download(_url(server), tmp_path, hashlib.sha256(CONTENT).hexdigest())
+        assert path == tmp_path / "solver.tar.gz"
+        assert path.read_bytes() == CONTENT
+        assert not list(tmp_path.glob("*.part"))
+
+    def test_interrupted_download_is_resumed(self, server, tmp_path):
+        server.fail_once = True
+        path = DownloadManager().download(_url(server), tmp_path / "archive")
+        assert path.read_bytes() == CONTENT
+        assert server.ranges[0] is None
+        assert server.ranges[1].startswith("bytes=") and server.ranges[1] != "bytes=0-"
+
+    def test_resumed_download_with_content_encoding(self, server, tmp_path):
+        server.gzip = True
+        server.fail_once = True
+        path = DownloadManager().download(_url(server), tmp_path / "archive")
+        assert path.read_bytes() == CONTENT and len(server.ranges) == 2
+
+    def test_checksum_mismatch(self, server, tmp_path):
+        with pytest.raises(ChecksumError):
+            DownloadManager().download(_url(server), tmp_path / "archive", "0" * 64)
+        assert not (tmp_path / "archive").exists()
+        assert not (tmp_path / "archive.part").exists()
+
+    def test_download_all(self, server, tmp_path):
+        manager = DownloadManager(pool_size=4)
+        downloads = [(_url(server, f"v{i}.zip"), tmp_path / f"v{i}.zip", None) for i in range(6)]
+        downloads.append((_url(server, "bad.zip"), tmp_path / "bad.zip", "0" * 64))
+        results = manager.download_all(downloads)
+        assert all(r.read_bytes() == CONTENT for r in results[:6])
+        assert isinstance(results[6], ChecksumError)
+
+
+class TestDownloadCache:
+    def test_cached_file_is_not_downloaded_again(self, server, tmp_path):
+        manager = DownloadManager(cache=DownloadCache(tmp_path / "cache"))
+        first = manager.download(_url(server), tmp_path / "a" / "solver.tar.gz")
+        second = manager.download(_url(server), tmp_path / "b" / "solver.tar.gz")
+        assert len(server.ranges) == 1
+        assert second.read_bytes() == CONTENT
+        assert first.stat().st_ino == second.stat().st_ino
+
+    def test_offline(self, server, tmp_path):
+        cache = DownloadCache(tmp_path / "cache")
+        DownloadManager(cache=cache).download(_url(server), tmp_path / "a")
+        offline = DownloadManager(cache=cache, offline=True)
+        assert offline.download(_url(server), tmp_path / "b").read_bytes() == CONTENT
+        with pytest.raises(OfflineError):
+            offline.download(_url(server, "other.zip"), tmp_path / "c")
+        assert len(server.ranges) == 1
+
+    def test_eviction(self, server, tmp_path):
+        cache = DownloadCache(tmp_path / "cache", max_size=len(CONTENT) + 1)
+        manager = DownloadManager(cache=cache)
+        manager.download(_url(server, "first.zip"), tmp_path / "first.zip")
+        manager.download(_url(server, "second.zip"), tmp_path / "second.zip")
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+        assert (tmp_path / "cache" / DownloadCache.key(_url(server, "second.zip"))).exists()
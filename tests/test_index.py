@@ -0,0 +1,57 @@
+import lzma
+import shutil
+from pathlib import Path
+
+from xcsp.commands.index import index
+from xcsp.utils.instances import InstanceIndex, read_metadata
+
+INSTANCES = Path(__file__).parent / "xcsp3" / "cop"
+STILL_LIFE = INSTANCES / "SAT" / "StillLife-wastage-05-05_c24.xml"
+
+
+class TestIndex:
+    def test_metadata(self, tmp_path):
+        metadata = read_metadata(STILL_LIFE)
+        assert metadata == {"type": "COP", "variables": 105, "arrays": 3, "constraints": 78,
+                            "constraint_types": {"extension": 45, "intension": 26, "sum": 7},
+                            "min_domain_size": 1, "max_domain_size": 99,
+                            "objectives": [{"goal": "maximize", "type": "expression"}]}
+        compressed = tmp_path / "still.xml.lzma"
+        compressed.write_bytes(lzma.compress(STILL_LIFE.read_bytes(), format=lzma.FORMAT_ALONE))
+        assert read_metadata(compressed) == metadata
+
+    def test_incremental(self, tmp_path):
+        instances = tmp_path / "instances"
+        shutil.copytree(INSTANCES, instances)
+        (instances / "broken.xml").write_text("<instance><variables>")
+        stats = InstanceIndex(tmp_path / "index.json").update([instances], workers=1)
+        assert (stats["parsed"], stats["failed"], stats["unchanged"]) == (3, 1, 0)
+
+        (instances / "SAT" / "StillLife-wastage-05-05_c24.xml").rename(instances / "still.xml")
+        instance_index = InstanceIndex(tmp_path / "index.json")
+        stats = instance_index.update([instances], workers=1)
+        # The renamed instance is hashed but not parsed, the broken one is tried again.
+        assert (stats["parsed"], stats["hashed"], stats["unchanged"], stats["removed"]) == (0, 2, 2, 1)
+        assert instance_index.lookup(instances / "still.xml")["constraints"] == 78
+        assert instance_index.lookup(STILL_LIFE) is None
+        assert [e["name"] for e in instance_index.entries([instances / "UNSAT"])] == ["Wordpress-04-05-500_c24.xml"]
+
+    def test_concurrent_updates(self, tmp_path):
+        for tree in ("a", "b"):
+            shutil.copytree(INSTANCES / ("SAT" if tree == "a" else "UNSAT"), tmp_path / tree)
+        InstanceIndex(tmp_path / "index.json").update([tmp_path / "a"], workers=1)
+        # Both indexes are read before any of them is saved, as with two concurrent runs.
+        first, second = InstanceIndex(tmp_path / "index.json"), InstanceIndex(tmp_path / "index.json")
+        (tmp_path / "a" / "StillLife-wastage-05-05_c24.xml").unlink()
+        first.update([tmp_path / "a"], workers=1)
+        second.update([tmp_path / "b"], workers=1)
+        names = [entry["name"] for entry in InstanceIndex(tmp_path / "index.json").entries()]
+        assert names == ["Wordpress-04-05-500_c24.xml"]
+
+    def test_command(self, tmp_path, capsys):
+        args = {"instances": [str(STILL_LIFE)], "index": str(tmp_path / "index.json"), "workers": 1,
+                "rebuild": False, "json_output": True}
+        index(args)
+        first = capsys.readouterr().out
+        index(dict(args, rebuild=True))
+        assert capsys.readouterr().out == first and '"variables": 105' in first
@@ -1,2 +1,168 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import xcsp.utils.paths as paths
+from xcsp.builder.artifacts import BuildCache
+from xcsp.commands import install as install_module
+from xcsp.commands.install import Installer
+from xcsp.utils.profile import Profiler, set_active_profiler
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is required")
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def launcher_dirs(tmp_path, monkeypatch):
+    """Redirect all the directories used by the launcher into a temporary directory."""
+    monkeypatch.setattr(paths, "get_cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(paths, "get_solver_install_dir", lambda: tmp_path / "solvers")
+    monkeypatch.setattr(paths, "get_solver_bin_dir", lambda: tmp_path / "bin")
+    monkeypatch.setattr(install_module, "CACHE", dict())
+    (tmp_path / "cache").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def solver_repo(tmp_path):
+    """Create a git repository of a fake solver with two tagged versions."""
+    repo = tmp_path / "fake-solver"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "test@example.org")
+    _git(repo, "config", "user.name", "test")
+    (repo / "Makefile").write_text("all:\n\tcp solver.sh fake\n\tchmod +x fake\n")
+    for version in ["1.0", "2.0"]:
+        (repo / "solver.sh").write_text(f"#!/bin/sh\necho 'c version {version}'\necho 's UNKNOWN'\n")
+        _git(repo, "add", ".")
+        _git(repo, "commit", "-q", "-m", f"version {version}")
+        _git(repo, "tag", version)
+    return repo
+
+
+def _config(repo):
+    return {
+        "name": "Fake",
+        "id": "org.example.fake",
+        "git": str(repo),
+        "language": "c",
+        "build": {"mode": "manual", "default_steps": [{"cmd": "make"}]},
+        "command": {"template": "{{executable}} {{instance}}", "options": {}},
+        "versions": [
+            {"version": "1.0", "git_tag": "1.0", "executable": "fake"},
+            {"version": "2.0", "git_tag": "2.0", "executable": "fake", "alias": ["latest"]},
+        ],
+    }
+
+
 class TestInstallSolver:
-    pass
\ No newline at end of file
+    @pytest.mark.skipif(shutil.which("make") is None, reason="make is required")
+    def test_install_versions_in_parallel(self, launcher_dirs, solver_repo):
+        Installer(str(solver_repo), "Fake", "org.example.fake", config=_config(solver_repo), jobs=2).install()
+
+        cache = install_module.CACHE["org.example.fake"]
+        assert set(cache["versions"]) == {"1.0", "2.0"}
+        for version in ["1.0", "2.0"]:
+            executable = launcher_dirs / "bin" / "org.example.fake" / f"{version}-{version}" / "fake"
+            assert executable.exists()
+            assert f"c version {version}" in executable.read_text()
+        clone = launcher_dirs / "solvers" / "org.example.fake"
+        assert not (clone / ".worktrees").exists()
+
+    @pytest.mark.skipif(shutil.which("make") is None, reason="make is required")
+    def test_up_to_date_versions_are_kept(self, launcher_dirs, solver_repo, monkeypatch):
+        config = _config(solver_repo)
+        Installer(str(solver_repo), "Fake", "org.example.fake", config=config, jobs=2).install()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("up-to-date versions must not be checked out again")
+
+        monkeypatch.setattr(install_module.VersionDirectory, "checkout", fail)
+        Installer(str(solver_repo), "Fake", "org.example.fake", config=config, jobs=2).install()
+        assert set(install_module.CACHE["org.example.fake"]["versions"]) == {"1.0", "2.0"}
+
+    @pytest.mark.skipif(shutil.which("make") is None, reason="make is required")
+    def test_build_artifacts_are_restored_from_cache(self, launcher_dirs, solver_repo, monkeypatch):
+        config = _config(solver_repo)
+        build_cache = BuildCache(launcher_dirs / "builds")
+        Installer(str(solver_repo), "Fake", "org.example.fake", config=config, jobs=2,
+                  build_cache=build_cache).install()
+        assert len(list((launcher_dirs / "builds").iterdir())) == 2
+
+        shutil.rmtree(launcher_dirs / "bin")
+        monkeypatch.setattr(install_module, "CACHE", dict())
+        monkeypatch.setattr(install_module.VersionDirectory, "checkout",
+                            lambda *args: pytest.fail("cached versions must not be built again"))
+        Installer(str(solver_repo), "Fake", "org.example.fake", config=config, jobs=2,
+                  build_cache=build_cache).install()
+
+        executable = launcher_dirs / "bin" / "org.example.fake" / "2.0-2.0" / "fake"
+        assert "c version 2.0" in executable.read_text()
+        cmd = install_module.CACHE["org.example.fake"]["versions"]["2.0"]["cmd"]
+        assert cmd[0] == str(executable)
+
+    @pytest.mark.skipif(shutil.which("make") is None, reason="make is required")
+    def test_installation_profile(self, launcher_dirs, solver_repo):
+        Installer(str(solver_repo), "Fake", "org.example.fake", config=_config(solver_repo), jobs=2).install()
+
+        profiles = list((launcher_dirs / "cache" / "profiles").glob("install_org.example.fake_*.json"))
+        assert len(profiles) == 1
+        with open(profiles[0]) as f:
+            steps = json.load(f)["steps"]
+        names = [s["name"] for s in steps]
+        for name in ["clone", "checkout", "build", "build step 1", "copy to bin", "solver cache update"]:
+            assert name in names
+        assert sorted(s["attrs"]["version"] for s in steps if s["name"] == "version") == ["1.0", "2.0"]
+
+    @pytest.mark.skipif(shutil.which("make") is None, reason="make is required")
+    def test_installation_is_traced(self, launcher_dirs, solver_repo):
+        profiler = Profiler()
+        set_active_profiler(profiler)
+        try:
+            with profiler.step("command", "command") as command:
+                Installer(str(solver_repo), "Fake", "org.example.fake", config=_config(solver_repo), jobs=2).install()
+        finally:
+            set_active_profiler(None)
+        records = profiler.records()
+        install = next(r for r in records if r.name == "install")
+        assert install.parent is command
+        assert next(r for r in records if r.name == "clone").parent is install
+        tracks = {e["tid"] for e in profiler.to_trace()["traceEvents"] if e["name"] == "version"}
+        assert len(tracks) == 2
+
+    def test_url_dependencies_are_shared(self, launcher_dirs, monkeypatch):
+        targets = []
+        monkeypatch.setattr(install_module, "download", lambda url, into, sha256=None: targets.append(into))
+        monkeypatch.setattr(install_module, "download_and_extract",
+                            lambda url, archive, into, sha256=None: targets.append(into))
+        for id_solver in ["org.example.a", "org.example.b"]:
+            installer = Installer("", id_solver, id_solver)
+            installer._init()
+            installer._manage_file_dependency(dict(), "https://example.org/files/lib.jar")
+            installer._manage_archive_dependency(dict(), "https://example.org/files/tools.tar.gz")
+        # Solvers declaring the same dependency get it in the same directory (see build_install_plan).
+        assert targets == [launcher_dirs / "deps" / "lib", launcher_dirs / "deps" / "tools"] * 2
+
+    def test_local_solver_is_installed_in_place(self, launcher_dirs):
+        sources = launcher_dirs / "local"
+        sources.mkdir()
+        (sources / "solver.py").write_text("print('s UNKNOWN')\n")
+        config = sources / "local.xsc.yaml"
+        config.write_text(json.dumps({
+            "name": "Local", "id": "org.example.local", "path": ".", "language": "python", "system": "all",
+            "build": {"mode": "manual", "default_steps": [{"cmd": "{{python}} -m py_compile solver.py"}]},
+            "command": {"prefix": "{{python}}", "template": "{{executable}} {{instance}}", "options": {}},
+            "versions": [{"version": "1.0", "executable": "solver.py"}],
+        }))
+        install_module.install({"name": None, "id": None, "url": None, "repo": None, "source": None,
+                                "config": str(config), "no_build_cache": True})
+
+        # The path is relative to the configuration file, and the sources are neither cloned nor copied.
+        assert install_module.CACHE["org.example.local"]["path_solver"] == str(sources)
+        assert not (launcher_dirs / "solvers" / "org.example.local").exists()
+        assert (launcher_dirs / "bin" / "org.example.local" / "1.0-1.0" / "solver.py").exists()
@@ -0,0 +1,56 @@
+import lzma
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xcsp.solver.instantiation import VariableLayout, load_layout
+from xcsp.solver.results import AssignmentLog, SolveResult
+from xcsp.solver.solutions import UNDEFINED
+
+INSTANCE = Path(__file__).parent / "xcsp3" / "cop" / "SAT" / "StillLife-wastage-05-05_c24.xml"
+
+
+def _instantiation(variables, values):
+    return f"<instantiation type='solution'> <list> {variables} </list> <values> {values} </values> </instantiation>"
+
+
+class TestInstantiation:
+    def test_layout(self, tmp_path):
+        layout = VariableLayout.from_instance(INSTANCE)
+        assert layout.shapes == {"x": (7, 7), "w": (7, 7), "ws": (7,)}
+        assert layout.offsets == {"x": 0, "w": 49, "ws": 98} and layout.size == 105
+        compressed = tmp_path / "instance.xml.lzma"
+        compressed.write_bytes(lzma.compress(INSTANCE.read_bytes()))
+        assert load_layout(compressed).shapes == layout.shapes
+        assert load_layout(INSTANCE) is load_layout(INSTANCE)
+
+    def test_decode(self):
+        layout = VariableLayout.from_instance(INSTANCE)
+        values = np.arange(105) % 3
+        vector = layout.decode(_instantiation("x[][] w[][] ws[]", " ".join(map(str, values))))
+        assert np.array_equal(vector, values)
+        arrays = layout.views(vector)
+        assert arrays["w"].shape == (7, 7) and arrays["w"][1, 2] == values[49 + 9]
+        assert np.shares_memory(arrays["ws"], vector)
+
+    def test_compact_forms(self):
+        layout = VariableLayout({"x": (2, 3), "y": ()})
+        vector = layout.decode(_instantiation("x[1][] y x[0][1..2]", "0*3 * 5 6"))
+        assert vector.tolist() == [UNDEFINED, 5, 6, 0, 0, 0, UNDEFINED]
+        with pytest.raises(ValueError):
+            layout.decode(_instantiation("x[1][]", "1 2"))
+        with pytest.raises(ValueError):
+            layout.decode(_instantiation("z", "1"))
+
+    def test_result(self):
+        assignments = AssignmentLog()
+        for i in range(3):
+            assignments.append(_instantiation("ws[] x[][]", " ".join([str(i)] * 56)), float(i), float(i))
+        result = SolveResult(INSTANCE, assignments=assignments)
+        assert result.decode_solution()["ws"].tolist() == [2] * 7
+        assert (result.decode_solution(0)["w"] == UNDEFINED).all()
+        assert result.decode_solutions()[:, 98].tolist() == [0, 1, 2]
+        with pytest.raises(ValueError):
+            SolveResult(assignments=assignments).decode_solution()
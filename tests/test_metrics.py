@@ -0,0 +1,58 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from xcsp.utils import metrics
+from xcsp.utils.metrics import Counter, Gauge, Histogram, start_metrics_server
+
+
+@pytest.fixture
+def registered(monkeypatch):
+    """Metrics registered in an empty list, so that the metrics of the launcher are left untouched."""
+    monkeypatch.setattr(metrics, "METRICS", [])
+    return metrics.METRICS
+
+
+class TestMetrics:
+    def test_exposition_format(self, registered):
+        runs = Counter("runs_total", "Runs.", ("status",))
+        active = Gauge("active", "Active.")
+        latency = Histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+        runs.inc(status="OPTIMUM")
+        runs.inc(2, status='a "quoted"\nvalue')
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(3)
+        lines = metrics.render().splitlines()
+        assert "# TYPE runs_total counter" in lines
+        assert 'runs_total{status="OPTIMUM"} 1.0' in lines
+        assert 'runs_total{status="a \\"quoted\\"\\nvalue"} 2.0' in lines
+        assert "active 0.0" in lines
+        assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{le="1.0"} 2' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+        assert "latency_seconds_sum 3.55" in lines
+        assert "latency_seconds_count 3" in lines
+
+    def test_labels_are_checked(self, registered):
+        runs = Counter("runs_total", "Runs.", ("status",))
+        with pytest.raises(ValueError):
+            runs.inc(solver="ace")
+        with pytest.raises(ValueError):
+            runs.inc(-1, status="OPTIMUM")
+
+    def test_server(self):
+        server = start_metrics_server(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(f"{url}/metrics", timeout=10) as response:
+                assert response.headers["Content-Type"] == metrics.CONTENT_TYPE
+                body = response.read().decode()
+            assert "# TYPE xcsp_runs_started_total counter" in body
+            assert "xcsp_active_solver_processes " in body
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/other", timeout=10)
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,44 @@
+import threading
+
+from xcsp.builder.build import JobBudget
+from xcsp.utils.placeholder import replace_core_placeholder, replace_placeholder, available_cores
+
+
+class TestPlaceholder:
+    def test_parallelism_placeholders(self):
+        assert replace_placeholder("make -j {{ JOBS }}", 3) == ["make", "-j", "3"]
+        assert replace_placeholder("make -j{{cores}}", 3) == ["make", f"-j{available_cores()}"]
+        assert replace_placeholder("make -j {{jobs}}") == ["make", "-j", str(available_cores())]
+
+    def test_options_placeholder(self):
+        template = "{{executable}} {{instance}} {{options}}"
+        assert replace_core_placeholder(template, "solver", "bin", "-a 'b c'") == ["solver", "{{instance}}", "-a", "b c"]
+        # Without always_include_options in the configuration.
+        assert replace_core_placeholder(template, "solver", "bin", None) == ["solver", "{{instance}}"]
+
+
+class TestJobBudget:
+    def test_concurrent_builds_share_the_budget(self):
+        budget = JobBudget(8)
+        barrier = threading.Barrier(4)
+        granted = []
+
+        def build():
+            with budget.reserve(budget.total // 4) as jobs:
+                granted.append(jobs)
+                barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=build) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert granted == [2, 2, 2, 2]
+
+    def test_reserve_never_exceeds_budget(self):
+        budget = JobBudget(4)
+        with budget.reserve(3) as first:
+            with budget.reserve(3) as second:
+                assert (first, second) == (3, 1)
+        with budget.reserve() as jobs:
+            assert jobs == 4
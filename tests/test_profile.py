@@ -0,0 +1,99 @@
+import json
+import os
+import pstats
+import sys
+import threading
+
+import pytest
+
+from xcsp.utils.profile import Profiler, active_profiler, profile_launcher, set_active_profiler, step
+from xcsp.utils.system import run_with_usage
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler()
+    set_active_profiler(profiler)
+    yield profiler
+    set_active_profiler(None)
+
+
+class TestProfiler:
+    def test_nested_steps(self, profiler):
+        with step("version", "version", version="1.0") as outer:
+            with step("build"):
+                pass
+            with step("build"):
+                pass
+        records = {r.name: r for r in profiler.records()}
+        assert records["build"].parent is outer
+        assert outer.wall >= records["build"].wall
+        summary = profiler.summary(exclude_categories=("version",))
+        assert list(summary) == ["build"]
+        assert summary["build"]["calls"] == 2
+
+    def test_threads_have_their_own_stack(self, profiler):
+        def work():
+            with step("inner"):
+                pass
+
+        with step("outer"):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        inner = next(r for r in profiler.records() if r.name == "inner")
+        assert inner.parent is None
+
+    @pytest.mark.skipif(not hasattr(os, "wait4"), reason="child usage requires os.wait4")
+    def test_child_usage(self, profiler):
+        code = "x = sum(i * i for i in range(2_000_000)); b = bytearray(64 * 1024 * 1024)"
+        with step("outer") as outer:
+            with step("command") as command:
+                assert run_with_usage([sys.executable, "-c", code]) == 0
+        assert command.cpu > 0
+        assert command.max_rss >= 64 * 1024 * 1024
+        assert outer.max_rss == command.max_rss
+
+    def test_no_active_profiler(self):
+        assert active_profiler() is None
+        with step("nothing") as record:
+            assert record is None
+
+    def test_merge_and_trace(self, profiler):
+        other = Profiler()
+        with other.step("install", "command", solver="ace"):
+            with other.step("build", "build"):
+                pass
+        with step("bootstrap", "command") as parent:
+            profiler.merge(other.records(), other.epoch, parent)
+        records = {r.name: r for r in profiler.records()}
+        assert records["install"].parent is parent and records["build"].parent is records["install"]
+        assert len({r.id for r in records.values()}) == 3
+
+        events = profiler.to_trace()["traceEvents"]
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        assert spans["install"]["args"]["solver"] == "ace"
+        assert spans["install"]["ts"] <= spans["build"]["ts"]
+        assert spans["build"]["ts"] + spans["build"]["dur"] <= spans["install"]["ts"] + spans["install"]["dur"] + 1
+        assert {e["name"] for e in events if e["ph"] == "M"} == {"process_name", "thread_name"}
+
+    def test_profile_launcher(self, tmp_path, capsys):
+        output = tmp_path / "launcher.prof"
+        with profile_launcher("solver", output):
+            with step("lookup", "phase"):
+                sum(range(1000))
+        assert active_profiler() is None
+        assert pstats.Stats(str(output)).total_calls > 0
+        steps = json.loads(output.with_suffix(".json").read_text())["steps"]
+        assert [s["name"] for s in steps] == ["solver", "lookup"]
+        captured = capsys.readouterr()
+        assert "lookup" in captured.err and captured.out == ""
+
+    def test_trace_only(self, tmp_path, capsys):
+        trace = tmp_path / "trace.json"
+        with profile_launcher("solver", trace=trace):
+            with step("lookup", "phase"):
+                pass
+        events = json.loads(trace.read_text())["traceEvents"]
+        assert [e["name"] for e in events if e["ph"] == "X"] == ["solver", "lookup"]
+        assert not list(tmp_path.glob("*.prof"))
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+from xcsp.solver.registry import SolverRegistry
+
+
+def _write_cache(path, versions):
+    cache = {
+        "fr.cril.xcsp.ace": {
+            "path_solver": "/tmp/ace",
+            "name_solver": "ACE",
+            "id_solver": "fr.cril.xcsp.ace",
+            "versions": {
+                v: {"cmd": ["ace", "{{instance}}"], "options": {}, "alias": alias}
+                for v, alias in versions.items()
+            },
+        }
+    }
+    with open(path, "w") as f:
+        json.dump(cache, f)
+
+
+class TestSolverRegistry:
+    def test_lookup_by_version_and_alias(self, tmp_path):
+        cache_file = tmp_path / "solver_cache.json"
+        _write_cache(cache_file, {"2.3": [], "2.4": ["latest"]})
+        registry = SolverRegistry(cache_file)
+
+        assert len(registry) == 2
+        assert registry.get("ace", "2.3").version == "2.3"
+        assert registry.get("Ace", "latest").version == "2.4"
+        assert registry.get("ace", "9.9") is None
+        assert "ACE@latest" in registry
+
+    def test_missing_cache_file(self, tmp_path):
+        registry = SolverRegistry(tmp_path / "missing.json")
+        assert len(registry) == 0
+        assert registry.get("ace") is None
+
+    def test_reload_when_file_changes(self, tmp_path):
+        cache_file = tmp_path / "solver_cache.json"
+        _write_cache(cache_file, {"2.3": ["latest"]})
+        registry = SolverRegistry(cache_file)
+        assert registry.get("ace").version == "2.3"
+
+        _write_cache(cache_file, {"2.3": [], "2.4": ["latest"]})
+        st = os.stat(cache_file)
+        os.utime(cache_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert registry.get("ace").version == "2.4"
+        assert [e.version for e in registry.versions_of("ACE")] == ["2.3", "2.4"]
+
+    @pytest.mark.parametrize("name", ["ace", "ACE@2.3", "ace@latest"])
+    def test_solver_lookup(self, tmp_path, monkeypatch, name):
+        from xcsp.solver import solver as solver_module
+        cache_file = tmp_path / "solver_cache.json"
+        _write_cache(cache_file, {"2.3": ["latest"]})
+        monkeypatch.setattr(solver_module, "REGISTRY", SolverRegistry(cache_file))
+
+        s = solver_module.Solver.lookup(name)
+        assert s.name == "ACE"
+        assert s.version == "2.3"
+        with pytest.raises(ValueError):
+            solver_module.Solver.lookup("ace@1.0")
@@ -0,0 +1,71 @@
+import csv
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from xcsp.analysis.campaign import Runs, load_results
+from xcsp.commands.report import report
+
+
+def _result(solver, instance, status, time, bounds=(), exit_code=0, timeout=False, time_limit=10):
+    return {"solver": solver, "version": "1.0", "instance": instance, "time_limit": time_limit, "status": status,
+            "bounds": [{"value": v, "wall_clock_time": 0.0, "cpu_time": 0.0} for v in bounds],
+            "assignments": [], "wall_clock_time": time, "cpu_time": time / 2, "exit_code": exit_code,
+            "timeout": timeout}
+
+
+RESULTS = [
+    _result("A", "csp1.xml", "SATISFIABLE", 1.0),
+    _result("B", "csp1.xml", "UNKNOWN", 10.5, timeout=True),
+    _result("A", "csp2.xml", "UNSATISFIABLE", 12.0),
+    _result("B", "csp2.xml", "UNSATISFIABLE", 3.0),
+    _result("A", "cop1.xml", "OPTIMUM FOUND", 2.0, bounds=(9, 5)),
+    _result("B", "cop1.xml", "SATISFIABLE", 10.2, bounds=(8, 6), timeout=True),
+    _result("A", "cop2.xml", "SATISFIABLE", 10.1, bounds=(1, 3), timeout=True),
+    _result("B", "cop2.xml", "ERROR", 0.5, bounds=(7,), exit_code=1),
+]
+
+
+class TestCampaign:
+    def test_summary(self):
+        runs = Runs.from_results(RESULTS)
+        assert runs.solved().tolist() == [True, False, False, True, True, False, False, False]
+        rows = {row["solver"]: row for row in runs.summary(k=2)}
+        assert rows["A@1.0"]["solved"] == 2 and rows["B@1.0"]["solved"] == 1
+        assert rows["A@1.0"]["par2"] == pytest.approx((1 + 20 + 2 + 20) / 4)
+        assert rows["B@1.0"]["timeouts"] == 2 and rows["B@1.0"]["errors"] == 1
+        # cop1 is minimized (best 5, found by A), cop2 is maximized (the error of B does not count).
+        assert rows["A@1.0"]["cop_score"] == 2 and rows["B@1.0"]["cop_score"] == 0
+        assert rows["VBS"]["solved"] == 3
+        assert rows["VBS"]["par2"] == pytest.approx((1 + 3 + 2 + 20) / 4)
+        assert runs.minimize().tolist() == [True, False, True, True]
+
+    def test_time_limit(self):
+        runs = Runs.from_results([dict(r, time_limit=None) for r in RESULTS])
+        with pytest.raises(ValueError):
+            runs.solved()
+        assert runs.solved(time_limit=2.5).sum() == 2
+
+    def test_cactus(self):
+        curves = Runs.from_results(RESULTS).cactus()
+        assert curves["A@1.0"].tolist() == [1.0, 2.0]
+        assert curves["B@1.0"].tolist() == [3.0]
+        assert curves["VBS"].tolist() == [1.0, 2.0, 3.0]
+
+    def test_report_command(self, tmp_path, capsys):
+        (tmp_path / "runs").mkdir()
+        (tmp_path / "runs" / "a.json").write_text(json.dumps(RESULTS[0]))
+        (tmp_path / "runs" / "b.jsonl").write_text("\n".join(json.dumps(r) for r in RESULTS[1:]))
+        assert len(load_results([tmp_path / "runs"])) == len(RESULTS)
+        report({"results": [str(tmp_path / "runs")], "cpu_time": False, "references": None, "par": 2,
+                "time_limit": None, "json_output": True, "csv": str(tmp_path / "csv")})
+        printed = json.loads(capsys.readouterr().out)
+        assert [row["solver"] for row in printed["summary"]] == ["A@1.0", "B@1.0", "VBS"]
+        with open(tmp_path / "csv" / "cactus.csv") as f:
+            assert len(list(csv.DictReader(f))) == 6
+        with open(tmp_path / "csv" / "instances.csv") as f:
+            instances = {row["instance"]: row for row in csv.DictReader(f)}
+        assert instances["csp2.xml"]["vbs_solver"] == "B@1.0"
+        assert instances["cop2.xml"]["best_value"] == "3.0"
@@ -0,0 +1,44 @@
+import shutil
+import subprocess
+
+import pytest
+
+from xcsp.solver.resolver import find_local_config
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+class TestFindLocalConfig:
+    def test_extension_priority_then_depth(self, tmp_path):
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "ace.solver.yaml").write_text("")
+        (tmp_path / "a" / "b" / "ace.xsc.yaml").write_text("")
+        (tmp_path / "a" / "ace.xsc.yaml").write_text("")
+        assert find_local_config(tmp_path, "ace") == tmp_path / "a" / "ace.xsc.yaml"
+
+    def test_pruned_directories(self, tmp_path):
+        for directory in [".git", "node_modules", "build"]:
+            (tmp_path / directory).mkdir()
+            (tmp_path / directory / "ace.xsc.yaml").write_text("")
+        assert find_local_config(tmp_path, "ace") is None
+        (tmp_path / "configs").mkdir()
+        (tmp_path / "configs" / "ace.xsc").write_text("")
+        assert find_local_config(tmp_path, "ace") == tmp_path / "configs" / "ace.xsc"
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git is required")
+    def test_cached_per_revision(self, tmp_path):
+        _git(tmp_path, "init", "-q")
+        _git(tmp_path, "config", "user.email", "test@example.org")
+        _git(tmp_path, "config", "user.name", "test")
+        (tmp_path / "ace.solver").write_text("")
+        _git(tmp_path, "add", ".")
+        _git(tmp_path, "commit", "-q", "-m", "first")
+        assert find_local_config(tmp_path, "ace") == tmp_path / "ace.solver"
+
+        (tmp_path / "ace.xsc.yaml").write_text("")
+        assert find_local_config(tmp_path, "ace") == tmp_path / "ace.solver"
+        _git(tmp_path, "add", ".")
+        _git(tmp_path, "commit", "-q", "-m", "second")
+        assert find_local_config(tmp_path, "ace") == tmp_path / "ace.xsc.yaml"
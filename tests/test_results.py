@@ -0,0 +1,137 @@
+import json
+
+import pytest
+
+from xcsp.solver.results import (AssignmentLog, BoundTrajectory, SolveResult, open_solution_sink,
+                                 read_solution_sink)
+from xcsp.solver.solutions import DELTA, KEYFRAME, RAW, DeltaSolutions
+from xcsp.solver.solver import CheckStatus, ResultStatusEnum
+from xcsp.utils.json import CustomEncoder
+
+
+def _result():
+    bounds = BoundTrajectory()
+    assignments = AssignmentLog()
+    for i in range(3):
+        bounds.append(10 - i, i * 1.5, i * 0.5)
+        assignments.append(f"{i} {i}", i * 1.5, i * 0.5)
+    return SolveResult(status=ResultStatusEnum.OPTIMUM, bounds=bounds, assignments=assignments, cpu_time=1.0)
+
+
+class TestResults:
+    def test_records(self):
+        result = _result()
+        assert result["bounds"][-1] == {"value": 8, "wall_clock_time": 3.0, "cpu_time": 1.0}
+        assert result["bounds"][:2] == [{"value": 10, "wall_clock_time": 0.0, "cpu_time": 0.0},
+                                        {"value": 9, "wall_clock_time": 1.5, "cpu_time": 0.5}]
+        assert [b["value"] for b in result["bounds"]] == [10, 9, 8]
+        assert len(result["assignments"]) == 3 and result["assignments"][0]["solution"] == "0 0"
+        assert list(result) == ["status", "bounds", "assignments", "cpu_time"]
+        assert not BoundTrajectory() and list(AssignmentLog()) == []
+
+    def test_check_status(self):
+        assignments = _result()["assignments"]
+        assignments.set_check_status(-1, CheckStatus.VALID)
+        assert assignments[2]["status_check"] == CheckStatus.VALID
+        assert "status_check" not in assignments[1]
+
+    def test_large_values(self):
+        bounds = BoundTrajectory()
+        bounds.append(1, 0.0, 0.0)
+        bounds.append(2 ** 70, 1.0, 1.0)
+        assert [b["value"] for b in bounds] == [1, 2 ** 70]
+
+    def test_json(self):
+        result = _result()
+        plain = result.to_dict()
+        assert isinstance(plain["bounds"], list) and isinstance(plain["bounds"][0], dict)
+        expected = json.dumps(plain, cls=CustomEncoder)
+        assert json.dumps(result, cls=CustomEncoder) == expected
+        assert json.loads(expected)["status"] == "OPTIMUM FOUND"
+
+    def test_keep_last_and_count_distinct(self):
+        assignments = AssignmentLog(keep_last=2, count_distinct=True)
+        for i in range(1000):
+            assignments.append(f"{i % 10}", float(i), float(i))
+        assert assignments.total == 1000 and assignments.distinct == 10
+        assert [a["solution"] for a in assignments] == ["8", "9"]
+        assert assignments[-1]["wall_clock_time"] == 999.0
+        assert AssignmentLog().distinct is None
+
+    @pytest.mark.parametrize("name", ["solutions.jsonl", "solutions.jsonl.gz", "solutions.jsonl.xz"])
+    def test_sink(self, tmp_path, name):
+        with open_solution_sink(tmp_path / name) as sink:
+            assignments = AssignmentLog(keep_last=0, sink=sink)
+            for i in range(100):
+                assignments.append(f'<instantiation type="solution"> {i} </instantiation>', i / 10, i / 20)
+        assert len(assignments) == 0 and assignments.total == 100
+        streamed = list(read_solution_sink(tmp_path / name))
+        assert len(streamed) == 100
+        assert streamed[42] == {"solution": '<instantiation type="solution"> 42 </instantiation>',
+                                "wall_clock_time": 4.2, "cpu_time": 2.1}
+
+
+def _instantiation(values):
+    return f"<instantiation> <list> x[] </list> <values> {' '.join(map(str, values))} </values> </instantiation>"
+
+
+class TestDeltaSolutions:
+    def test_random_access(self):
+        vectors = [[i % 7 for i in range(3000)]]
+        for k in range(50):
+            vectors.append(list(vectors[-1]))
+            vectors[-1][(k * 61) % 3000] = 100 + k
+        solutions = DeltaSolutions(max_delta_ratio=0.01)
+        for vector in vectors:
+            solutions.append(_instantiation(vector))
+        assert set(solutions.kinds) == {KEYFRAME, DELTA} and solutions.kinds.count(KEYFRAME) == 2
+        # Deltas only store the changed values.
+        assert len(solutions.data) < 2 * 3000 + 4 * len(vectors)
+        assert solutions[31] == _instantiation(vectors[31]) and solutions[-1] == _instantiation(vectors[-1])
+        assert list(solutions) == [_instantiation(vector) for vector in vectors]
+        assert solutions[10:13] == [_instantiation(vector) for vector in vectors[10:13]]
+
+    def test_raw_solutions(self):
+        solutions = DeltaSolutions(min_length=0)
+        texts = ["0 1", _instantiation(["*", 2]), _instantiation([1, 2, 3]), _instantiation([1, 5, 3]),
+                 "<instantiation> <list> x[] </list> <values> 1 02 </values> </instantiation>",
+                 "<instantiation> <list> x[] </list> <values> 1*2 3 </values> </instantiation>",
+                 _instantiation([1, 5, 3])]
+        for text in texts:
+            solutions.append(text)
+        assert solutions.kinds.tolist() == [RAW, KEYFRAME, KEYFRAME, DELTA, RAW, RAW, KEYFRAME]
+        assert list(solutions) == texts and [solutions[i] for i in range(len(texts))] == texts
+        small = DeltaSolutions()
+        small.append(_instantiation([1, 2]))
+        assert small.kinds.tolist() == [RAW]
+
+    def test_cost_attribute(self):
+        solutions = DeltaSolutions(min_length=0)
+        texts = [f'<instantiation type="solution" cost="{10 - i}"> <list> x[] </list> <values> {i} 1 2 </values> '
+                 f'</instantiation>' for i in range(3)]
+        for text in texts:
+            solutions.append(text)
+        # The solutions only differ by their cost and one value: they share their template.
+        assert solutions.kinds.tolist() == [KEYFRAME, DELTA, DELTA] and solutions.templates == [" x[] "]
+        assert list(solutions) == texts and solutions[1] == texts[1]
+
+    def test_spacing(self):
+        solutions = DeltaSolutions(min_length=0)
+        texts = ["<instantiation><list>x[]</list><values>1 2 3</values></instantiation>",
+                 "<instantiation><list>x[]</list><values>1  2  4</values></instantiation>",
+                 "<instantiation>\n  <list>\n    x[]\n  </list>\n  <values>\n    1 2\n    5\n  </values>\n"
+                 "</instantiation>",
+                 "<instantiation>\n  <list>\n    x[]\n  </list>\n  <values>\n    1 2\n    6\n  </values>\n"
+                 "</instantiation>"]
+        for text in texts:
+            solutions.append(text)
+        assert solutions.kinds.tolist() == [KEYFRAME, DELTA, KEYFRAME, DELTA]
+        assert list(solutions) == texts and [solutions[i] for i in range(len(texts))] == texts
+
+    def test_assignment_log(self):
+        assignments = AssignmentLog()
+        for i in range(3):
+            assignments.append(_instantiation([i] * 500), float(i), float(i))
+        assert assignments.column("solution").kinds.tolist() == [KEYFRAME, DELTA, DELTA]
+        assert assignments[1]["solution"] == _instantiation([1] * 500)
+        assert [a["solution"] for a in assignments.to_list()] == [_instantiation([i] * 500) for i in range(3)]
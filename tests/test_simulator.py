@@ -0,0 +1,170 @@
+import json
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import xcsp
+import xcsp.solver.solver as solver_module
+import xcsp.utils.paths as paths
+from xcsp.commands import install as install_module
+from xcsp.solver.registry import SolverRegistry
+from xcsp.solver.results import read_solution_sink
+from xcsp.solver.solver import ResultStatusEnum, Solver
+from xcsp.utils import metrics
+from xcsp.utils.profile import Profiler, set_active_profiler
+
+SIMULATOR_DIR = Path(xcsp.__file__).parent / "tools" / "simulator"
+
+
+def _simulate(*args, **kwargs):
+    return subprocess.run([sys.executable, str(SIMULATOR_DIR / "simulator.py"), "instance.xml", *args],
+                          capture_output=True, text=True, **kwargs)
+
+
+@pytest.fixture
+def simulator(tmp_path, monkeypatch):
+    """Install the simulator from its configuration file, in temporary launcher directories."""
+    monkeypatch.setattr(paths, "get_cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(paths, "get_solver_install_dir", lambda: tmp_path / "solvers")
+    monkeypatch.setattr(paths, "get_solver_bin_dir", lambda: tmp_path / "bin")
+    monkeypatch.setattr(install_module, "CACHE", dict())
+    monkeypatch.setattr(solver_module, "REGISTRY", SolverRegistry(tmp_path / "cache" / "solver_cache.json"))
+    (tmp_path / "cache").mkdir()
+    sources = shutil.copytree(SIMULATOR_DIR, tmp_path / "simulator", ignore=shutil.ignore_patterns("__pycache__"))
+    install_module.install({"name": None, "id": None, "url": None, "repo": None, "source": None,
+                            "config": str(sources / "simulator.xsc.yaml"), "no_build_cache": True})
+    return tmp_path
+
+
+class TestSimulator:
+    def test_optimization_output(self):
+        lines = _simulate("--solutions", "3", "--assignment-size", "2").stdout.splitlines()
+        assert [line for line in lines if line.startswith("o ")] == ["o 1000", "o 999", "o 998"]
+        assert "s OPTIMUM FOUND" in lines
+        assert sum(line.startswith("v ") for line in lines) == 1
+
+    def test_configuration_file(self, tmp_path):
+        config = tmp_path / "config.json"
+        config.write_text(json.dumps({"problem": "csp", "all_solutions": True, "solutions": 4, "stderr_lines": 2}))
+        result = _simulate("--config", str(config), "--solutions", "2")
+        assert sum(line.startswith("v ") for line in result.stdout.splitlines()) == 2
+        assert "s SATISFIABLE" in result.stdout
+        assert len(result.stderr.splitlines()) == 4
+
+    def test_sigterm(self):
+        process = subprocess.Popen([sys.executable, str(SIMULATOR_DIR / "simulator.py"), "instance.xml",
+                                    "--solutions", "1", "--hang"], stdout=subprocess.PIPE, text=True)
+        assert process.stdout.readline().startswith("c ")
+        assert process.stdout.readline() == "o 1000\n"
+        process.terminate()
+        assert "s SATISFIABLE" in process.communicate(timeout=10)[0]
+
+
+class TestSimulatedSolve:
+    def test_install_and_solve(self, simulator, capsys):
+        solver = Solver.lookup("Simulator@latest")
+        solver.set_collect_intermediate_solutions(True)
+        solver.add_complementary_options(["--solutions=20", "--assignment-size=5", "--stderr-lines=500"])
+        solver.solve(simulator / "instance.xml")
+        assert solver._solutions["status"] == ResultStatusEnum.OPTIMUM
+        assert len(solver._solutions["bounds"]) == 20
+        assert len(solver._solutions["assignments"]) == 20
+
+    @pytest.mark.parametrize("keep_solver_output", [False, True])
+    def test_solver_filling_stderr(self, simulator, capsys, keep_solver_output):
+        solver = Solver.lookup("Simulator@latest")
+        # About 1 MB on the standard error, far more than a pipe holds.
+        solver.add_complementary_options(["--solutions=3", "--stderr-lines=5000"])
+        solver.set_error(simulator / "stderr.txt")
+        solver.set_time_limit(30)
+        solver.solve(simulator / "instance.xml", keep_solver_output=keep_solver_output)
+        assert solver._solutions["status"] == ResultStatusEnum.OPTIMUM and not solver._solutions["timeout"]
+        solver._stderr.close()
+        lines = (simulator / "stderr.txt").read_text().splitlines()
+        assert len(lines) == (3 * 5000 if keep_solver_output else 0)
+
+    def test_bounded_enumeration(self, simulator, capsys):
+        solver = Solver.lookup("Simulator@latest")
+        solver.all_solutions(True)
+        solver.add_complementary_options(["--problem=csp", "--solutions=5000", "--assignment-size=3"])
+        solver.set_keep_last_solutions(1)
+        solver.set_count_distinct(True)
+        solver.set_solution_sink(simulator / "solutions.jsonl.gz")
+        result = solver.solve(simulator / "instance.xml")
+        assert result["nb_solutions"] == 5000
+        # The simulator draws its assignments from a pool of 16.
+        assert result["nb_distinct_solutions"] == 16
+        assert len(result["assignments"]) == 1
+        assert sum(1 for _ in read_solution_sink(simulator / "solutions.jsonl.gz")) == 5000
+
+    def test_timeout_kills_solver_and_children(self, simulator, capsys):
+        solver = Solver.lookup("Simulator@latest")
+        solver.add_complementary_options(["--children=2", "--hang", "--on-sigterm=ignore"])
+        solver.set_time_limit(2)
+        solver.set_delay(1)
+        start = time.monotonic()
+        solver.solve(simulator / "instance.xml")
+        assert time.monotonic() - start < 10
+        assert solver._solutions["status"] == ResultStatusEnum.SATISFIABLE
+
+    def test_runs_are_counted(self, simulator, capsys):
+        before = {name: getattr(metrics, name).value(**labels) for name, labels in [
+            ("RUNS_STARTED", {"solver": "Simulator@1.0"}),
+            ("RUNS_FINISHED", {"solver": "Simulator@1.0", "status": "TIMEOUT"}),
+            ("TIMEOUTS", {"solver": "Simulator@1.0"}),
+            ("TIMEOUT_SIGNALS", {"signal": "SIGTERM"}),
+            ("SPAWN_LATENCY", {}),
+            ("SOLVER_CPU_SECONDS", {"solver": "Simulator@1.0"})]}
+        solver = Solver.lookup("Simulator@latest")
+        solver.add_complementary_options(["--hang"])
+        solver.set_time_limit(2)
+        solver.set_delay(1)
+        # The CPU time used meanwhile by other threads and processes is not the solver's.
+        done = threading.Event()
+        busy = threading.Thread(target=lambda: [None for _ in iter(done.is_set, True)])
+        busy.start()
+        try:
+            solver.solve(simulator / "instance.xml")
+        finally:
+            done.set()
+            busy.join()
+        assert 0 < metrics.SOLVER_CPU_SECONDS.value(solver="Simulator@1.0") - before["SOLVER_CPU_SECONDS"] < 1
+        assert metrics.RUNS_STARTED.value(solver="Simulator@1.0") == before["RUNS_STARTED"] + 1
+        assert metrics.RUNS_FINISHED.value(solver="Simulator@1.0", status="TIMEOUT") == before["RUNS_FINISHED"] + 1
+        assert metrics.TIMEOUTS.value(solver="Simulator@1.0") == before["TIMEOUTS"] + 1
+        assert metrics.TIMEOUT_SIGNALS.value(signal="SIGTERM") == before["TIMEOUT_SIGNALS"] + 1
+        assert metrics.SPAWN_LATENCY.value() == before["SPAWN_LATENCY"] + 1
+        assert metrics.ACTIVE_PROCESSES.value() == 0
+
+    def test_json_output(self, simulator, capsys):
+        solver = Solver.lookup("Simulator@latest")
+        solver.set_json_output(True)
+        solver.solve(simulator / "instance.xml")
+        output = json.loads(capsys.readouterr().out)
+        # The fields documented for the consumers of --json-output (see docs/solving.md).
+        assert list(output) == ["solver", "version", "instance", "time_limit", "status", "bounds", "assignments",
+                                "nb_solutions", "nb_distinct_solutions", "wall_clock_time", "cpu_time", "exit_code",
+                                "timeout"]
+        assert output["solver"] == "Simulator" and output["instance"] == "instance.xml"
+        assert output["exit_code"] == 0 and output["timeout"] is False
+
+    def test_phases_are_profiled(self, simulator, capsys):
+        profiler = Profiler()
+        set_active_profiler(profiler)
+        try:
+            solver = Solver.lookup("Simulator@latest")
+            solver.set_json_output(True)
+            solver.solve(simulator / "instance.xml")
+        finally:
+            set_active_profiler(None)
+        assert set(profiler.summary(exclude_categories=("solve",))) == {"lookup", "spawn", "stdout loop", "serialize"}
+        trace = profiler.to_trace()["traceEvents"]
+        solve = next(e for e in trace if e["name"] == "solve")
+        loop = next(e for e in trace if e["name"] == "stdout loop")
+        assert solve["args"]["solver"] == "Simulator@1.0"
+        assert solve["ts"] <= loop["ts"] and loop["ts"] + loop["dur"] <= solve["ts"] + solve["dur"]
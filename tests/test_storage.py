@@ -0,0 +1,19 @@
+import os
+
+from xcsp.utils.storage import evict_least_recently_used, entry_size
+
+
+class TestStorage:
+    def test_evict_least_recently_used(self, tmp_path):
+        for index, name in enumerate(["old", "middle", "recent"]):
+            entry = tmp_path / name
+            entry.mkdir()
+            (entry / "data").write_bytes(b"x" * 100)
+            os.utime(entry, (1000 + index, 1000 + index))
+        (tmp_path / ".tmp").write_bytes(b"x" * 1000)
+
+        assert entry_size(tmp_path / "old") == 100
+        evicted = evict_least_recently_used(tmp_path, 250)
+        assert [p.name for p in evicted] == ["old"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == [".tmp", "middle", "recent"]
+        assert evict_least_recently_used(tmp_path, 250) == []
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from xcsp.analysis.anytime import Timelines
+from xcsp.analysis.campaign import Runs
+from xcsp.analysis.store import export_results, is_store, load_store
+from xcsp.commands.report import report
+
+
+def _result(solver, instance, status, time, bounds=(), exit_code=0, timeout=False):
+    return {"solver": solver, "version": "2.4", "instance": f"/path/to/{instance}", "time_limit": 10,
+            "status": status, "assignments": [], "wall_clock_time": time, "cpu_time": time,
+            "bounds": [{"value": v, "wall_clock_time": t, "cpu_time": t / 2} for t, v in bounds],
+            "exit_code": exit_code, "timeout": timeout}
+
+
+RESULTS = [
+    _result("A", "cop1.xml", "OPTIMUM FOUND", 2.0, bounds=((0.5, 9), (1.5, 5))),
+    _result("B", "cop1.xml", "SATISFIABLE", 10.2, bounds=((0.1, 8), (3.0, 6)), timeout=True),
+    _result("A", "csp.xml", "UNSATISFIABLE", 1.0),
+    _result("B", "csp.xml", "ERROR", 0.5, exit_code=1),
+    _result("A", "cop2.xml", "SATISFIABLE", 10.1, bounds=((4.0, 1),), timeout=True),
+]
+
+
+def _store_format(name):
+    if name != "npy":
+        pytest.importorskip("pyarrow")
+    return name
+
+
+class TestStore:
+    @pytest.mark.parametrize("store_format", ["npy", "arrow", "parquet"])
+    def test_round_trip(self, tmp_path, store_format):
+        path = export_results(RESULTS, tmp_path / "store", _store_format(store_format))
+        assert is_store(path) and not is_store(tmp_path)
+        store = load_store(path)
+        assert len(store) == len(RESULTS)
+        assert store.runs["instance"].tolist() == ["cop1.xml", "cop1.xml", "csp.xml", "csp.xml", "cop2.xml"]
+        assert store.bounds["run_id"].tolist() == [0, 0, 1, 1, 4]
+        assert store.bounds["value"].tolist() == [9, 5, 8, 6, 1]
+        assert store.bound_counts().tolist() == [2, 2, 0, 0, 1]
+        assert np.isnan(load_store(export_results([dict(RESULTS[2], time_limit=None)], tmp_path / "other",
+                                                  store_format)).runs["time_limit"][0])
+
+    @pytest.mark.parametrize("store_format", ["npy", "arrow", "parquet"])
+    def test_solutions(self, tmp_path, store_format):
+        solutions = [f'<instantiation cost="{i}"> <list> x[] </list> <values> {" ".join([str(i)] * 600)} </values> '
+                     f'</instantiation>' for i in range(4)] + ["0 1"]
+        results = [dict(RESULTS[0], assignments=[{"solution": s, "wall_clock_time": 1.0, "cpu_time": 0.5}
+                                                 for s in solutions[:3]]),
+                   RESULTS[2],
+                   dict(RESULTS[1], assignments=[{"solution": s, "wall_clock_time": 2.0, "cpu_time": 1.0}
+                                                 for s in solutions[3:]])]
+        store = load_store(export_results(results, tmp_path / "store", _store_format(store_format)))
+        assert store.solutions["run_id"].tolist() == [0, 0, 0, 2, 2]
+        # The first solution of each run is a keyframe.
+        assert store.solutions["kind"].tolist() == [1, 2, 2, 1, 0]
+        assert store.run_solutions(0) == solutions[:3] and store.run_solutions(1) == []
+        assert store.run_solutions(2) == solutions[3:]
+        assert store.decoded_solutions()[2] == solutions[2]
+
+    def test_memory_mapped(self, tmp_path):
+        store = load_store(export_results(RESULTS, tmp_path / "store"))
+        assert isinstance(store.bounds["wall_clock_time"], np.memmap)
+        timelines = Timelines.from_store(store)
+        # Bounds in order are not copied.
+        assert np.shares_memory(timelines.times, store.bounds["wall_clock_time"])
+
+    def test_analysis_matches_results(self, tmp_path):
+        store = load_store(export_results(RESULTS, tmp_path / "store"))
+        assert Runs.from_store(store).summary() == Runs.from_results(RESULTS).summary()
+        expected = Timelines.from_bounds([r["bounds"] for r in RESULTS], "cpu_time")
+        actual = Timelines.from_store(store, "cpu_time")
+        assert np.array_equal(actual.primal_integrals(5, 10), expected.primal_integrals(5, 10))
+
+    def test_report_export(self, tmp_path, capsys):
+        args = {"cpu_time": False, "references": None, "par": 2, "time_limit": None, "json_output": True,
+                "csv": None, "store_format": "npy"}
+        (tmp_path / "results.jsonl").write_text("\n".join(json.dumps(r) for r in RESULTS))
+        report(dict(args, results=[str(tmp_path / "results.jsonl")], export=str(tmp_path / "store")))
+        from_json = capsys.readouterr().out
+        report(dict(args, results=[str(tmp_path / "store")], export=None))
+        assert capsys.readouterr().out == from_json
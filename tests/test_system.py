@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+import psutil
+
+from xcsp.utils.system import kill_process
+
+
+class _Solver:
+    is_timeout = False
+
+    def set_is_timeout(self, is_timeout):
+        self.is_timeout = is_timeout
+
+
+class TestKillProcess:
+    def test_children_are_killed(self):
+        script = ("import subprocess, sys, time\n"
+                  "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+                  "print(child.pid, flush=True)\n"
+                  "time.sleep(60)\n")
+        process = psutil.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True)
+        child = psutil.Process(int(process.stdout.readline()))
+        solver = _Solver()
+        kill_process(process, 1, solver)
+        process.wait(timeout=10)
+        # The child, which shares the standard output of the solver, does not outlive it.
+        child.wait(timeout=10)
+        assert not child.is_running() and solver.is_timeout
+        process.stdout.close()
@@ -0,0 +1,356 @@
+"""Anytime performance of solvers on optimization problems.
+
+The bounds found by a solver during a run (see the ``bounds`` of :meth:`xcsp.solver.solver.Solver.solve`)
+tell how good it is at finding good solutions quickly. From them, this module computes the time to
+the first solution, the time to the best solution, the time to reach a target value, the primal gap
+to a reference value over time, and the primal integral (the area under the primal gap curve, as
+defined by Berthold, "Measuring the impact of primal heuristics", 2013).
+
+The bounds of many runs are stored in flat NumPy arrays (see :class:`Timelines`), so that all the
+measures are computed at once for thousands of runs, without a Python loop over the runs.
+NumPy is an optional dependency of XCSP Launcher, installed with ``pip install xcsp[analysis]``.
+"""
+import json
+import math
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from xcsp.solver.results import BoundTrajectory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The analysis of anytime performance requires numpy (pip install xcsp[analysis]).")
+
+
+def primal_gap(values, references):
+    """
+    Compute the primal gap of objective values with respect to reference values.
+
+    The gap of a value x to a reference r is 0 if both are 0, 1 if they have opposite signs or
+    if there is no value (NaN), and |x - r| / max(|x|, |r|) otherwise. It is NaN if the reference
+    is unknown (NaN).
+
+    Args:
+        values: The objective values (a scalar or an array).
+        references: The reference values (e.g. the optimum), broadcast against the values.
+
+    Returns:
+        numpy.ndarray: The gaps, in [0, 1].
+    """
+    _require_numpy()
+    x, r = np.broadcast_arrays(np.asarray(values, dtype=float), np.asarray(references, dtype=float))
+    denominator = np.maximum(np.abs(x), np.abs(r))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gap = np.abs(x - r) / denominator
+    gap = np.where(denominator == 0, 0.0, gap)
+    gap = np.where((x * r < 0) | np.isnan(x), 1.0, gap)
+    return np.where(np.isnan(r), np.nan, gap)
+
+
+class Timelines:
+    """
+    Bounds found over time by a set of runs, stored in flat arrays.
+
+    The bounds of run ``i`` are ``times[offsets[i]:offsets[i] + counts[i]]`` and the corresponding
+    ``values``, sorted by time. Measures are returned as arrays with one entry per run, NaN when
+    they are undefined (e.g. the time to the first solution of a run without solution).
+    """
+
+    def __init__(self, times, values, counts):
+        """
+        Args:
+            times: The times at which the bounds were found, run after run.
+            values: The values of the bounds, run after run.
+            counts: The number of bounds of each run.
+        """
+        _require_numpy()
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.runs = np.repeat(np.arange(len(self.counts)), self.counts)
+        self.times = np.asarray(times, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        # Solvers report their bounds in order: they are only sorted (and copied) when they are not.
+        if not np.all((np.diff(self.times) >= 0) | (np.diff(self.runs) > 0)):
+            order = np.lexsort((self.times, self.runs))
+            self.times = self.times[order]
+            self.values = self.values[order]
+        self.offsets = np.cumsum(self.counts) - self.counts
+
+    @staticmethod
+    def from_bounds(runs: Iterable[List[dict]], clock: str = "wall_clock_time") -> "Timelines":
+        """
+        Create timelines from the bounds of runs, as collected by :meth:`xcsp.solver.solver.Solver.solve`.
+
+        Args:
+            runs: For each run, its bounds: a :class:`~xcsp.solver.results.BoundTrajectory`, or a list of
+                dictionaries with a ``value`` and the times.
+            clock (str): The time to use, "wall_clock_time" or "cpu_time".
+
+        Returns:
+            Timelines: The timelines of the runs.
+        """
+        _require_numpy()
+        runs = list(runs)
+        counts = [len(bounds) for bounds in runs]
+        if all(isinstance(bounds, BoundTrajectory) for bounds in runs):
+            # The columns of the trajectories are concatenated without creating their records.
+            times = np.concatenate([np.asarray(bounds.column(clock), dtype=float) for bounds in runs] or [[]])
+            values = np.concatenate([np.asarray(bounds.column("value"), dtype=float) for bounds in runs] or [[]])
+            return Timelines(times, values, counts)
+        total = sum(counts)
+        times = np.fromiter((b[clock] for bounds in runs for b in bounds), dtype=float, count=total)
+        values = np.fromiter((b["value"] for bounds in runs for b in bounds), dtype=float, count=total)
+        return Timelines(times, values, counts)
+
+    @staticmethod
+    def from_store(store, clock: str = "wall_clock_time") -> "Timelines":
+        """
+        Create the timelines of the runs of a store (see :mod:`xcsp.analysis.store`).
+
+        Args:
+            store (Store): The store.
+            clock (str): The time to use, "wall_clock_time" or "cpu_time".
+
+        Returns:
+            Timelines: The timelines of the runs, in the order of the store.
+        """
+        return Timelines(store.bounds[clock], store.bounds["value"], store.bound_counts())
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _per_run(self, value, dtype=float):
+        return np.broadcast_to(np.asarray(value, dtype=dtype), (len(self),))
+
+    def _signs(self, minimize):
+        return np.where(self._per_run(minimize, bool), 1.0, -1.0)
+
+    def _last(self):
+        nonempty = self.counts > 0
+        return nonempty, (self.offsets + self.counts - 1)[nonempty]
+
+    def _first_time_where(self, mask):
+        """Return, for each run, the time of its first bound satisfying the mask (NaN if there is none)."""
+        result = np.full(len(self), np.nan)
+        indices = np.flatnonzero(mask)
+        runs, first = np.unique(self.runs[indices], return_index=True)
+        result[runs] = self.times[indices[first]]
+        return result
+
+    def running_best(self, minimize=True):
+        """
+        Compute the best value found by each run so far, at the time of each of its bounds.
+
+        Args:
+            minimize: Whether the objective of the runs is minimized (a boolean, or one per run).
+
+        Returns:
+            numpy.ndarray: The best values, aligned with :attr:`values`.
+        """
+        if self.values.size == 0:
+            return self.values.copy()
+        signs = self._signs(minimize)[self.runs]
+        oriented = self.values * signs
+        # Each run is shifted below all the previous ones, so that a single cumulative minimum
+        # restarts at the beginning of each run. The shift is applied to the (integer) ranks of
+        # the values rather than to the values, whose shifted range would exceed the precision of floats.
+        distinct, ranks = np.unique(oriented, return_inverse=True)
+        shift = self.runs * len(distinct)
+        best = distinct[np.minimum.accumulate(ranks.reshape(-1) - shift) + shift]
+        return best * signs
+
+    def first_times(self):
+        """Return the time to the first solution of each run."""
+        result = np.full(len(self), np.nan)
+        nonempty = self.counts > 0
+        result[nonempty] = self.times[self.offsets[nonempty]]
+        return result
+
+    def best_values(self, minimize=True):
+        """Return the best value found by each run."""
+        result = np.full(len(self), np.nan)
+        nonempty, last = self._last()
+        result[nonempty] = self.running_best(minimize)[last]
+        return result
+
+    def times_to_best(self, minimize=True):
+        """Return the time at which each run found its best value."""
+        best = self.running_best(minimize)
+        return self._first_time_where(best == self.best_values(minimize)[self.runs])
+
+    def times_to_target(self, targets, minimize=True):
+        """
+        Compute the time at which each run found a value at least as good as a target.
+
+        Args:
+            targets: The target value (one for all runs, or one per run; NaN for no target).
+            minimize: Whether the objective of the runs is minimized (a boolean, or one per run).
+
+        Returns:
+            numpy.ndarray: The times to the targets (NaN for the runs not reaching them).
+        """
+        signs = self._signs(minimize)
+        targets = self._per_run(targets)
+        return self._first_time_where(self.running_best(minimize) * signs[self.runs]
+                                      <= (targets * signs)[self.runs])
+
+    def primal_gaps(self, references, minimize=True):
+        """
+        Compute the primal gap of each run after each of its bounds.
+
+        Args:
+            references: The reference value of each run (or one for all runs), e.g. the best known value.
+            minimize: Whether the objective of the runs is minimized (a boolean, or one per run).
+
+        Returns:
+            numpy.ndarray: The gaps, aligned with :attr:`values`.
+        """
+        return primal_gap(self.running_best(minimize), self._per_run(references)[self.runs])
+
+    def primal_integrals(self, references, horizons, minimize=True, normalize=False):
+        """
+        Compute the primal integral of each run.
+
+        The primal gap is 1 until the first solution, and then the gap of the best value found so
+        far; it is integrated from 0 to the horizon of the run (bounds found later are ignored).
+
+        Args:
+            references: The reference value of each run (or one for all runs).
+            horizons: The time until which the gap is integrated (e.g. the time limit), for each run.
+            minimize: Whether the objective of the runs is minimized (a boolean, or one per run).
+            normalize (bool): Whether the integrals are divided by the horizons.
+
+        Returns:
+            numpy.ndarray: The primal integrals (NaN for the runs without reference).
+        """
+        horizons = self._per_run(horizons)
+        gaps = self.primal_gaps(references, minimize)
+        start = np.minimum(self.times, horizons[self.runs])
+        end = np.empty_like(start)
+        end[:-1] = start[1:]
+        nonempty, last = self._last()
+        end[last] = horizons[nonempty]
+        integrals = np.bincount(self.runs, weights=gaps * (end - start), minlength=len(self))
+        integrals += np.where(nonempty, np.minimum(self.first_times(), horizons), horizons)
+        return integrals / horizons if normalize else integrals
+
+    def gap_curves(self, references, grid, minimize=True):
+        """
+        Compute the primal gap of each run at given times.
+
+        Args:
+            references: The reference value of each run (or one for all runs).
+            grid: The times at which the gaps are computed, in increasing order.
+            minimize: Whether the objective of the runs is minimized (a boolean, or one per run).
+
+        Returns:
+            numpy.ndarray: A matrix with one row per run and one column per time of the grid.
+        """
+        grid = np.asarray(grid, dtype=float)
+        if self.times.size == 0:
+            return np.ones((len(self), len(grid)))
+        gaps = self.primal_gaps(references, minimize)
+        # Number of bounds of each run found at each time of the grid.
+        columns = np.searchsorted(grid, self.times, side="left")
+        found = np.bincount(self.runs * (len(grid) + 1) + columns, minlength=len(self) * (len(grid) + 1))
+        found = np.cumsum(found.reshape(len(self), len(grid) + 1), axis=1)[:, :len(grid)]
+        last = np.maximum(self.offsets[:, None] + found - 1, 0)
+        return np.where(found > 0, gaps[last], 1.0)
+
+
+def anytime_metrics(bounds: List[dict], reference=None, horizon=None, minimize: bool = True,
+                    clock: str = "wall_clock_time") -> dict:
+    """
+    Compute the anytime measures of a single run.
+
+    Args:
+        bounds (list[dict]): The bounds found by the solver, as collected by :meth:`xcsp.solver.solver.Solver.solve`.
+        reference: The reference value (e.g. the optimum), if known.
+        horizon: The time until which the primal integral is computed (e.g. the time limit), if any.
+        minimize (bool): Whether the objective is minimized.
+        clock (str): The time to use, "wall_clock_time" or "cpu_time".
+
+    Returns:
+        dict: The measures of the run, None when they are undefined.
+    """
+    timelines = Timelines.from_bounds([bounds], clock)
+    metrics = {
+        "best": timelines.best_values(minimize)[0],
+        "time_to_first": timelines.first_times()[0],
+        "time_to_best": timelines.times_to_best(minimize)[0],
+    }
+    if reference is not None:
+        metrics["primal_gap"] = float(primal_gap(metrics["best"], reference))
+        metrics["time_to_reference"] = timelines.times_to_target(reference, minimize)[0]
+        if horizon is not None:
+            metrics["primal_integral"] = timelines.primal_integrals(reference, horizon, minimize)[0]
+    return {k: None if math.isnan(v) else float(v) for k, v in metrics.items()}
+
+
+def load_references(path) -> Dict[str, dict]:
+    """
+    Read reference values from a file in the format of ``tests/xcsp3/cop/SAT/solutions.json``.
+
+    The file maps solvers to instances to the objective values of their successive solutions.
+    For each instance, the reference is the last value of a solver proving it optimal or,
+    failing that, the best last value among the solvers. The direction of the objective is
+    inferred from the order of the values (None when there is only one value).
+
+    Args:
+        path (str | Path): The path of the file.
+
+    Returns:
+        dict: Mapping of instance names to their reference: ``value``, ``optimal`` and ``minimize``.
+    """
+    with open(Path(path)) as f:
+        content = json.load(f)
+    references = dict()
+    for instances in content.values():
+        for name, description in instances.items():
+            values = description.get("solutions") or []
+            if not values:
+                continue
+            reference = {
+                "value": values[-1],
+                "optimal": bool(description.get("last_is_optimum", False)),
+                "minimize": values[-1] < values[0] if len(values) > 1 and values[0] != values[-1] else None,
+            }
+            known = references.get(name)
+            if known is None:
+                references[name] = reference
+                continue
+            if known["minimize"] is None:
+                known["minimize"] = reference["minimize"]
+            if known["optimal"]:
+                continue
+            minimize = known["minimize"]
+            better = minimize is not None and (reference["value"] < known["value"]) == minimize
+            if reference["optimal"] or better:
+                known.update(value=reference["value"], optimal=reference["optimal"])
+    return references
+
+
+def reference_arrays(references: Dict[str, dict], instances: Iterable[str],
+                     default_minimize: bool = True) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Align reference values with runs, to compute the measures of many runs at once.
+
+    Args:
+        references (dict): The references, as returned by :func:`load_references`.
+        instances: The name of the instance of each run.
+        default_minimize (bool): Direction of the objectives which are not known.
+
+    Returns:
+        tuple: The reference value of each run (NaN if unknown), and whether its objective is minimized.
+    """
+    _require_numpy()
+    instances = [Path(i).name for i in instances]
+    values = np.array([references[i]["value"] if i in references else np.nan for i in instances], dtype=float)
+    minimize = np.array([default_minimize if references.get(i, {}).get("minimize") is None
+                         else references[i]["minimize"] for i in instances], dtype=bool)
+    return values, minimize
@@ -0,0 +1,339 @@
+"""Aggregation of the results of many solver runs (a campaign).
+
+The results written by ``xcsp solver --json-output`` (see :meth:`xcsp.solver.solver.Solver.solve`)
+are loaded in columns (see :class:`Runs`), from which the usual measures of a campaign are
+computed at once, without a Python loop over the runs:
+
+- the number of instances solved by each solver, by status;
+- the PAR-k score of each solver (the average run time, in which unsolved runs count k times the time limit);
+- the virtual best solver (VBS), which takes the best run of all the solvers on each instance;
+- cactus plot data (the times of the solved runs of each solver, in increasing order);
+- the score of each solver on optimization problems, as in the XCSP competitions: on each instance,
+  the solvers finding the best bound found by any solver (or the best known value) score one point.
+
+NumPy is an optional dependency of XCSP Launcher, installed with ``pip install xcsp[analysis]``.
+"""
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from loguru import logger
+
+from xcsp.analysis.anytime import _require_numpy
+from xcsp.solver.solver import ResultStatusEnum
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STATUSES = list(ResultStatusEnum)
+
+VBS = "VBS"
+
+
+def load_results(paths: Iterable) -> List[dict]:
+    """
+    Read results of solver runs.
+
+    Args:
+        paths: Files or directories. A ``.json`` file contains a result or a list of results, a ``.jsonl``
+            file contains one result per line, and directories are searched recursively for such files.
+
+    Returns:
+        list[dict]: The results, as produced by :meth:`xcsp.solver.solver.Solver.solve`.
+    """
+    results = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files = sorted(p for p in path.rglob("*") if p.suffix in (".json", ".jsonl"))
+        else:
+            files = [path]
+        for file in files:
+            with open(file) as f:
+                if file.suffix == ".jsonl":
+                    content = [json.loads(line) for line in f if line.strip()]
+                else:
+                    content = json.load(f)
+            for result in content if isinstance(content, list) else [content]:
+                if isinstance(result, dict) and "status" in result:
+                    results.append(result)
+                else:
+                    logger.debug(f"Ignoring content of {file} which is not the result of a solver run.")
+    return results
+
+
+class Runs:
+    """
+    Results of solver runs, stored in columns.
+
+    Solvers (``name@version``) and instances are encoded as indices in :attr:`solver_names` and
+    :attr:`instance_names`. The bounds of a run are summarized by its first and last values,
+    which are enough to know its best value and the direction of its objective.
+    """
+
+    def __init__(self, solvers, instances, statuses, times, time_limits, first_values, last_values, errors,
+                 timeouts):
+        """
+        Args:
+            solvers: The solver of each run.
+            instances: The instance of each run.
+            statuses: The status announced by each run (index in :data:`STATUSES`).
+            times: The time of each run, in seconds.
+            time_limits: The time limit of each run (NaN if unknown).
+            first_values: The first bound of each run (NaN if there is none).
+            last_values: The last bound of each run (NaN if there is none).
+            errors: Whether each run ended with an error.
+            timeouts: Whether each run was interrupted by its time limit.
+        """
+        _require_numpy()
+        self.solver_names, self.solvers = np.unique(np.asarray(solvers, dtype=str), return_inverse=True)
+        self.instance_names, self.instances = np.unique(np.asarray(instances, dtype=str), return_inverse=True)
+        self.statuses = np.asarray(statuses, dtype=np.int8)
+        self.times = np.asarray(times, dtype=float)
+        self.time_limits = np.asarray(time_limits, dtype=float)
+        self.first_values = np.asarray(first_values, dtype=float)
+        self.last_values = np.asarray(last_values, dtype=float)
+        self.errors = np.asarray(errors, dtype=bool)
+        self.timeouts = np.asarray(timeouts, dtype=bool)
+
+    @staticmethod
+    def from_results(results: Iterable[dict], clock: str = "wall_clock_time") -> "Runs":
+        """
+        Create the columns of the given results.
+
+        Args:
+            results: The results of the runs, as produced by :meth:`xcsp.solver.solver.Solver.solve`.
+            clock (str): The time to use, "wall_clock_time" or "cpu_time".
+
+        Returns:
+            Runs: The runs.
+        """
+        codes = {status.value: index for index, status in enumerate(STATUSES)}
+        columns = {name: [] for name in ("solvers", "instances", "statuses", "times", "time_limits",
+                                         "first_values", "last_values", "errors", "timeouts")}
+        for result in results:
+            bounds = result.get("bounds") or []
+            version = result.get("version")
+            columns["solvers"].append(f"{result.get('solver', 'unknown')}{'@' + version if version else ''}")
+            columns["instances"].append(Path(str(result.get("instance", "unknown"))).name)
+            columns["statuses"].append(codes.get(result.get("status"), codes[ResultStatusEnum.UNKNOWN.value]))
+            columns["times"].append(result.get(clock) or 0.0)
+            columns["time_limits"].append(result.get("time_limit") or np.nan)
+            columns["first_values"].append(bounds[0]["value"] if bounds else np.nan)
+            columns["last_values"].append(bounds[-1]["value"] if bounds else np.nan)
+            columns["errors"].append(result.get("exit_code") not in (None, 0) and not result.get("timeout"))
+            columns["timeouts"].append(bool(result.get("timeout")))
+        return Runs(**columns)
+
+    @staticmethod
+    def from_store(store, clock: str = "wall_clock_time") -> "Runs":
+        """
+        Create the columns of the runs of a store (see :mod:`xcsp.analysis.store`).
+
+        Args:
+            store (Store): The store.
+            clock (str): The time to use, "wall_clock_time" or "cpu_time".
+
+        Returns:
+            Runs: The runs.
+        """
+        runs = store.runs
+        codes = {status.value: index for index, status in enumerate(STATUSES)}
+        names, inverse = np.unique(runs["status"], return_inverse=True)
+        statuses = np.array([codes.get(name, codes[ResultStatusEnum.UNKNOWN.value]) for name in names],
+                            dtype=np.int8)[inverse]
+        solvers = np.char.add(runs["solver"], np.where(runs["version"] != "", np.char.add("@", runs["version"]), ""))
+        counts = store.bound_counts()
+        first = np.cumsum(counts) - counts
+        nonempty = counts > 0
+        first_values = np.full(len(store), np.nan)
+        last_values = np.full(len(store), np.nan)
+        first_values[nonempty] = store.bounds["value"][first[nonempty]]
+        last_values[nonempty] = store.bounds["value"][(first + counts - 1)[nonempty]]
+        return Runs(solvers, runs["instance"], statuses, runs[clock], runs["time_limit"], first_values, last_values,
+                    (runs["exit_code"] != 0) & ~runs["timeout"], runs["timeout"])
+
+    def __len__(self):
+        return len(self.times)
+
+    def _status(self, *statuses: ResultStatusEnum):
+        return np.isin(self.statuses, [STATUSES.index(s) for s in statuses])
+
+    def _limits(self, time_limit=None):
+        if time_limit is not None:
+            return np.full(len(self), float(time_limit))
+        if np.isnan(self.time_limits).any():
+            raise ValueError(f"The time limit of {int(np.isnan(self.time_limits).sum())} runs is unknown: "
+                             f"a time limit must be given.")
+        return self.time_limits
+
+    def solved(self, time_limit=None):
+        """
+        Tell which runs solved their instance within the time limit.
+
+        An instance is solved when the solver proves that it is unsatisfiable, finds an optimal
+        solution or, for satisfaction problems (without bounds), finds a solution.
+
+        Args:
+            time_limit: The time limit of all the runs (default: the one of each run).
+
+        Returns:
+            numpy.ndarray: Whether each run solved its instance.
+        """
+        conclusive = self._status(ResultStatusEnum.UNSATISFIABLE, ResultStatusEnum.OPTIMUM) | (
+                self._status(ResultStatusEnum.SATISFIABLE) & np.isnan(self.last_values))
+        return conclusive & ~self.errors & (self.times <= self._limits(time_limit))
+
+    def par(self, k: float = 2, time_limit=None):
+        """Return the penalized run time of each run: its time if it is solved, k times the time limit otherwise."""
+        return np.where(self.solved(time_limit), self.times, k * self._limits(time_limit))
+
+    def _per_solver(self, values=None):
+        return np.bincount(self.solvers, weights=values, minlength=len(self.solver_names))
+
+    def _count_per_solver(self, mask):
+        return np.bincount(self.solvers[mask], minlength=len(self.solver_names))
+
+    def minimize(self, references: Dict[str, dict] | None = None):
+        """
+        Tell whether the objective of each instance is minimized.
+
+        The direction is the one of the references when they know it, and is otherwise inferred
+        from the bounds of the runs (a run whose bounds decrease minimizes its objective).
+
+        Args:
+            references (dict | None): Reference values, as returned by :func:`xcsp.analysis.anytime.load_references`.
+
+        Returns:
+            numpy.ndarray: Whether the objective of each instance is minimized.
+        """
+        votes = np.zeros(len(self.instance_names))
+        known = ~np.isnan(self.first_values)
+        np.add.at(votes, self.instances[known], np.sign(self.first_values - self.last_values)[known])
+        minimize = votes >= 0
+        for index, name in enumerate(self.instance_names):
+            if references and references.get(name, {}).get("minimize") is not None:
+                minimize[index] = references[name]["minimize"]
+        return minimize
+
+    def best_values(self, references: Dict[str, dict] | None = None):
+        """
+        Compute the best value known for each instance: the best bound found by the runs or the reference value.
+
+        Args:
+            references (dict | None): Reference values, as returned by :func:`xcsp.analysis.anytime.load_references`.
+
+        Returns:
+            numpy.ndarray: The best value of each instance (NaN for the instances without bound).
+        """
+        signs = np.where(self.minimize(references), 1.0, -1.0)
+        best = np.full(len(self.instance_names), np.inf)
+        valid = ~np.isnan(self.last_values) & ~self.errors
+        np.minimum.at(best, self.instances[valid], (self.last_values * signs[self.instances])[valid])
+        if references:
+            reference = np.array([references.get(name, {}).get("value", np.nan) for name in self.instance_names],
+                                 dtype=float)
+            best = np.fmin(best, reference * signs)
+        return np.where(np.isinf(best), np.nan, best * signs)
+
+    def cop_scores(self, references: Dict[str, dict] | None = None):
+        """
+        Score the runs on optimization problems, as in the XCSP competitions.
+
+        A run scores one point when its best bound is the best value known for its instance.
+
+        Args:
+            references (dict | None): Reference values, as returned by :func:`xcsp.analysis.anytime.load_references`.
+
+        Returns:
+            numpy.ndarray: The score (0 or 1) of each run.
+        """
+        best = self.best_values(references)[self.instances]
+        return ((self.last_values == best) & ~self.errors).astype(float)
+
+    def vbs(self, k: float = 2, time_limit=None):
+        """
+        Compute the virtual best solver, which takes the best run on each instance.
+
+        Args:
+            k (float): The penalty of the unsolved runs, in time limits.
+            time_limit: The time limit of all the runs (default: the one of each run).
+
+        Returns:
+            tuple: For each instance, the penalized time of the VBS, whether it solved it, and the index
+            of the solver of its best run.
+        """
+        par = self.par(k, time_limit)
+        # Runs sorted by instance, then by penalized time: the first run of each instance is the best one.
+        order = np.lexsort((par, self.instances))
+        _, first = np.unique(self.instances[order], return_index=True)
+        best = order[first]
+        return par[best], self.solved(time_limit)[best], self.solvers[best]
+
+    def summary(self, k: float = 2, time_limit=None, references: Dict[str, dict] | None = None) -> List[dict]:
+        """
+        Summarize the runs of each solver, and of the virtual best solver.
+
+        Args:
+            k (float): The penalty of the unsolved runs, in time limits (PAR-k).
+            time_limit: The time limit of all the runs (default: the one of each run).
+            references (dict | None): Reference values, as returned by :func:`xcsp.analysis.anytime.load_references`.
+
+        Returns:
+            list[dict]: One row per solver, sorted by number of solved runs and PAR-k score, then the VBS.
+        """
+        solved = self.solved(time_limit)
+        # Results without the timeout flag are considered interrupted when they reach the time limit.
+        timeouts = ~solved & ~self.errors & (self.timeouts | (self.times >= self._limits(time_limit)))
+        runs = self._per_solver()
+        columns = {
+            "runs": runs,
+            "solved": self._count_per_solver(solved),
+            "sat": self._count_per_solver(self._status(ResultStatusEnum.SATISFIABLE)),
+            "unsat": self._count_per_solver(self._status(ResultStatusEnum.UNSATISFIABLE)),
+            "optimum": self._count_per_solver(self._status(ResultStatusEnum.OPTIMUM)),
+            "timeouts": self._count_per_solver(timeouts),
+            "errors": self._count_per_solver(self.errors),
+            f"par{k:g}": self._per_solver(self.par(k, time_limit)) / np.maximum(runs, 1),
+            "cop_score": self._count_per_solver(self.cop_scores(references) > 0),
+        }
+        rows = [{"solver": name, **{c: values[i].item() for c, values in columns.items()}}
+                for i, name in enumerate(self.solver_names)]
+        rows.sort(key=lambda row: (-row["solved"], row[f"par{k:g}"]))
+        par, vbs_solved, _ = self.vbs(k, time_limit)
+        best = self.best_values(references)
+        rows.append({"solver": VBS, "runs": len(par), "solved": int(vbs_solved.sum()), f"par{k:g}": par.mean().item(),
+                     "cop_score": int((~np.isnan(best)).sum())})
+        return rows
+
+    def instances_summary(self, k: float = 2, time_limit=None, references: Dict[str, dict] | None = None) -> List[dict]:
+        """
+        Summarize each instance: its best solver, the time of the VBS and the best value known.
+
+        Returns:
+            list[dict]: One row per instance.
+        """
+        par, solved, solvers = self.vbs(k, time_limit)
+        best = self.best_values(references)
+        minimize = self.minimize(references)
+        return [{"instance": name, "vbs_solver": self.solver_names[solvers[i]], "vbs_time": par[i].item(),
+                 "solved": bool(solved[i]), "best_value": None if np.isnan(best[i]) else best[i].item(),
+                 "minimize": bool(minimize[i]) if not np.isnan(best[i]) else None}
+                for i, name in enumerate(self.instance_names)]
+
+    def cactus(self, time_limit=None) -> Dict[str, "np.ndarray"]:
+        """
+        Compute the data of a cactus plot: the times of the solved runs of each solver (and of the VBS), sorted.
+
+        Returns:
+            dict: Mapping of the solvers to the sorted times of their solved runs.
+        """
+        solved = self.solved(time_limit)
+        order = np.lexsort((self.times[solved], self.solvers[solved]))
+        solvers, times = self.solvers[solved][order], self.times[solved][order]
+        bounds = np.searchsorted(solvers, np.arange(len(self.solver_names) + 1))
+        curves = {name: times[bounds[i]:bounds[i + 1]] for i, name in enumerate(self.solver_names)}
+        par, vbs_solved, _ = self.vbs(2, time_limit)
+        curves[VBS] = np.sort(par[vbs_solved])
+        return curves
@@ -0,0 +1,323 @@
+"""Columnar storage of the results of solver runs.
+
+The JSON results of solver runs nest their bounds in dictionaries, which makes them large and slow
+to load back. A store keeps them in two tables, in a directory:
+
+- ``runs``: one row per run (solver, version, instance, status, time limit, times, exit code, ...);
+- ``bounds``: one row per bound found by a run (``run_id``, wall-clock time, CPU time, value),
+  grouped by run, in the order of the runs;
+- ``solutions``, ``solution_data``, ``templates``, ``frames`` and ``raw_solutions``: the solutions
+  found by the runs, delta encoded (see :class:`xcsp.solver.solutions.DeltaSolutions`): one row per
+  solution (``run_id``, times, and where it is stored), the flat values of the keyframes and deltas,
+  the lists of variables, the text around the lists and the values, and the solutions stored as they are.
+
+The tables are written in one of the following formats:
+
+- ``npy``: one NumPy file per column, loaded as memory maps (only NumPy is needed);
+- ``arrow``: Arrow IPC files, loaded as memory maps (requires ``pyarrow``);
+- ``parquet``: Parquet files, which are smaller but decoded when loaded (requires ``pyarrow``).
+
+With ``npy`` and ``arrow``, loading a store does not copy its numeric columns: they are read from
+the page cache when they are used. Stores can be analysed directly, see :meth:`xcsp.analysis.campaign.Runs.from_store`
+and :meth:`xcsp.analysis.anytime.Timelines.from_store`.
+"""
+import json
+from pathlib import Path
+from collections.abc import Sequence
+from typing import Dict, Iterable
+
+from xcsp.analysis.anytime import _require_numpy
+from xcsp.solver.solutions import DeltaSolutions
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+FORMATS = ["npy", "arrow", "parquet"]
+
+STORE_VERSION = 1
+
+METADATA_FILE = "store.json"
+
+RUN_COLUMNS = {
+    "run_id": "int64",
+    "solver": "str",
+    "version": "str",
+    "instance": "str",
+    "status": "str",
+    "time_limit": "float64",
+    "wall_clock_time": "float64",
+    "cpu_time": "float64",
+    "exit_code": "int64",
+    "timeout": "bool",
+}
+
+BOUND_COLUMNS = {
+    "run_id": "int64",
+    "wall_clock_time": "float64",
+    "cpu_time": "float64",
+    "value": "int64",
+}
+
+SOLUTION_COLUMNS = {
+    "run_id": "int64",
+    "wall_clock_time": "float64",
+    "cpu_time": "float64",
+    "kind": "int8",
+    "template": "int64",
+    "frame": "int64",
+    "start": "int64",
+    "length": "int64",
+    "keyframe": "int64",
+}
+
+SOLUTION_DATA_COLUMNS = {"value": "int64"}
+
+# Texts may be long (a template holds the list of the variables): with npy, they are stored as
+# their concatenated UTF-8 bytes and the offsets of each of them.
+TEMPLATE_COLUMNS = {"variables": "text"}
+
+FRAME_COLUMNS = {"head": "text", "middle": "text", "tail": "text", "separators": "text"}
+
+RAW_SOLUTION_COLUMNS = {"solution": "text"}
+
+
+class Store:
+    """The tables of a store, as dictionaries of NumPy columns."""
+
+    def __init__(self, path: Path, runs: Dict[str, "np.ndarray"], bounds: Dict[str, "np.ndarray"],
+                 solutions: Dict[str, "np.ndarray"] | None = None, solution_data=None, templates=None,
+                 frames=None, raw_solutions=None):
+        self.path = path
+        self.runs = runs
+        self.bounds = bounds
+        self.solutions = solutions
+        self._solution_data = solution_data
+        self._templates = templates
+        self._frames = frames
+        self._raw_solutions = raw_solutions
+
+    def __len__(self):
+        return len(self.runs["run_id"])
+
+    def bound_counts(self):
+        """Return the number of bounds of each run."""
+        return np.bincount(self.bounds["run_id"], minlength=len(self))
+
+    def decoded_solutions(self) -> DeltaSolutions:
+        """
+        Return the solutions of all the runs (grouped by run, see ``solutions["run_id"]``).
+
+        Any solution is decoded on access, from its keyframe.
+
+        Returns:
+            DeltaSolutions: The solutions.
+        """
+        if self.solutions is None:
+            raise ValueError(f"The store {self.path} does not contain solutions.")
+        frames = list(zip(*(self._frames[name] for name in FRAME_COLUMNS)))
+        return DeltaSolutions.from_columns(self.solutions["kind"], self.solutions["template"],
+                                           self.solutions["frame"], self.solutions["start"],
+                                           self.solutions["length"], self.solutions["keyframe"],
+                                           self._solution_data["value"], self._templates["variables"], frames,
+                                           self._raw_solutions["solution"])
+
+    def run_solutions(self, run_id: int) -> list:
+        """
+        Return the solutions found by a run.
+
+        Args:
+            run_id (int): The identifier of the run.
+
+        Returns:
+            list: The solutions, in the order in which they were found.
+        """
+        start, stop = np.searchsorted(self.solutions["run_id"], [run_id, run_id + 1])
+        return list(self.decoded_solutions().decode(int(start), int(stop)))
+
+
+class _Texts(Sequence):
+    """Texts stored as their concatenated UTF-8 bytes, decoded on access."""
+
+    def __init__(self, data: "np.ndarray", offsets: "np.ndarray"):
+        self._data = data
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]
+        return self._data[self._offsets[index]:self._offsets[index + 1]].tobytes().decode()
+
+
+def is_store(path) -> bool:
+    """Tell whether a path is the directory of a store."""
+    return (Path(path) / METADATA_FILE).is_file()
+
+
+def _columns(results: Iterable[dict]):
+    runs = {name: [] for name in RUN_COLUMNS}
+    bounds = {name: [] for name in BOUND_COLUMNS}
+    solutions = {name: [] for name in ("run_id", "wall_clock_time", "cpu_time")}
+    encoded = DeltaSolutions()
+    for run_id, result in enumerate(results):
+        runs["run_id"].append(run_id)
+        for name in ("solver", "version", "instance", "status"):
+            runs[name].append(str(result.get(name) or ""))
+        runs["instance"][-1] = Path(runs["instance"][-1]).name
+        runs["time_limit"].append(result.get("time_limit") or np.nan)
+        runs["wall_clock_time"].append(result.get("wall_clock_time") or 0.0)
+        runs["cpu_time"].append(result.get("cpu_time") or 0.0)
+        runs["exit_code"].append(result.get("exit_code") or 0)
+        runs["timeout"].append(bool(result.get("timeout")))
+        for bound in result.get("bounds") or []:
+            bounds["run_id"].append(run_id)
+            bounds["wall_clock_time"].append(bound.get("wall_clock_time", np.nan))
+            bounds["cpu_time"].append(bound.get("cpu_time", np.nan))
+            bounds["value"].append(bound["value"])
+        # The first solution of each run is a keyframe, so that runs are decoded independently.
+        encoded.restart()
+        for assignment in result.get("assignments") or []:
+            solutions["run_id"].append(run_id)
+            solutions["wall_clock_time"].append(assignment.get("wall_clock_time", np.nan))
+            solutions["cpu_time"].append(assignment.get("cpu_time", np.nan))
+            encoded.append(assignment["solution"])
+    for name, column in (("kind", encoded.kinds), ("template", encoded.template_ids), ("frame", encoded.frame_ids),
+                         ("start", encoded.starts), ("length", encoded.lengths), ("keyframe", encoded.keyframes)):
+        solutions[name] = column
+    return ({name: np.asarray(values, dtype=RUN_COLUMNS[name]) for name, values in runs.items()},
+            {name: np.asarray(values, dtype=BOUND_COLUMNS[name]) for name, values in bounds.items()},
+            {name: np.asarray(values, dtype=SOLUTION_COLUMNS[name]) for name, values in solutions.items()},
+            {"value": np.asarray(encoded.data, dtype="int64")},
+            {"variables": encoded.templates},
+            {name: [frame[i] for frame in encoded.frames] for i, name in enumerate(FRAME_COLUMNS)},
+            {"solution": encoded.raw})
+
+
+def _require_pyarrow(store_format: str):
+    if pyarrow is None:
+        raise ImportError(f"The {store_format} format requires pyarrow (pip install pyarrow), "
+                          f"the npy format only requires numpy.")
+
+
+def _write_table(path: Path, name: str, columns: Dict[str, "np.ndarray"], store_format: str):
+    if store_format == "npy":
+        (path / name).mkdir(exist_ok=True)
+        for column, values in columns.items():
+            if isinstance(values, list):
+                texts = [text.encode() for text in values]
+                offsets = np.zeros(len(texts) + 1, dtype="int64")
+                np.cumsum([len(text) for text in texts], out=offsets[1:])
+                np.save(path / name / f"{column}.npy", np.frombuffer(b"".join(texts), dtype="uint8"))
+                np.save(path / name / f"{column}.offsets.npy", offsets)
+            else:
+                np.save(path / name / f"{column}.npy", values)
+        return
+    table = pyarrow.table({column: pyarrow.array(values, type=pyarrow.large_string() if isinstance(values, list)
+                                                 else None) for column, values in columns.items()})
+    if store_format == "arrow":
+        with pyarrow.OSFile(str(path / f"{name}.arrow"), "wb") as sink:
+            with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        pyarrow.parquet.write_table(table, str(path / f"{name}.parquet"))
+
+
+def _read_table(path: Path, name: str, columns, store_format: str) -> Dict[str, "np.ndarray"]:
+    if store_format == "npy":
+        result = dict()
+        for column, dtype in columns.items():
+            result[column] = np.load(path / name / f"{column}.npy", mmap_mode="r")
+            if dtype == "text":
+                result[column] = _Texts(result[column], np.load(path / name / f"{column}.offsets.npy"))
+        return result
+    if store_format == "arrow":
+        # The buffers of the table refer to the memory map, which stays open as long as they are used.
+        table = pyarrow.ipc.open_file(pyarrow.memory_map(str(path / f"{name}.arrow"), "r")).read_all()
+    else:
+        table = pyarrow.parquet.read_table(str(path / f"{name}.parquet"), memory_map=True)
+    result = dict()
+    for column, dtype in columns.items():
+        array = table.column(column).combine_chunks()
+        if dtype == "str":
+            result[column] = np.asarray(array.to_pylist(), dtype=str)
+        elif dtype == "text":
+            result[column] = array.to_pylist()
+        else:
+            result[column] = array.to_numpy(zero_copy_only=dtype != "bool")
+    return result
+
+
+def export_results(results: Iterable[dict], path, store_format: str = "npy") -> Path:
+    """
+    Write results of solver runs in a store.
+
+    Args:
+        results: The results, as produced by :meth:`xcsp.solver.solver.Solver.solve`.
+        path (str | Path): The directory of the store (created if needed).
+        store_format (str): The format of the tables, one of :data:`FORMATS`.
+
+    Returns:
+        Path: The directory of the store.
+    """
+    _require_numpy()
+    if store_format not in FORMATS:
+        raise ValueError(f"Unknown store format {store_format}, expected one of {', '.join(FORMATS)}.")
+    if store_format != "npy":
+        _require_pyarrow(store_format)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    runs, bounds, solutions, solution_data, templates, frames, raw_solutions = _columns(results)
+    _write_table(path, "runs", runs, store_format)
+    _write_table(path, "bounds", bounds, store_format)
+    _write_table(path, "solutions", solutions, store_format)
+    _write_table(path, "solution_data", solution_data, store_format)
+    _write_table(path, "templates", templates, store_format)
+    _write_table(path, "frames", frames, store_format)
+    _write_table(path, "raw_solutions", raw_solutions, store_format)
+    # The metadata is written last: a store is complete when it is present.
+    with open(path / METADATA_FILE, "w") as f:
+        json.dump({"version": STORE_VERSION, "format": store_format, "runs": len(runs["run_id"]),
+                   "bounds": len(bounds["run_id"]), "solutions": len(solutions["run_id"])}, f)
+    return path
+
+
+def load_store(path) -> Store:
+    """
+    Load a store written by :func:`export_results`.
+
+    Args:
+        path (str | Path): The directory of the store.
+
+    Returns:
+        Store: The tables of the store.
+    """
+    _require_numpy()
+    path = Path(path)
+    with open(path / METADATA_FILE) as f:
+        metadata = json.load(f)
+    if metadata.get("version") != STORE_VERSION:
+        raise ValueError(f"Unsupported version {metadata.get('version')} of the store {path}.")
+    store_format = metadata["format"]
+    if store_format != "npy":
+        _require_pyarrow(store_format)
+    tables = [_read_table(path, "runs", RUN_COLUMNS, store_format),
+              _read_table(path, "bounds", BOUND_COLUMNS, store_format)]
+    if "solutions" in metadata:
+        # Stores written before the solutions were stored only have runs and bounds.
+        tables += [_read_table(path, "solutions", SOLUTION_COLUMNS, store_format),
+                   _read_table(path, "solution_data", SOLUTION_DATA_COLUMNS, store_format),
+                   _read_table(path, "templates", TEMPLATE_COLUMNS, store_format),
+                   _read_table(path, "frames", FRAME_COLUMNS, store_format),
+                   _read_table(path, "raw_solutions", RAW_SOLUTION_COLUMNS, store_format)]
+    return Store(path, *tables)
@@ -0,0 +1,188 @@
+"""Build artifact cache for XCSP Launcher.
+
+This module stores the binary directory produced by the installation of a solver version,
+keyed by everything that determines the result of the build: the source revision, the
+resolved build instructions, the platform and the versions of the toolchain.
+A later installation with the same key (on the same node, or on any node sharing the cache
+directory) restores the artifacts instead of compiling the solver again.
+"""
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from loguru import logger
+
+import xcsp.utils.paths as paths
+from xcsp.builder.check import MAP_BUILDER
+from xcsp.utils.placeholder import PLACEHOLDERS
+from xcsp.utils.storage import evict_least_recently_used, touch, remove_entry
+from xcsp.utils.system import normalized_system_name
+
+BUILD_MARKER = ".xcsp-build.json"
+"""Name of the file recording the revision installed in the binary directory of a version."""
+
+DEFAULT_MAX_SIZE = 5 * 1024 ** 3
+"""Default maximum size of the build cache (5 GiB)."""
+
+VERSION_FLAGS = {
+    "java": ["-version"],
+}
+
+
+@lru_cache(maxsize=None)
+def tool_version(tool: str) -> str | None:
+    """
+    Return the version string reported by a build tool, or None if it is not available.
+
+    Args:
+        tool (str): Name (or path) of the tool.
+    """
+    executable = shutil.which(tool)
+    if executable is None:
+        return None
+    flags = VERSION_FLAGS.get(Path(tool).name, ["--version"])
+    try:
+        result = subprocess.run([executable, *flags], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Unable to get the version of {tool}: {e}")
+        return executable
+    output = (result.stdout + result.stderr).strip().splitlines()
+    return f"{executable}: {output[0] if output else ''}"
+
+
+def toolchain_fingerprint(language: str | None) -> dict:
+    """
+    Describe the toolchain used to build solvers written in the given language.
+
+    Args:
+        language (str | None): The language of the solver.
+
+    Returns:
+        dict: Mapping of tool names to their version.
+    """
+    tools = MAP_BUILDER.get(language, []) if language else []
+    if isinstance(tools, str):
+        tools = [tools]
+    tools = sorted(set(tools) | {Path(p).name for p in PLACEHOLDERS.values() if p is not None})
+    return {tool: tool_version(tool) for tool in tools}
+
+
+def compute_build_key(revision: str, config: dict, version: dict, language: str | None) -> str:
+    """
+    Compute the key identifying the artifacts of a build.
+
+    Args:
+        revision (str): Identifier of the sources (commit hash, archive hash).
+        config (dict): The solver configuration.
+        version (dict): The version being built, as described in the configuration.
+        language (str | None): The language of the solver.
+
+    Returns:
+        str: A hexadecimal digest.
+    """
+    description = {
+        "revision": revision,
+        "id": config.get("id") if config else None,
+        "mode": config.get("mode") if config else None,
+        "build": config.get("build") if config else None,
+        "executable": version.get("executable"),
+        "files": version.get("files"),
+        "system": normalized_system_name(),
+        "machine": platform.machine(),
+        "toolchain": toolchain_fingerprint(language),
+    }
+    content = json.dumps(description, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class BuildCache:
+    """Size-bounded, content-addressed store of solver binary directories."""
+
+    def __init__(self, root: Path | None = None, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize the build cache.
+
+        Args:
+            root (Path | None): Directory of the cache (defaults to :func:`xcsp.utils.paths.get_build_cache_dir`).
+            max_size (int): Maximum size of the cache, in bytes.
+        """
+        self._root = Path(root) if root is not None else paths.get_build_cache_dir()
+        self._max_size = max_size
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def restore(self, key: str, bin_dir: Path):
+        """
+        Restore the artifacts stored under the given key into a binary directory.
+
+        Args:
+            key (str): The build key.
+            bin_dir (Path): The binary directory to fill.
+
+        Returns:
+            The placeholder of the restored executable, or None if the key is not in the cache.
+        """
+        entry = self._root / key
+        meta_file = entry / "meta.json"
+        if not meta_file.exists():
+            return None
+        try:
+            with open(meta_file) as f:
+                meta = json.load(f)
+            bin_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copytree(entry / "bin", bin_dir, symlinks=True, dirs_exist_ok=True)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unable to restore build artifacts {key}: {e}")
+            return None
+        touch(entry)
+        logger.success(f"Build artifacts restored from the cache ({key[:12]}) into {bin_dir}.")
+        executable = meta.get("executable")
+        if meta.get("relative", False):
+            return bin_dir / executable if executable != "." else bin_dir
+        return executable
+
+    def save(self, key: str, bin_dir: Path, executable):
+        """
+        Store the content of a binary directory under the given key.
+
+        The entry is written into a temporary directory which is then renamed, so that
+        concurrent installations never observe a partial entry.
+
+        Args:
+            key (str): The build key.
+            bin_dir (Path): The binary directory produced by the build.
+            executable: The placeholder used for the executable in the command line.
+        """
+        entry = self._root / key
+        if (entry / "meta.json").exists():
+            touch(entry)
+            return
+        self._root.mkdir(parents=True, exist_ok=True)
+        executable_path = Path(executable)
+        relative = executable_path.is_absolute() and executable_path.is_relative_to(bin_dir)
+        meta = {
+            "executable": str(executable_path.relative_to(bin_dir)) if relative else str(executable),
+            "relative": relative,
+        }
+        tmp_dir = Path(tempfile.mkdtemp(dir=self._root, prefix=f".{key[:12]}."))
+        try:
+            shutil.copytree(bin_dir, tmp_dir / "bin", symlinks=True,
+                            ignore=shutil.ignore_patterns(BUILD_MARKER))
+            with open(tmp_dir / "meta.json", "w") as f:
+                json.dump(meta, f)
+            os.rename(tmp_dir, entry)
+            logger.info(f"Build artifacts stored in the cache ({key[:12]}).")
+        except OSError as e:
+            if not (entry / "meta.json").exists():
+                logger.warning(f"Unable to store build artifacts {key}: {e}")
+            remove_entry(tmp_dir)
+            return
+        evict_least_recently_used(self._root, self._max_size)
@@ -8,35 +8,102 @@ import os
 import shutil
 import stat
 import subprocess
+import threading
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
-import psutil
 from loguru import logger
 
 import xcsp.utils.paths as paths
 from xcsp.utils.dict import get_with_fallback
-from xcsp.utils.placeholder import replace_placeholder, replace_solver_dir_in_list, replace_solver_dir_in_str
-from xcsp.utils.system import normalized_system_name
+from xcsp.utils.placeholder import replace_placeholder, replace_solver_dir_in_list, replace_solver_dir_in_str, \
+    replace_parallelism_placeholders, available_cores
+from xcsp.utils import profile
+from xcsp.utils.system import normalized_system_name, run_with_usage
 
 # Mapping of detected build configuration files to standard build commands
 MAP_FILE_BUILD_COMMANDS = {
     "build.gradle": ["./gradlew build -x test", "gradle build -x test"],
     "pom.xml": ["mvn package", "mvn install"],
-    "CMakeLists.txt": ["cmake . && make", "cmake .. && make"],
-    "Makefile": ["make"],
-    "Cargo.toml": ["cargo build"],
+    "CMakeLists.txt": ["cmake . && make -j {{jobs}}", "cmake .. && make -j {{jobs}}"],
+    "Makefile": ["make -j {{jobs}}"],
+    "Cargo.toml": ["cargo build -j {{jobs}}"],
     "setup.py": ["python setup.py install", "python setup.py build"],
     "pyproject.toml": ["python -m build"]
 }
 
-def try_build_from_file(detected_file: Path, log_path: Path) -> bool:
+
+class JobBudget:
+    """Budget of parallel jobs shared by the builds running concurrently in the process.
+
+    Each build reserves a number of jobs before running, and gives them back when it ends,
+    so that concurrent builds never use more jobs than the budget.
+    """
+
+    def __init__(self, total: int | None = None):
+        """
+        Initialize the budget.
+
+        Args:
+            total (int | None): Total number of jobs (defaults to the number of available cores).
+        """
+        self._condition = threading.Condition()
+        self._total = total if total is not None and total > 0 else available_cores()
+        self._available = self._total
+
+    @property
+    def total(self) -> int:
+        """Return the total number of jobs of the budget."""
+        return self._total
+
+    def set_total(self, total: int | None):
+        """
+        Change the total number of jobs of the budget (None to use the number of available cores).
+        """
+        with self._condition:
+            total = total if total is not None and total > 0 else available_cores()
+            self._available += total - self._total
+            self._total = total
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, wanted: int | None = None):
+        """
+        Reserve jobs for a build, waiting until at least one job is available.
+
+        Args:
+            wanted (int | None): Maximum number of jobs wanted (defaults to the whole budget).
+
+        Yields:
+            int: The number of jobs granted to the build.
+        """
+        wanted = max(1, wanted if wanted is not None else self._total)
+        with self._condition:
+            while self._available <= 0:
+                self._condition.wait()
+            granted = min(wanted, self._available)
+            self._available -= granted
+        try:
+            yield granted
+        finally:
+            with self._condition:
+                self._available += granted
+                self._condition.notify_all()
+
+
+BUILD_JOBS = JobBudget()
+"""Budget of jobs shared by all the builds of the process (see the ``--build-jobs`` option)."""
+
+
+def try_build_from_file(detected_file: Path, log_path: Path, jobs: int = 1) -> bool:
     """Attempt to build a project based on the detected build configuration file.
 
     Args:
         detected_file (Path): The main build configuration file (e.g., CMakeLists.txt, build.gradle).
         log_path (Path): Path to the build log file.
+        jobs (int): Number of parallel jobs the build may use.
 
     Returns:
         bool: True if the build succeeded, False otherwise.
@@ -50,6 +117,7 @@ def try_build_from_file(detected_file: Path, log_path: Path) -> bool:
 
     success = False
     for command in build_commands:
+        command = replace_parallelism_placeholders(command, jobs)
         logger.info(f"Trying build command: {command}")
 
         with open(log_path, "a") as log_file:
@@ -57,16 +125,16 @@ def try_build_from_file(detected_file: Path, log_path: Path) -> bool:
             log_file.flush()
 
             try:
-                process = psutil.Popen(
-                    command,
-                    shell=True,
-                    cwd=detected_file.parent,
-                    stdout=log_file,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1
-                )
-                returncode = process.wait()
+                with profile.step("build command", "build", cmd=command):
+                    returncode = run_with_usage(
+                        command,
+                        shell=True,
+                        cwd=detected_file.parent,
+                        stdout=log_file,
+                        stderr=subprocess.STDOUT,
+                        text=True,
+                        bufsize=1
+                    )
                 if returncode == 0:
                     logger.success(f"Build succeeded with command: {command}")
                     success = True
@@ -89,23 +157,38 @@ class BuildStrategy(ABC):
         self._config_strategy = config_strategy
         self._config = config
 
-    def build(self) -> bool:
-        """Execute the build process inside the solver directory."""
-        with paths.ChangeDirectory(self._path_solver):
-            return self._internal_build()
+    def build(self, source_path: Path | None = None, concurrent_builds: int = 1) -> bool:
+        """Execute the build process inside the solver directory.
+
+        Args:
+            source_path (Path | None): Directory containing the sources to build
+                (defaults to the solver directory).
+            concurrent_builds (int): Number of builds expected to run at the same time,
+                among which the job budget is shared.
+        """
+        source_path = Path(source_path) if source_path is not None else Path(self._path_solver)
+        with BUILD_JOBS.reserve(BUILD_JOBS.total // max(1, concurrent_builds)) as jobs:
+            logger.debug(f"Building {source_path} with {jobs} jobs.")
+            return self._internal_build(source_path, jobs)
 
     @abstractmethod
-    def _internal_build(self) -> bool:
+    def _internal_build(self, source_path: Path, jobs: int) -> bool:
         """Internal method for performing the build, must be implemented by subclasses."""
         pass
 
+    @staticmethod
+    def _log_path(source_path: Path) -> Path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return Path(paths.get_cache_dir()) / f"solver_build_{timestamp}_{source_path.name}.log"
+
 class AutoBuildStrategy(BuildStrategy):
     """Build strategy using automatic detection based on known build files."""
 
-    def _internal_build(self) -> bool:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_path = Path(paths.get_cache_dir()) / f"solver_build_{timestamp}.log"
-        return try_build_from_file(self._config_strategy.builder_file(), log_path)
+    def _internal_build(self, source_path: Path, jobs: int) -> bool:
+        builder_file = self._config_strategy.builder_file()
+        if builder_file is not None and Path(builder_file).is_relative_to(self._path_solver):
+            builder_file = source_path / Path(builder_file).relative_to(self._path_solver)
+        return try_build_from_file(builder_file, self._log_path(source_path), jobs)
 
 class ManualBuildStrategy(BuildStrategy):
     """Build strategy using manual build instructions provided in the configuration."""
@@ -113,9 +196,8 @@ class ManualBuildStrategy(BuildStrategy):
     def __init__(self, path_solver: Path, config_strategy, config):
         super().__init__(path_solver, config_strategy, config)
 
-    def _internal_build(self) -> bool:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_path = Path(paths.get_cache_dir()) / f"solver_build_{timestamp}.log"
+    def _internal_build(self, source_path: Path, jobs: int) -> bool:
+        log_path = self._log_path(source_path)
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
         logger.debug(f"Log of building in {log_path}")
@@ -155,38 +237,38 @@ class ManualBuildStrategy(BuildStrategy):
                     logger.warning(f"Step {index + 1} is missing 'cmd'. Skipping.")
                     continue
 
-                cwd_raw = step.get("cwd", str(self._path_solver))
+                cwd_raw = step.get("cwd", str(source_path))
+                cwd_str = str(source_path / replace_solver_dir_in_str(cwd_raw, str(source_path)))
 
-                cmd = replace_solver_dir_in_list(replace_placeholder(cmd_raw), str(self._path_solver))
+                cmd = replace_solver_dir_in_list(replace_placeholder(cmd_raw, jobs), str(source_path))
                 try:
-                    if not shutil.which(cmd[0]) and not os.access(cmd[0], os.X_OK):
-                        path = Path(cmd[0])
-                        current_mode = path.stat().st_mode
-                        path.chmod(current_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+                    executable = Path(cmd[0]) if Path(cmd[0]).is_absolute() else Path(cwd_str) / cmd[0]
+                    if not shutil.which(cmd[0]) and not os.access(executable, os.X_OK):
+                        current_mode = executable.stat().st_mode
+                        executable.chmod(current_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
                 except Exception as e:
                     logger.exception(f"Exception occurred during manual build (chmod on {cmd[0]}): {e}")
-                    logger.error("Current working directory: {}".format(os.getcwd()))
+                    logger.error("Current working directory: {}".format(cwd_str))
                     return False
 
-                cwd_str = replace_solver_dir_in_str(cwd_raw,str(self._path_solver))
-
                 logger.info(f"Step {index + 1}/{len(build_steps)}: {' '.join(cmd)}")
                 log_file.write(f"Step {index + 1}/{len(build_steps)}: {' '.join(cmd)} (cwd: {cwd_str})\n")
                 log_file.flush()
 
                 try:
-                    result = subprocess.run(
-                        cmd,
-                        cwd=cwd_str,
-                        stdout=log_file,
-                        stderr=subprocess.STDOUT,
-                        text=True
-                    )
-                    if result.returncode == 0:
+                    with profile.step(f"build step {index + 1}", "build", cmd=" ".join(cmd)):
+                        returncode = run_with_usage(
+                            cmd,
+                            cwd=cwd_str,
+                            stdout=log_file,
+                            stderr=subprocess.STDOUT,
+                            text=True
+                        )
+                    if returncode == 0:
                         logger.success(f"Step {index + 1} succeeded.")
                         success = True
                     else:
-                        logger.warning(f"Step {index + 1} failed with exit code {result.returncode}.")
+                        logger.warning(f"Step {index + 1} failed with exit code {returncode}.")
                         success = False
                         break
                 except Exception as e:
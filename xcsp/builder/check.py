@@ -5,7 +5,7 @@ MAP_BUILDER = {
     "cpp": ["cmake", "make"],
     "c":["make"],
     "rust": ["cargo"],
-    "python": "python"
+    "python": ["python", "python3"]
 }
 
 MAP_LANGUAGE_FILES = {
@@ -20,5 +20,14 @@ MAP_FILE_LANGUAGE = {file: lang for lang, files in MAP_LANGUAGE_FILES.items() fo
 
 
 def check_available_builder_for_language(language):
+    """
+    Tell whether one of the builders of a language (see :data:`MAP_BUILDER`) is installed.
+
+    Args:
+        language (str): The language of the solver.
+
+    Returns:
+        bool: True if one of its builders is found in the PATH.
+    """
     builders = MAP_BUILDER.get(language)
     return any([shutil.which(b) for b in builders])
@@ -0,0 +1,95 @@
+"""
+Module handling the 'index' subcommand for the XCSP launcher CLI.
+
+This module indexes the metadata of XCSP3 instances (type, numbers of variables and constraints,
+types of the constraints, domain sizes, objectives) in a persistent index, so that they are read
+once for all, and prints them as a table or as JSON.
+"""
+import json
+
+from loguru import logger
+from rich.console import Console
+from rich.table import Table
+
+from xcsp.utils.instances import InstanceIndex
+from xcsp.utils.log import unknown_command
+
+
+def _print_entries(entries):
+    table = Table(title="Instances")
+    for header in ["Instance", "Type", "Variables", "Constraints", "Domain sizes", "Constraint types"]:
+        table.add_column(header, justify="right" if header in ("Variables", "Constraints") else "left")
+    for entry in entries:
+        types = sorted(entry["constraint_types"].items(), key=lambda item: -item[1])
+        table.add_row(entry["name"], entry["type"] or "", str(entry["variables"]), str(entry["constraints"]),
+                      f"{entry['min_domain_size']}..{entry['max_domain_size']}" if entry["variables"] else "",
+                      ", ".join(f"{name} ({count})" for name, count in types))
+    Console(width=200).print(table)
+
+
+def index(args):
+    """Execute the 'index' subcommand."""
+    instance_index = InstanceIndex(args.get("index"))
+    stats = instance_index.update(args["instances"], args.get("workers"), args["rebuild"])
+    logger.info(f"Index {instance_index.path} updated: {stats['parsed']} instances parsed, {stats['hashed']} files "
+                f"hashed, {stats['unchanged']} unchanged, {stats['removed']} removed, {stats['failed']} failed.")
+    entries = instance_index.entries(args["instances"])
+    if args["json_output"]:
+        print(json.dumps(entries, indent=2))
+    else:
+        _print_entries(entries)
+
+
+def fill_parser(parser):
+    """Register the 'index' subcommand and its arguments to the parser.
+
+    Args:
+        parser: An argparse subparser object to which the 'index' command is added.
+    """
+    parser_index = parser.add_parser(
+        "index",
+        help="Index the metadata of XCSP3 instances (type, variables, constraints, domains, objectives)."
+    )
+    parser_index.add_argument(
+        "instances",
+        nargs="+",
+        help="Instances (.xml, .xml.lzma or .xml.xz) or directories containing them (recursively)."
+    )
+    parser_index.add_argument(
+        "--index",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="JSON file of the index (default: instance_index.json in the cache directory)."
+    )
+    parser_index.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes hashing and parsing the instances (default: number of cores)."
+    )
+    parser_index.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Parse all the instances again, even those already indexed."
+    )
+    parser_index.add_argument(
+        "-j", "--json-output",
+        action="store_true",
+        help="Print the metadata of the instances as JSON instead of a table."
+    )
+
+
+MAP_COMMAND = {
+    "index": index,
+}
+
+
+def manage_command(args):
+    """Dispatch and manage subcommands for the XCSP launcher binary.
+
+    Args:
+        args (dict): Parsed command-line arguments.
+    """
+    subcommand = args['subcommand']
+    MAP_COMMAND.get(subcommand, unknown_command)(args)
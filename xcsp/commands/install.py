@@ -6,12 +6,15 @@ build requirements, building the solver, and placing binaries at the correct loc
 """
 
 import enum
+import json
 import os
 import platform
 import shutil
 import tempfile
+import threading
 from abc import ABC, abstractmethod
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
@@ -22,14 +25,17 @@ from timeit import default_timer as timer
 
 from packaging.version import Version
 
+from xcsp.builder.artifacts import BUILD_MARKER, BuildCache, DEFAULT_MAX_SIZE, compute_build_key
 from xcsp.builder.build import AutoBuildStrategy, ManualBuildStrategy
 from xcsp.builder.check import check_available_builder_for_language, MAP_FILE_LANGUAGE, MAP_LANGUAGE_FILES, MAP_BUILDER
-from xcsp.utils.archive import ALL_ARCHIVE_EXTENSIONS, extract_archive
+from xcsp.utils.archive import ALL_ARCHIVE_EXTENSIONS, download_and_extract
 from xcsp.utils.args import at_least_one, at_most_one
 from xcsp.utils.dict import get_with_fallback
+from xcsp.utils.gitmirror import MIRRORS
 from xcsp.utils.http import resolve_url, download
+from xcsp.utils.profile import Profiler, active_profiler, set_active_profiler, step
 from xcsp.utils.placeholder import replace_placeholder, replace_core_placeholder, replace_solver_dir_in_str, \
-    replace_bin_dir_in_str
+    replace_bin_dir_in_str, normalize_placeholders
 from xcsp.solver.cache import CACHE, Cache
 from xcsp.solver.resolver import resolve_config, DEFAULT_EXT
 import xcsp.utils.paths as paths
@@ -148,10 +154,29 @@ def keep_only_semver_versions(all_versions):
     return sort_versions(results)
 
 
+def set_latest_alias(id_solver, entry):
+    """
+    Give the alias 'latest' to the most recent version of a solver, if none of its versions has it.
+
+    Args:
+        id_solver (str): The id of the solver.
+        entry (dict): The cache entry of the solver, with all its versions.
+    """
+    versions = entry["versions"]
+    if any("latest" in version.get("alias", []) for version in versions.values()):
+        return
+    list_versions = keep_only_semver_versions(list(versions))
+    if len(list_versions) > 0:
+        latest = list_versions[-1]
+        logger.info(f"No version of {id_solver} with alias 'latest' found, setting '{latest}' as latest version.")
+        versions[latest].setdefault("alias", []).append("latest")
+
+
 class Installer:
     """Main class responsible for installing a solver from a repository."""
 
-    def __init__(self, url: str, solver_name: str, id_s: str, config=None):
+    def __init__(self, url: str, solver_name: str, id_s: str, config=None, jobs: int | None = None,
+                 build_cache: BuildCache | None = None, print_profile: bool = False):
         self._url = url
         self._solver = solver_name
         self._id = id_s
@@ -161,10 +186,16 @@ class Installer:
         self._config = config
         self._config_strategy = None
         self._mode_build_strategy = None
+        self._jobs = jobs
+        self._concurrent_builds = 1
+        self._build_cache = build_cache
+        self._print_profile = print_profile
 
     def _init(self):
         """Initialize the solver installation directory."""
-        self._path_solver = Path(paths.get_solver_install_dir()) / self._id
+        local_path = self._config.get("path") if self._config is not None else None
+        # The sources of a local solver are used in place.
+        self._path_solver = Path(local_path) if local_path else Path(paths.get_solver_install_dir()) / self._id
 
         if not self._id in CACHE:
             CACHE[self._id] = {
@@ -222,19 +253,23 @@ class Installer:
         for dep in dependencies:
             git_url = dep.get("git")
             url = dep.get("url")
-            if git_url:
-                self._manage_git_dependency(dep, git_url)
-            elif url and any(url.endswith(ext) for ext in ALL_ARCHIVE_EXTENSIONS):
-                self._manage_archive_dependency(dep, url)
-            elif url:
-                self._manage_file_dependency(dep, url)
-            else:
-                logger.warning(f"Dependency {dep} does not have a valid URL or git repository specified.")
-                continue
+            with step("dependency", "dependency", url=git_url or url):
+                if git_url:
+                    self._manage_git_dependency(dep, git_url)
+                elif url and any(url.endswith(ext) for ext in ALL_ARCHIVE_EXTENSIONS):
+                    self._manage_archive_dependency(dep, url)
+                elif url:
+                    self._manage_file_dependency(dep, url)
+                else:
+                    logger.warning(f"Dependency {dep} does not have a valid URL or git repository specified.")
+
+    def _shared_dependency_dir(self, name: str) -> Path:
+        """Return the default directory of a dependency, shared by all the solvers declaring it."""
+        return self._path_solver.parent.parent / "deps" / name
 
     def _manage_git_dependency(self, dep, git_url):
         name = git_url.split("/")[-1].replace(".git", "")
-        default_dir = self._path_solver.parent.parent / "deps" / name
+        default_dir = self._shared_dependency_dir(name)
         target_dir = replace_solver_dir_in_str(dep.get("dir"), str(self._repo.get_source_path())) if dep.get(
             "dir") else default_dir
         target_dir = Path(target_dir)
@@ -244,7 +279,9 @@ class Installer:
             start_time = timer()
             try:
                 repo = Repo(target_dir)
-                repo.remotes.origin.pull()
+                MIRRORS.fetch(repo, git_url)
+                if not repo.head.is_detached:
+                    repo.git.merge("--ff-only", f"origin/{repo.active_branch.name}")
                 logger.success(f"Pulled updates for {name} in {timer() - start_time:.2f}s.")
             except Exception as e:
                 logger.error(f"Failed to update dependency at {target_dir}: {e}")
@@ -252,14 +289,14 @@ class Installer:
             logger.info(f"Cloning dependency '{name}' into: {target_dir}")
             start_time = timer()
             try:
-                Repo.clone_from(git_url, target_dir)
+                MIRRORS.clone(git_url, target_dir, submodules=False)
                 logger.success(f"Cloned {name} in {timer() - start_time:.2f}s.")
             except Exception as e:
                 logger.error(f"Failed to clone dependency from {git_url} to {target_dir}: {e}")
 
     def _manage_archive_dependency(self, dep, url):
         name = url.split("/")[-1].split(".")[0]
-        default_dir = self._repo.get_source_path().parent / "deps" / name
+        default_dir = self._shared_dependency_dir(name)
         target_dir = replace_solver_dir_in_str(dep.get("dir"), str(self._repo.get_source_path())) if dep.get(
             "dir") else default_dir
         target_dir = Path(target_dir)
@@ -271,11 +308,8 @@ class Installer:
         start_time = timer()
         try:
             with tempfile.TemporaryDirectory() as tmp_dir:
-                download(url, tmp_dir)
-                logger.info(f"Downloaded finished in {timer() - start_time:.2f} seconds.")
-                archive_path = Path(tmp_dir) / url.split("/")[-1]
-                extract_archive(archive_path, target_dir)
-                logger.success(f"Extracted dependency to {target_dir} in {timer() - start_time:.2f} seconds.")
+                download_and_extract(url, Path(tmp_dir) / url.split("/")[-1], target_dir, dep.get("sha256"))
+                logger.success(f"Downloaded and extracted dependency to {target_dir} in {timer() - start_time:.2f} seconds.")
         except requests.RequestException as e:
             logger.error(f"Failed to download dependency from {url}: {e}")
             logger.exception(e)
@@ -286,13 +320,13 @@ class Installer:
     def _manage_file_dependency(self, dep, url):
         start_time = timer()
         name = url.split("/")[-1].split(".")[0]
-        default_dest = self._repo.get_source_path().parent / "deps" / name
+        default_dest = self._shared_dependency_dir(name)
         target_dir = replace_solver_dir_in_str(dep.get("dir"), str(self._repo.get_source_path())) if dep.get(
                 "dir") else default_dest
         target_dir = Path(target_dir)
         target_dir.parent.mkdir(parents=True, exist_ok=True)
         try:
-            download(url, target_dir)
+            download(url, target_dir, dep.get("sha256"))
             logger.success(f"Downloaded dependency from {url} to {target_dir} in {timer() - start_time:.2f} seconds.")
         except requests.RequestException as e:
             logger.error(f"Failed to download dependency from {url}: {e}")
@@ -302,103 +336,253 @@ class Installer:
             logger.exception(e)
 
     def install(self):
-        """Main method to install the solver."""
+        """Main method to install the solver.
+
+        The steps of the installation are profiled, and the profile is saved in the cache directory.
+        """
+        profiler = Profiler()
+        previous = active_profiler()
+        set_active_profiler(profiler)
+        try:
+            with profiler.step("install", "command", solver=self._id):
+                self._install()
+        finally:
+            set_active_profiler(previous)
+            self._save_profile(profiler)
+            # The steps of the installation are also part of the profile (or trace) of the whole command.
+            if previous is not None:
+                previous.merge(profiler.records(), profiler.epoch, previous.current())
+
+    def _save_profile(self, profiler: Profiler):
+        timestamp = profiler.started_at.strftime("%Y%m%d_%H%M%S")
+        path = profiler.save(paths.get_cache_dir() / "profiles" / f"install_{self._id}_{timestamp}.json")
+        logger.debug(f"Installation profile saved in {path}.")
+        if self._print_profile:
+            profiler.print_summary(f"Installation profile of {self._solver}", timer() - self._start_time,
+                                   exclude_categories=("version", "command"))
+
+    def _install(self):
         self._init()
         self._resolve_config()
 
         self._raise_for_check_system()
-        self._repo = VersionDirectory(self._path_solver, self._config)
+        with step("clone", "source"):
+            self._repo = VersionDirectory(self._path_solver, self._config)
         self._config_strategy.detect_language()
 
-        self._manage_dependency()
+        with step("dependencies", "dependency"):
+            self._manage_dependency()
         self._check()
 
-        have_latest = False
-        # original_ref = self._repo.active_branch.name if not self._repo.head.is_detached else self._repo.head.object.hexsha
+        versions = list(self._config_strategy.versions())
+        jobs = self._jobs if self._jobs is not None and self._jobs > 0 else min(4, os.cpu_count() or 1)
+        jobs = max(1, min(jobs, len(versions)))
+        if not self._repo.supports_isolated_versions():
+            jobs = 1
+        self._concurrent_builds = jobs
+        abort = threading.Event()
+
+        def install_version(v):
+            with step("version", "version", version=v["version"]):
+                self._install_version(v, abort)
+
         with paths.ChangeDirectory(self._path_solver):
-            for v in self._config_strategy.versions():
-                version_timer = timer()
-                logger.info(f"Version '{v['version']}' start ...")
-                try:
-                    logger.info(f"Move to version '{v['version']}'")
-                    self._repo.change_version(get_with_fallback(v, "git_tag", "version"))
-                    need_compile = v.get("executable") is not None and not (
-                            Path(self._repo.get_source_path()) / v.get('executable')).exists() and not self._config.get(
-                        "build", {}).get("per_os", {}).get(normalized_system_name(), {}).get('skip', False)
-                    build_start = timer()
-                    if not self._mode_build_strategy.build() and need_compile:
-                        logger.error(f"Build failed for version '{v['version']}'. Installation aborted.")
-                        break
-                    logger.info(f"Building completed in {timer() - build_start:.2f} seconds.")
-                    bin_dir = paths.get_bin_dir_of_solver(self._id,
-                                                          f"{v['version']}-{get_with_fallback(v, 'git_tag', 'version')}")
-                    os.makedirs(bin_dir, exist_ok=True)
-
-                    if v.get("executable") is None:
-                        logger.warning(
-                            f"Version '{v['version']}' was built, but no executable was specified. "
-                            f"Please manually copy your binaries into {bin_dir}.")
-                        continue
-                    executable_path = Path(v['executable'])
-                    final_placeholder_for_executable= executable_path.name
-                    if executable_path.is_dir():
-                        logger.info(f"Copying content of directory '{executable_path}' to binary directory '{bin_dir}'.")
-                        for item in (Path(self._repo.get_source_path()) / executable_path).iterdir():
-                            dest = bin_dir / item.name
-                            shutil.copy(item.absolute(), dest)
-                        final_placeholder_for_executable = bin_dir
-                        logger.success(f"Directory for version '{v['version']}' successfully copied to {bin_dir}.")
-                    elif executable_path.is_file():
-                        result_path = shutil.copy(Path(self._repo.get_source_path()) / v["executable"],
-                                                  bin_dir / executable_path.name)
-                        final_placeholder_for_executable = bin_dir/executable_path.name
-                        logger.success(f"Executable for version '{v['version']}' successfully copied to {result_path}.")
-
-                    if self._config is not None and self._config.get("command") is not None:
-                        result_cmd = build_cmd(self._config, final_placeholder_for_executable , bin_dir)
-                        logger.debug(result_cmd)
-                        CACHE[self._id]["versions"][v['version']] = {
-                            "options": self._config["command"].get("options", dict()),
-                            "cmd": build_cmd(self._config, final_placeholder_for_executable , bin_dir),
-                            "alias": v.get("alias", list())
-                        }
-                        have_latest = have_latest or "latest" in v.get("alias", []) or v.get("version") == "latest" or v.get("git_tag") == "latest"
-                    logger.debug(executable_path.name)
-
-                    logger.info("Moving files to the binary directory...")
-                    for file in v.get("files", []):
-                        from_path = replace_solver_dir_in_str(file.get("from"), str(self._repo.get_source_path()))
-                        to_path = replace_bin_dir_in_str(file.get("to"), str(bin_dir.absolute()))
-                        logger.info(f"Copying file from '{from_path}' to '{to_path}'")
-                        try:
-                            shutil.copy(from_path, to_path)
-                            logger.success(f"{from_path}....OK")
-                        except Exception as e:
-                            logger.error(f"Failed to move file from '{from_path}' to '{to_path}': {e}")
-                            logger.exception(e)
-                except OSError as e:
-                    logger.error(
-                        f"An error occurred when building the version '{v['version']}' of solver {self._solver}")
-                    logger.exception(e)
-                except Exception as e:
-                    logger.error("An unexpected error occurred during the installation process.")
-                    logger.exception(e)
-                    logger.error(f"Failed to build version '{v['version']}' of solver {self._solver}.")
-                finally:
-                    logger.info(f"Restoring original repository (if needed)...")
-                    self._repo.restore()
-                    logger.info(f"Version '{v['version']}' end ... {timer() - version_timer:.2f} seconds.")
-            all_versions = list(CACHE[self._id]["versions"].keys())
-            list_versions = keep_only_semver_versions(all_versions)
-            if not have_latest and len(list_versions)>0:
-                latest = list_versions[-1]
-                logger.debug(list_versions)
-                logger.info(f"No version with alias 'latest' found, setting '{latest}' as latest version.")
-                CACHE[self._id]["versions"][latest]["alias"].append("latest")
+            if jobs > 1:
+                logger.info(f"Building {len(versions)} versions with {jobs} jobs.")
+                with ThreadPoolExecutor(max_workers=jobs) as executor:
+                    list(executor.map(install_version, versions))
+            else:
+                for v in versions:
+                    install_version(v)
+            self._repo.cleanup()
         logger.info("Generating cache of solver...")
-        Cache.save_cache(CACHE)
+        with step("solver cache update", "cache"):
+            # The 'latest' alias is decided on the merged entry, which includes the versions installed meanwhile.
+            merged_cache = Cache.update_entries({self._id: CACHE[self._id]}, normalize=set_latest_alias)
+        CACHE.clear()
+        CACHE.update(merged_cache)
         logger.info(f"Installation (of all versions) completed in {timer() - self._start_time:.2f} seconds.")
 
+    def _install_version(self, v, abort: threading.Event):
+        """
+        Build and install a single version of the solver.
+
+        Args:
+            v (dict): The version, as described in the configuration.
+            abort (threading.Event): Event set when the installation has to be aborted.
+        """
+        if abort.is_set():
+            logger.warning(f"Version '{v['version']}' skipped since the installation was aborted.")
+            return
+        version_timer = timer()
+        logger.info(f"Version '{v['version']}' start ...")
+        ref = get_with_fallback(v, "git_tag", "version")
+        source_path = None
+        released = False
+        try:
+            bin_dir = paths.get_bin_dir_of_solver(self._id, f"{v['version']}-{ref}")
+            revision = self._repo.resolve_revision(ref)
+            final_placeholder_for_executable = self._up_to_date_executable(v, bin_dir, revision)
+            build_key = None
+            if final_placeholder_for_executable is not None:
+                logger.success(f"Version '{v['version']}' is already installed at revision {revision}, nothing to build.")
+            else:
+                build_key = self._build_key(v, revision)
+                with step("build cache restore", "cache"):
+                    final_placeholder_for_executable = self._restore_build(build_key, bin_dir)
+                if final_placeholder_for_executable is not None:
+                    self._write_build_marker(bin_dir, revision, final_placeholder_for_executable)
+            if final_placeholder_for_executable is None:
+                logger.info(f"Move to version '{v['version']}'")
+                with step("checkout", "source"):
+                    source_path = Path(self._repo.checkout(ref))
+                    self._localize_dependencies(source_path)
+                need_compile = v.get("executable") is not None and not (
+                        source_path / v.get('executable')).exists() and not self._config.get(
+                    "build", {}).get("per_os", {}).get(normalized_system_name(), {}).get('skip', False)
+                build_start = timer()
+                with step("build", "build"):
+                    built = self._mode_build_strategy.build(source_path, self._concurrent_builds)
+                if not built and need_compile:
+                    logger.error(f"Build failed for version '{v['version']}'. Installation aborted.")
+                    abort.set()
+                    return
+                logger.info(f"Building completed in {timer() - build_start:.2f} seconds.")
+                os.makedirs(bin_dir, exist_ok=True)
+
+                if v.get("executable") is None:
+                    logger.warning(
+                        f"Version '{v['version']}' was built, but no executable was specified. "
+                        f"Please manually copy your binaries into {bin_dir}.")
+                    return
+                with step("copy to bin", "install"):
+                    final_placeholder_for_executable = self._copy_executable(v, source_path, bin_dir)
+                    self._copy_files(v, source_path, bin_dir)
+                    self._write_build_marker(bin_dir, revision, final_placeholder_for_executable)
+                if build_key is not None:
+                    with step("build cache save", "cache"):
+                        self._build_cache.save(build_key, bin_dir, final_placeholder_for_executable)
+
+            if self._config is not None and self._config.get("command") is not None:
+                result_cmd = build_cmd(self._config, final_placeholder_for_executable , bin_dir)
+                logger.debug(result_cmd)
+                CACHE[self._id]["versions"][v['version']] = {
+                    "options": self._config["command"].get("options", dict()),
+                    "cmd": result_cmd,
+                    "alias": list(v.get("alias", list()))
+                }
+            if source_path is not None:
+                logger.info(f"Releasing sources of version '{v['version']}'...")
+                self._repo.release(ref)
+                released = True
+        except OSError as e:
+            logger.error(
+                f"An error occurred when building the version '{v['version']}' of solver {self._solver}")
+            logger.exception(e)
+        except Exception as e:
+            logger.error("An unexpected error occurred during the installation process.")
+            logger.exception(e)
+            logger.error(f"Failed to build version '{v['version']}' of solver {self._solver}.")
+        finally:
+            if source_path is not None and not released and not self._repo.supports_isolated_versions():
+                logger.info(f"Restoring original repository (if needed)...")
+                self._repo.release(ref)
+            logger.info(f"Version '{v['version']}' end ... {timer() - version_timer:.2f} seconds.")
+
+    def _copy_executable(self, v, source_path: Path, bin_dir: Path):
+        """Copy the executable (file or directory) of a built version to its binary directory."""
+        executable_path = source_path / v['executable']
+        final_placeholder_for_executable = Path(v['executable']).name
+        if executable_path.is_dir():
+            logger.info(f"Copying content of directory '{executable_path}' to binary directory '{bin_dir}'.")
+            for item in executable_path.iterdir():
+                dest = bin_dir / item.name
+                shutil.copy(item.absolute(), dest)
+            final_placeholder_for_executable = bin_dir
+            logger.success(f"Directory for version '{v['version']}' successfully copied to {bin_dir}.")
+        elif executable_path.is_file():
+            result_path = shutil.copy(executable_path, bin_dir / executable_path.name)
+            final_placeholder_for_executable = bin_dir / executable_path.name
+            logger.success(f"Executable for version '{v['version']}' successfully copied to {result_path}.")
+        logger.debug(executable_path.name)
+        return final_placeholder_for_executable
+
+    def _copy_files(self, v, source_path: Path, bin_dir: Path):
+        """Copy the additional files of a built version to its binary directory."""
+        logger.info("Moving files to the binary directory...")
+        for file in v.get("files", []):
+            from_path = replace_solver_dir_in_str(file.get("from"), str(source_path))
+            to_path = replace_bin_dir_in_str(file.get("to"), str(bin_dir.absolute()))
+            logger.info(f"Copying file from '{from_path}' to '{to_path}'")
+            try:
+                shutil.copy(from_path, to_path)
+                logger.success(f"{from_path}....OK")
+            except Exception as e:
+                logger.error(f"Failed to move file from '{from_path}' to '{to_path}': {e}")
+                logger.exception(e)
+
+    def _build_key(self, v, revision: str | None) -> str | None:
+        """Compute the key of a version in the build cache, or None if the build cache cannot be used."""
+        if self._build_cache is None or revision is None or v.get("executable") is None:
+            return None
+        return compute_build_key(revision, self._config, v, self._config_strategy.language())
+
+    def _restore_build(self, build_key: str | None, bin_dir: Path):
+        """Restore the artifacts of a version from the build cache, if available."""
+        if build_key is None:
+            return None
+        return self._build_cache.restore(build_key, bin_dir)
+
+    @staticmethod
+    def _write_build_marker(bin_dir: Path, revision: str | None, executable):
+        """Record the revision installed in a binary directory."""
+        if revision is None:
+            return
+        with open(bin_dir / BUILD_MARKER, "w") as f:
+            json.dump({"revision": revision, "executable": str(executable)}, f)
+
+    @staticmethod
+    def _up_to_date_executable(v, bin_dir: Path, revision: str | None):
+        """
+        Check whether a binary directory already contains the given revision of a version.
+
+        Returns:
+            The placeholder of the installed executable if the binary directory is up-to-date, None otherwise.
+        """
+        marker = bin_dir / BUILD_MARKER
+        if revision is None or v.get("executable") is None or not marker.exists():
+            return None
+        try:
+            with open(marker) as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if content.get("revision") != revision or not Path(content.get("executable", "")).exists():
+            return None
+        return Path(content["executable"])
+
+    def _localize_dependencies(self, source_path: Path):
+        """
+        Make the dependencies installed inside the main source directory available in another
+        checkout of the sources (e.g. the worktree of a version).
+        """
+        main_source = Path(self._repo.get_source_path())
+        if not self._config or source_path == main_source:
+            return
+        for dep in self._config.get("build", {}).get("dependencies", []) or []:
+            if not dep.get("dir") or "solver_dir" not in normalize_placeholders(dep.get("dir")):
+                continue
+            origin = Path(replace_solver_dir_in_str(dep.get("dir"), str(main_source)))
+            target = Path(replace_solver_dir_in_str(dep.get("dir"), str(source_path)))
+            if not origin.exists() or target.exists():
+                continue
+            logger.info(f"Copying dependency from {origin} to {target}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if origin.is_dir():
+                shutil.copytree(origin, target, symlinks=True)
+            else:
+                shutil.copy(origin, target)
+
     def _raise_for_check_system(self):
         """Raise an error if the system check is not compatible."""
         if self._config is None or "system" not in self._config:
@@ -427,6 +611,14 @@ def fill_parser(parser):
                                 required=False, default=None)
     parser_install.add_argument("--source", help="Hosting service for the repository.", choices=[e for e in RepoSource],
                                 default=RepoSource.GITHUB, type=RepoSource)
+    parser_install.add_argument("--no-build-cache", help="Always build the solver, without using the build cache.",
+                                action="store_true", default=False)
+    parser_install.add_argument("--build-cache-dir", type=str, default=None,
+                                help="Directory of the build cache (can be shared between nodes).")
+    parser_install.add_argument("--build-cache-max-size", type=int, default=None,
+                                help="Maximum size of the build cache, in MiB (default: 5120).")
+    parser_install.add_argument("--profile", action="store_true", default=False,
+                                help="Print where the time goes: wall time, CPU time and peak memory of each step.")
 
 
 def install(args):
@@ -441,15 +633,11 @@ def install(args):
 
     config_path = args['config']  # get the config path from args
     if config_path is None and url is not None and any(
-            [url.endwith(ext) for ext in DEFAULT_EXT]):  # check if url is a config file
+            [url.endswith(ext) for ext in DEFAULT_EXT]):  # check if url is a config file
         # if the url is a config file, download it
         config_path = paths.get_solver_config_dir() / url.split("/")[-1]
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            with open(config_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            download(url, config_path)
             logger.info(f"Configuration file downloaded successfully from {url}.")
         except requests.RequestException as e:
             logger.error(f"Failed to download configuration file from {url}: {e}")
@@ -461,13 +649,22 @@ def install(args):
             config = yaml.safe_load(f)
             name = config['name']
             id_s = config['id']
+            if config.get('path') is not None:
+                # A relative path is relative to the configuration file.
+                config['path'] = str((Path(config_path).parent / Path(config['path']).expanduser()).resolve())
             url = config.get('git', None) or config.get('path', None)
     # Now if url is always None and config is also None, we try to resolve the url from repo and source
     if url is None and config is None:
         url = resolve_url(args['repo'], args['source'])
 
     # Now we have either a valid URL or loaded config
-    installer = Installer(url, name, id_s, config=config)
+    build_cache = None
+    if not args.get('no_build_cache', False):
+        max_size = args.get('build_cache_max_size')
+        build_cache = BuildCache(args.get('build_cache_dir'),
+                                 max_size * 1024 ** 2 if max_size is not None else DEFAULT_MAX_SIZE)
+    installer = Installer(url, name, id_s, config=config, jobs=args.get('jobs'), build_cache=build_cache,
+                          print_profile=args.get('profile', False))
     installer.install()
 
 
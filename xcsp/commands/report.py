@@ -0,0 +1,163 @@
+"""
+Module handling the 'report' subcommand for the XCSP launcher CLI.
+
+This module aggregates the results of many solver runs (written with ``xcsp solver --json-output``)
+into a report: solved instances, PAR-k scores, virtual best solver, cactus plot data and scores
+on optimization problems, printed as a table or written as JSON and CSV files.
+"""
+import csv
+import json
+from pathlib import Path
+
+from loguru import logger
+from rich.console import Console
+from rich.table import Table
+
+from xcsp.utils.log import unknown_command
+
+
+def _print_summary(rows, par):
+    table = Table(title="Campaign Report")
+    headers = ["Solver", "Runs", "Solved", "SAT", "UNSAT", "Optimum", "Timeouts", "Errors", par.upper(), "COP score"]
+    keys = ["solver", "runs", "solved", "sat", "unsat", "optimum", "timeouts", "errors", par, "cop_score"]
+    for header in headers:
+        table.add_column(header, justify="left" if header == "Solver" else "right")
+    for row in rows:
+        table.add_row(*[("" if row.get(k) is None else f"{row[k]:.2f}" if k == par else str(row[k])) for k in keys])
+    Console(width=200).print(table)
+
+
+def _write_csv(path: Path, rows, fieldnames):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    logger.info(f"Report written to {path}.")
+
+
+def report(args):
+    """Execute the 'report' subcommand."""
+    # The analysis depends on numpy, which is only imported when a report is asked.
+    from xcsp.analysis.anytime import load_references
+    from xcsp.analysis.campaign import Runs, load_results
+    from xcsp.analysis.store import export_results, is_store, load_store
+
+    clock = "cpu_time" if args["cpu_time"] else "wall_clock_time"
+    if len(args["results"]) == 1 and is_store(args["results"][0]):
+        runs = Runs.from_store(load_store(args["results"][0]), clock)
+    else:
+        results = load_results(args["results"])
+        if not results:
+            logger.error("No result of solver run found.")
+            return
+        if args.get("export") is not None:
+            path = export_results(results, args["export"], args["store_format"])
+            logger.info(f"Results of {len(results)} runs exported to {path}.")
+        runs = Runs.from_results(results, clock)
+    logger.info(f"Aggregating the results of {len(runs)} runs.")
+    references = load_references(args["references"]) if args.get("references") else None
+    k, time_limit = args["par"], args.get("time_limit")
+    par = f"par{k:g}"
+
+    try:
+        summary = runs.summary(k, time_limit, references)
+    except ValueError as e:
+        logger.error(f"{e} (use --time-limit)")
+        return
+    instances = runs.instances_summary(k, time_limit, references)
+    cactus = [{"solver": solver, "rank": rank + 1, "time": time.item()}
+              for solver, times in runs.cactus(time_limit).items() for rank, time in enumerate(times)]
+
+    if args["json_output"]:
+        print(json.dumps({"summary": summary, "instances": instances, "cactus": cactus}, indent=2))
+    else:
+        _print_summary(summary, par)
+
+    if args.get("csv") is not None:
+        directory = Path(args["csv"])
+        directory.mkdir(parents=True, exist_ok=True)
+        _write_csv(directory / "summary.csv", summary, ["solver", "runs", "solved", "sat", "unsat", "optimum",
+                                                        "timeouts", "errors", par, "cop_score"])
+        _write_csv(directory / "instances.csv", instances, ["instance", "vbs_solver", "vbs_time", "solved",
+                                                            "best_value", "minimize"])
+        _write_csv(directory / "cactus.csv", cactus, ["solver", "rank", "time"])
+
+
+def fill_parser(parser):
+    """Register the 'report' subcommand and its arguments to the parser.
+
+    Args:
+        parser: An argparse subparser object to which the 'report' command is added.
+    """
+    parser_report = parser.add_parser(
+        "report",
+        help="Aggregate the results of solver runs (written with 'xcsp solver --json-output')."
+    )
+    parser_report.add_argument(
+        "results",
+        nargs="+",
+        help="Result files (.json or .jsonl) or directories containing them, or a store written with --export."
+    )
+    parser_report.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        help="Time limit of the runs, in seconds (default: the time limit stored with each result)."
+    )
+    parser_report.add_argument(
+        "--par",
+        type=float,
+        default=2,
+        help="Penalty of the unsolved runs in the PAR score, in time limits (default: 2, i.e. PAR2)."
+    )
+    parser_report.add_argument(
+        "--cpu-time",
+        action="store_true",
+        help="Use the CPU time of the runs instead of their wall-clock time."
+    )
+    parser_report.add_argument(
+        "--references",
+        type=str,
+        default=None,
+        help="Best known values of the instances, in the format of tests/xcsp3/cop/SAT/solutions.json."
+    )
+    parser_report.add_argument(
+        "--csv",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Directory in which summary.csv, instances.csv and cactus.csv (plot data) are written."
+    )
+    parser_report.add_argument(
+        "--export",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Directory in which the results are stored in columns, to be reported on (or analysed) faster."
+    )
+    parser_report.add_argument(
+        "--store-format",
+        choices=["npy", "arrow", "parquet"],
+        default="npy",
+        help="Format of the columns written with --export (default: npy; arrow and parquet require pyarrow)."
+    )
+    parser_report.add_argument(
+        "-j", "--json-output",
+        action="store_true",
+        help="Print the report as JSON instead of a table."
+    )
+
+
+MAP_COMMAND = {
+    "report": report,
+}
+
+
+def manage_command(args):
+    """Dispatch and manage subcommands for the XCSP launcher binary.
+
+    Args:
+        args (dict): Parsed command-line arguments.
+    """
+    subcommand = args['subcommand']
+    MAP_COMMAND.get(subcommand, unknown_command)(args)
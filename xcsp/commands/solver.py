@@ -214,6 +214,28 @@ def fill_parser(parser):
         ),
     )
 
+    # --- Enumeration of solutions ---
+    parser_solver.add_argument(
+        "--solutions-file",
+        type=str,
+        default=None,
+        help="Stream all the solutions to this file, as JSON lines (compressed if it ends with .gz, .xz or .bz2)."
+    )
+    parser_solver.add_argument(
+        "--keep-last",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Keep only the last N solutions in memory (and in the JSON output), to enumerate many solutions "
+             "in bounded memory."
+    )
+    parser_solver.add_argument(
+        "--count-distinct",
+        default=False,
+        action="store_true",
+        help="Count the distinct solutions found by the solver (with a 128-bit hash of each of them)."
+    )
+
     # --- Listing solvers ---
     parser_solver.add_argument(
         "--solvers",
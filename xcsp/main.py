@@ -1,18 +1,22 @@
 import importlib
+import os
 import pkgutil
 import sys
 from argparse import ArgumentParser
+from datetime import datetime
 from typing import Tuple, Dict, Any
 from timeit import default_timer as timer
 from loguru import logger
 from pyfiglet import Figlet
-from tqdm import tqdm
 
 import xcsp
+from xcsp.builder.build import BUILD_JOBS
 from xcsp.commands import manage_subcommand
-from xcsp.utils.bootstrap import check_bootstrap
+from xcsp.utils.bootstrap import check_bootstrap, run_bootstrap
 from xcsp.utils.log import init_log
-from xcsp.utils.paths import get_system_config_dir, print_path_summary
+from xcsp.utils.metrics import start_metrics_server
+from xcsp.utils.paths import get_cache_dir, get_system_config_dir, print_path_summary
+from xcsp.utils.profile import profile_launcher
 
 
 #############
@@ -33,20 +37,17 @@ def discover_and_fill_parsers(package_name, subparser):
             module.fill_parser(subparser)
 
 
-def bootstrap(argument_parser):
+def bootstrap(args):
     system_paths = get_system_config_dir()
     start_time = timer()
     logger.info(system_paths)
+    config_files = []
     for sp in system_paths:
         if not sp.exists():
             logger.warning(f'System config path {sp} not exists.')
             continue
-        for file in tqdm(list(sp.glob("*.solver.yaml"))):
-            start_solver = timer()
-            logger.info(f"Installing solver {str(file)}...")
-            arguments = vars(argument_parser.parse_args(f"install -c {file.absolute()}".split()))
-            manage_subcommand(arguments)
-            logger.info(f"Finished installing solver...{(timer() - start_solver):.2f} seconds")
+        config_files.extend(sorted(sp.glob("*.solver.yaml")))
+    run_bootstrap(config_files, args.get("jobs"), args["level"], args.get("build_jobs"))
     logger.info(f"Finished bootstrap command...{(timer() - start_time):.2f} seconds")
 
 
@@ -76,8 +77,30 @@ def parse_arguments() -> Tuple[ArgumentParser, Dict[str, Any]]:
                         help='shows the version of XCSP launcher being executed',
                         action='store_true')
     parser.add_argument('--bootstrap', help="Install default solver from system configuration.", action='store_true')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Maximum number of concurrent installations: solvers during the bootstrap, "
+                             "versions of a solver during an install.")
+    parser.add_argument('--build-jobs', type=int, default=None,
+                        help="Maximum number of parallel jobs shared by all the builds (default: number of cores).")
+    parser.add_argument('--offline', action='store_true',
+                        help="Never access the network: files to download must be in the download cache.")
+    parser.add_argument('--download-cache-max-size', type=int, default=None,
+                        help="Maximum size (in MiB) of the download cache (default: 2048).")
     parser.add_argument('--info', help="Produce a table with different information about the current installation.",
                         action='store_true')
+    parser.add_argument('--profile', dest='launcher_profile', action='store_true',
+                        help="Profile the launcher: print the time spent in each of its phases, "
+                             "and save a pstats file of its functions.")
+    parser.add_argument('--profile-output', type=str, default=None,
+                        help="Path of the pstats file written with --profile (default: in the cache directory).")
+    parser.add_argument('--trace', type=str, default=None, metavar='PATH',
+                        help="Write the steps of the command (installation, solving, ...) to a trace file, "
+                             "in the Chrome Trace Event format (to open with Perfetto).")
+    parser.add_argument('--metrics-port', type=int, default=None, metavar='PORT',
+                        help="Expose metrics of the launcher (solver runs, timeouts, ...) in the Prometheus format "
+                             "on http://<host>:PORT/metrics while it is running.")
+    parser.add_argument('--metrics-host', type=str, default="127.0.0.1",
+                        help="Address on which the metrics are exposed (default: 127.0.0.1).")
     return parser, vars(parser.parse_args())
 
 
@@ -116,9 +139,32 @@ def main():
     # Parsing the command line arguments.
     argument_parser, args = parse_arguments()
     init_log(args["level"])
-
+    BUILD_JOBS.set_total(args.get("build_jobs"))
+    # Exported through the environment so that the bootstrap workers see them too.
+    if args.get("offline"):
+        os.environ["XCSP_OFFLINE"] = "1"
+    if args.get("download_cache_max_size") is not None:
+        os.environ["XCSP_DOWNLOAD_CACHE_MAX_SIZE"] = str(args["download_cache_max_size"])
+
+    if args.get("metrics_port") is not None:
+        start_metrics_server(args["metrics_port"], args["metrics_host"])
+
+    if args.get("launcher_profile") or args.get("trace"):
+        name = args.get("subcommand") or ("bootstrap" if args["bootstrap"] else "xcsp")
+        output = args.get("profile_output")
+        if output is None and args.get("launcher_profile"):
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output = get_cache_dir() / "profiles" / f"launcher_{name}_{timestamp}.prof"
+        with profile_launcher(name, output if args.get("launcher_profile") else None, args.get("trace")):
+            run(argument_parser, args)
+    else:
+        run(argument_parser, args)
+
+
+def run(argument_parser, args):
+    """Run what is asked on the command line."""
     if not args["bootstrap"] and check_bootstrap():
-        bootstrap(argument_parser)
+        bootstrap(args)
     # If the help is asked, we display it and exit.
     if args['help']:
         display_help(argument_parser)
@@ -130,7 +176,7 @@ def main():
         sys.exit()
 
     if args['bootstrap']:
-        bootstrap(argument_parser)
+        bootstrap(args)
         sys.exit()
 
     if args['info']:
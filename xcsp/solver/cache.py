@@ -5,20 +5,66 @@ import xcsp.utils.paths as paths
 
 from loguru import logger
 
+from xcsp.utils.filelock import FileLock, atomic_write_json
+
+
 class Cache:
+    @staticmethod
+    def cache_file():
+        return paths.get_cache_dir() / "solver_cache.json"
+
+    @staticmethod
+    def lock():
+        """Return the lock protecting the cache file against concurrent updates."""
+        return FileLock(paths.get_cache_dir() / "solver_cache.json.lock")
+
     @staticmethod
     def create_from_file_or_default():
-        cache_file = paths.get_cache_dir() / "solver_cache.json"
+        cache_file = Cache.cache_file()
         logger.info(f"Reading cache from {cache_file}")
         if os.path.exists(cache_file):
             with open(cache_file, 'r') as f:
                 return json.load(f)
         else:
             return dict()
+
     @staticmethod
     def save_cache(cache):
-        cache_file = paths.get_cache_dir() / "solver_cache.json"
-        with open(cache_file, 'w') as f:
-            json.dump(cache, f)
+        """Replace the whole content of the cache file with the given cache."""
+        with Cache.lock():
+            atomic_write_json(Cache.cache_file(), cache)
+
+    @staticmethod
+    def update_entries(entries, normalize=None):
+        """
+        Merge the given solver entries into the cache file, in a single transaction.
+
+        The current content of the file is re-read under an exclusive lock, so that
+        entries written meanwhile by other processes (e.g. parallel installations) are kept.
+        For a solver already present in the file, the versions are merged, the given ones
+        taking precedence.
+
+        Args:
+            entries (dict): Mapping of solver ids to their cache entry.
+            normalize (Callable | None): Function called with the id of each given solver and its merged entry,
+                before it is written, to update the entry according to all its versions (e.g. their aliases).
+
+        Returns:
+            dict: The merged content of the cache file.
+        """
+        with Cache.lock():
+            current = Cache.create_from_file_or_default()
+            for id_solver, entry in entries.items():
+                merged = dict(current.get(id_solver, dict()))
+                versions = dict(merged.get("versions", dict()))
+                versions.update(entry.get("versions", dict()))
+                merged.update(entry)
+                merged["versions"] = versions
+                if normalize is not None:
+                    normalize(id_solver, merged)
+                current[id_solver] = merged
+            atomic_write_json(Cache.cache_file(), current)
+        return current
+
 
 CACHE = Cache.create_from_file_or_default()
@@ -0,0 +1,206 @@
+"""
+Decoding of XCSP3 instantiations into NumPy arrays.
+
+Solvers print their solutions as ``<instantiation>`` elements, whose ``<list>`` refers to the
+variables of the instance, possibly through array notations (``x[]``, ``x[1..3][]``), and whose
+``<values>`` may use compact forms (``v*3`` for three times ``v``, ``*`` for an undefined value).
+A :class:`VariableLayout` reads the variables of an instance once (see :func:`load_layout`), and
+decodes any instantiation into a flat vector of 64-bit integers, in which each variable has a
+fixed position, viewed as one array per variable (with the shape of the array) when needed.
+
+NumPy is an optional dependency of XCSP Launcher, installed with ``pip install xcsp[analysis]``.
+"""
+import math
+import re
+import xml.etree.ElementTree as ElementTree
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+from xcsp.solver.solutions import UNDEFINED
+from xcsp.utils.archive import open_instance
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_LIST = re.compile(r"<list>(.*?)</list>", re.DOTALL)
+_VALUES = re.compile(r"<values>(.*?)</values>", re.DOTALL)
+_TOKEN = re.compile(r"([^\[\]\s]+)((?:\[[^\]]*\])*)")
+_INDEX = re.compile(r"\[([^\]]*)\]")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Decoding instantiations requires numpy (pip install xcsp[analysis]).")
+
+
+def _parse_values(text: str) -> "np.ndarray":
+    tokens = text.split()
+    if "*" not in text:
+        return np.fromiter(map(int, tokens), dtype=np.int64, count=len(tokens))
+    values = []
+    for token in tokens:
+        if token == "*":
+            values.append(UNDEFINED)
+        elif "*" in token:
+            value, count = token.split("*")
+            values.extend([UNDEFINED if value == "" else int(value)] * int(count))
+        else:
+            values.append(int(token))
+    return np.asarray(values, dtype=np.int64)
+
+
+class VariableLayout:
+    """
+    The variables of an instance, in the order in which they are declared.
+
+    Each variable has a position in a flat vector (the cells of an array being stored in row-major
+    order), in which the instantiations are decoded. Undefined values are :data:`xcsp.solver.solutions.UNDEFINED`.
+    """
+
+    def __init__(self, shapes: Dict[str, Tuple[int, ...]]):
+        """
+        Args:
+            shapes (Dict[str, Tuple[int, ...]]): The shape of each variable (an empty tuple for a single variable),
+                in the order of the variables.
+        """
+        _require_numpy()
+        self.shapes = dict(shapes)
+        self.offsets = dict()
+        self.size = 0
+        for name, shape in self.shapes.items():
+            self.offsets[name] = self.size
+            self.size += math.prod(shape)
+        self._lists = dict()
+
+    @staticmethod
+    def from_instance(path) -> "VariableLayout":
+        """
+        Read the variables of an instance.
+
+        The instance is parsed incrementally, and only up to the end of its variables.
+
+        Args:
+            path (str | Path): The path of the instance (possibly compressed with lzma).
+
+        Returns:
+            VariableLayout: The layout of its variables.
+        """
+        shapes = dict()
+        with open_instance(path) as f:
+            for event, element in ElementTree.iterparse(f, events=("end",)):
+                if element.tag == "var":
+                    shapes[element.get("id")] = ()
+                elif element.tag == "array":
+                    shapes[element.get("id")] = tuple(int(d) for d in _INDEX.findall(element.get("size")))
+                elif element.tag == "variables":
+                    break
+                else:
+                    continue
+                element.clear()
+        return VariableLayout(shapes)
+
+    def positions(self, variables: str) -> "np.ndarray":
+        """
+        Return the positions of the variables of the ``<list>`` of an instantiation.
+
+        Args:
+            variables (str): The content of the list, e.g. ``x[][] y z[1..3]``.
+
+        Returns:
+            np.ndarray: The positions of the variables in the vectors, in the order of the list.
+        """
+        positions = self._lists.get(variables)
+        if positions is not None:
+            return positions
+        parts = []
+        for token in variables.split():
+            match = _TOKEN.fullmatch(token)
+            if match is None or match.group(1) not in self.shapes:
+                raise ValueError(f"Unknown variable {token} in the instantiation.")
+            name, shape = match.group(1), self.shapes[match.group(1)]
+            cells = np.arange(self.offsets[name], self.offsets[name] + math.prod(shape)).reshape(shape)
+            index = []
+            for bounds in _INDEX.findall(match.group(2)):
+                if bounds == "":
+                    index.append(slice(None))
+                elif ".." in bounds:
+                    low, high = bounds.split("..")
+                    index.append(slice(int(low), int(high) + 1))
+                else:
+                    index.append(int(bounds))
+            parts.append(cells[tuple(index)].ravel())
+        positions = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        self._lists[variables] = positions
+        return positions
+
+    def decode(self, solution: str) -> "np.ndarray":
+        """
+        Decode an instantiation into a vector.
+
+        Args:
+            solution (str): The instantiation, as printed by the solver (without the leading ``v``).
+
+        Returns:
+            np.ndarray: The value of each variable (:data:`xcsp.solver.solutions.UNDEFINED` for the variables
+                which are not in the instantiation).
+        """
+        variables, values = _LIST.search(solution), _VALUES.search(solution)
+        if variables is None or values is None:
+            raise ValueError("The solution is not an XCSP3 instantiation.")
+        positions = self.positions(variables.group(1))
+        values = _parse_values(values.group(1))
+        if len(values) != len(positions):
+            raise ValueError(f"The instantiation has {len(values)} values for {len(positions)} variables.")
+        vector = np.full(self.size, UNDEFINED, dtype=np.int64)
+        vector[positions] = values
+        return vector
+
+    def decode_all(self, solutions: Iterable[str]) -> "np.ndarray":
+        """
+        Decode instantiations, one after the other.
+
+        Args:
+            solutions (Iterable[str]): The instantiations.
+
+        Returns:
+            np.ndarray: A matrix, with one row per instantiation (see :meth:`decode`).
+        """
+        rows = [self.decode(solution) for solution in solutions]
+        return np.stack(rows) if rows else np.empty((0, self.size), dtype=np.int64)
+
+    def views(self, vector: "np.ndarray") -> Dict[str, "np.ndarray"]:
+        """
+        View a vector as one array per variable (without copying it).
+
+        Args:
+            vector (np.ndarray): A vector decoded with :meth:`decode`.
+
+        Returns:
+            Dict[str, np.ndarray]: The value of each variable, with the shape of its array (0-dimensional for
+                a single variable).
+        """
+        return {name: vector[offset:offset + math.prod(self.shapes[name])].reshape(self.shapes[name])
+                for name, offset in self.offsets.items()}
+
+
+@lru_cache(maxsize=32)
+def _cached_layout(path: str, modification_time: int, size: int) -> VariableLayout:
+    return VariableLayout.from_instance(path)
+
+
+def load_layout(path) -> VariableLayout:
+    """
+    Return the layout of the variables of an instance, read once as long as the instance is not modified.
+
+    Args:
+        path (str | Path): The path of the instance (possibly compressed with lzma).
+
+    Returns:
+        VariableLayout: The layout of its variables.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    return _cached_layout(str(path), stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,148 @@
+"""Indexed registry of the installed solvers for XCSP Launcher.
+
+This module maintains name, version and alias indexes over the solver cache file
+(``solver_cache.json``) so that looking up a solver does not require building a
+:class:`~xcsp.solver.solver.Solver` for every installed version.
+The indexes are rebuilt only when the cache file changes on disk.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from loguru import logger
+
+import xcsp.utils.paths as paths
+
+
+class SolverEntry:
+    """Description of one installed version of a solver, as stored in the cache file."""
+
+    __slots__ = ("name", "id", "version", "cmd", "options", "alias")
+
+    def __init__(self, name, id_solver, version, cmd, options, alias):
+        self.name = name
+        self.id = id_solver
+        self.version = version
+        self.cmd = cmd
+        self.options = options
+        self.alias = alias if alias is not None else []
+
+    @property
+    def key(self) -> str:
+        """Return the canonical key ``NAME@version`` of this entry."""
+        return f"{self.name.upper()}@{self.version}"
+
+
+class SolverRegistry:
+    """Registry of installed solvers indexed by ``NAME@version`` and ``NAME@alias``.
+
+    The content of the cache file is loaded lazily and reloaded only when the
+    modification time (or the size) of the file changes.
+    """
+
+    def __init__(self, cache_file: Path | None = None):
+        """
+        Initialize the registry.
+
+        Args:
+            cache_file (Path | None): Path to the solver cache file. Defaults to the
+                ``solver_cache.json`` file of the launcher cache directory.
+        """
+        self._cache_file = Path(cache_file) if cache_file is not None else paths.get_cache_dir() / "solver_cache.json"
+        self._lock = threading.Lock()
+        self._signature = None
+        self._by_key: Dict[str, SolverEntry] = {}
+        self._by_alias: Dict[str, SolverEntry] = {}
+        self._by_name: Dict[str, List[SolverEntry]] = {}
+
+    @property
+    def cache_file(self) -> Path:
+        """Return the path of the cache file backing this registry."""
+        return self._cache_file
+
+    def _file_signature(self) -> Tuple[int, int] | None:
+        try:
+            st = os.stat(self._cache_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _refresh(self):
+        """Rebuild the indexes if the cache file changed since the last load."""
+        signature = self._file_signature()
+        if signature is not None and signature == self._signature:
+            return
+        with self._lock:
+            signature = self._file_signature()
+            if signature is not None and signature == self._signature:
+                return
+            content = dict()
+            if signature is not None:
+                try:
+                    with open(self._cache_file, 'r') as f:
+                        content = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Unable to read the solver cache {self._cache_file}: {e}")
+            self._build_indexes(content)
+            self._signature = signature
+
+    def _build_indexes(self, content: dict):
+        by_key = dict()
+        by_alias = dict()
+        by_name = dict()
+        for s in content.values():
+            for version, v in s.get("versions", dict()).items():
+                entry = SolverEntry(s["name_solver"], s["id_solver"], version, v['cmd'], v['options'], v.get('alias'))
+                by_key[entry.key] = entry
+                by_name.setdefault(entry.name.upper(), []).append(entry)
+                for a in entry.alias:
+                    by_alias[f"{entry.name.upper()}@{a}"] = entry
+        self._by_key = by_key
+        self._by_alias = by_alias
+        self._by_name = by_name
+        logger.debug(f"Solver registry loaded with {len(by_key)} solver versions.")
+
+    def invalidate(self):
+        """Force the indexes to be rebuilt on the next access."""
+        with self._lock:
+            self._signature = None
+
+    def get(self, name: str, version: str = 'latest') -> SolverEntry | None:
+        """
+        Retrieve an entry by solver name and version (or alias).
+
+        Args:
+            name (str): Name of the solver (case-insensitive).
+            version (str): Version or alias of the solver.
+
+        Returns:
+            SolverEntry | None: The corresponding entry, or None if it is not installed.
+        """
+        self._refresh()
+        key = f"{name.upper()}@{version}"
+        entry = self._by_key.get(key)
+        return entry if entry is not None else self._by_alias.get(key)
+
+    def versions_of(self, name: str) -> List[SolverEntry]:
+        """Return all the installed versions of the solver with the given name."""
+        self._refresh()
+        return list(self._by_name.get(name.upper(), []))
+
+    def entries(self) -> Iterator[SolverEntry]:
+        """Iterate over all the installed solver versions."""
+        self._refresh()
+        return iter(list(self._by_key.values()))
+
+    def __contains__(self, key: str) -> bool:
+        self._refresh()
+        return key in self._by_key or key in self._by_alias
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._by_key)
+
+
+REGISTRY = SolverRegistry()
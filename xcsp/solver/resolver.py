@@ -4,7 +4,8 @@ This module provides utilities to locate a solver configuration file (.xsc.yaml)
 either from the local cloned repository or from the system-installed configurations.
 It supports fallback mechanisms and ensures the correct configuration is used during installation.
 """
-
+import os
+import threading
 from pathlib import Path
 from loguru import logger
 
@@ -13,9 +14,76 @@ import xcsp.utils.paths as paths
 # Default list of acceptable configuration file extensions
 DEFAULT_EXT = [".xsc.yaml", ".xsc", ".solver.yaml", ".solver",".xsc.yml", ".solver.yml"]
 
+PRUNED_DIRECTORIES = {
+    ".git", ".hg", ".svn", ".worktrees", ".idea", ".vscode", ".gradle", ".venv", "venv",
+    "node_modules", "__pycache__", "build", "target", "dist", "cmake-build-debug", "cmake-build-release",
+}
+"""Directories (VCS metadata, dependencies, build outputs) never searched for configuration files."""
+
+_LOCAL_CONFIGS = dict()
+_LOCAL_CONFIGS_LOCK = threading.Lock()
+
+
+def _git_revision(repo_path: Path) -> str | None:
+    """Read the commit checked out in a git working tree, without running git.
+
+    Returns:
+        str | None: The commit hash, or None if it cannot be determined.
+    """
+    try:
+        git_dir = repo_path / ".git"
+        if git_dir.is_file():
+            git_dir = (repo_path / git_dir.read_text().strip().removeprefix("gitdir:").strip()).resolve()
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref:"):
+            return head
+        ref = head.removeprefix("ref:").strip()
+        common_dir = git_dir
+        if (git_dir / "commondir").exists():
+            common_dir = (git_dir / (git_dir / "commondir").read_text().strip()).resolve()
+        for directory in (git_dir, common_dir):
+            if (directory / ref).is_file():
+                return (directory / ref).read_text().strip()
+        packed_refs = common_dir / "packed-refs"
+        if packed_refs.exists():
+            for line in packed_refs.read_text().splitlines():
+                if line.endswith(" " + ref):
+                    return line.split(" ")[0]
+    except OSError:
+        pass
+    return None
+
+
+def _walk_local_config(clone_path: Path, solver_name: str) -> Path | None:
+    """Walk the repository breadth-first, once, looking for the configuration files of all extensions."""
+    names = {f"{solver_name}{ext}": index for index, ext in enumerate(DEFAULT_EXT)}
+    best, best_index = None, len(DEFAULT_EXT)
+    level = [clone_path]
+    while level and best_index > 0:
+        next_level = []
+        for directory in level:
+            try:
+                with os.scandir(directory) as entries:
+                    entries = sorted(entries, key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in PRUNED_DIRECTORIES:
+                        next_level.append(entry.path)
+                elif names.get(entry.name, best_index) < best_index:
+                    best, best_index = Path(entry.path), names[entry.name]
+        level = next_level
+    return best
+
+
 def find_local_config(clone_path: Path, solver_name: str) -> Path | None:
     """Search for a configuration file in the cloned solver repository.
 
+    The repository is walked only once, skipping VCS metadata and build directories.
+    Files are preferred according to the order of DEFAULT_EXT, then the shallowest one is chosen.
+    When the repository is a git working tree, the result is cached for its current revision.
+
     Args:
         clone_path (Path): Path to the cloned repository.
         solver_name (str): Name of the solver to match configuration files.
@@ -24,11 +92,20 @@ def find_local_config(clone_path: Path, solver_name: str) -> Path | None:
         Path | None: Path to the configuration file if found, otherwise None.
     """
     logger.info(f"Searching for a local configuration file in {clone_path}...")
-    for ext in DEFAULT_EXT:
-        logger.debug(f"We try to found a configuration with the extension {ext}")
-        for file in clone_path.glob(f"**/{solver_name}{ext}"):
-            logger.success(f"Local configuration file found: {file}")
-            return file
+    clone_path = Path(clone_path)
+    revision = _git_revision(clone_path)
+    key = (str(clone_path.absolute()), solver_name, revision)
+    with _LOCAL_CONFIGS_LOCK:
+        cached = revision is not None and key in _LOCAL_CONFIGS
+        file = _LOCAL_CONFIGS.get(key)
+    if not cached or (file is not None and not file.exists()):
+        file = _walk_local_config(clone_path, solver_name)
+        if revision is not None:
+            with _LOCAL_CONFIGS_LOCK:
+                _LOCAL_CONFIGS[key] = file
+    if file is not None:
+        logger.success(f"Local configuration file found: {file}")
+        return file
     logger.info("No local configuration file found.")
     return None
 
@@ -0,0 +1,297 @@
+"""
+Compact containers for the results of solver runs.
+
+A run may report millions of bounds and solutions: instead of one dictionary per bound or
+solution, their values and times are stored in typed arrays (see :mod:`array`). The containers
+still behave as lists of dictionaries (``bounds[-1]["value"]``), the dictionaries being created
+on access, and :class:`SolveResult` behaves as the dictionary that :meth:`xcsp.solver.solver.Solver.solve`
+used to return. The plain form is only built for the JSON output (see :meth:`SolveResult.to_dict`).
+"""
+import bz2
+import gzip
+import json
+import lzma
+from array import array
+from collections import deque
+from collections.abc import Mapping, Sequence
+from hashlib import blake2b
+from pathlib import Path
+from typing import Iterator
+
+from xcsp.solver.solutions import DeltaSolutions
+
+SINK_OPENERS = {".gz": gzip.open, ".xz": lzma.open, ".lzma": lzma.open, ".bz2": bz2.open}
+
+
+class _Records(Sequence):
+    """A sequence of records stored in columns, whose items are created on access."""
+
+    __slots__ = ()
+
+    def _record(self, index: int) -> dict:
+        raise NotImplementedError
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        return self._record(range(len(self))[index])
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_list()!r})"
+
+    def to_list(self) -> list:
+        """Return the records as a list of dictionaries."""
+        return [self._record(i) for i in range(len(self))]
+
+
+class BoundTrajectory(_Records):
+    """The objective values found by a solver, with the wall-clock and CPU times at which they were found."""
+
+    __slots__ = ("_values", "_wall_clock_times", "_cpu_times")
+
+    def __init__(self):
+        self._values = array("q")
+        self._wall_clock_times = array("d")
+        self._cpu_times = array("d")
+
+    def append(self, value: int, wall_clock_time: float, cpu_time: float):
+        """
+        Add a bound at the end of the trajectory.
+
+        Args:
+            value (int): The objective value.
+            wall_clock_time (float): The wall-clock time at which it was found, in seconds.
+            cpu_time (float): The CPU time at which it was found, in seconds.
+        """
+        try:
+            self._values.append(value)
+        except OverflowError:
+            # Values which do not fit in 64 bits are kept as Python integers.
+            self._values = list(self._values)
+            self._values.append(value)
+        self._wall_clock_times.append(wall_clock_time)
+        self._cpu_times.append(cpu_time)
+
+    def column(self, name: str):
+        """
+        Return a column of the trajectory, without copying it.
+
+        Args:
+            name (str): "value", "wall_clock_time" or "cpu_time".
+
+        Returns:
+            array: The column (a list for values beyond 64 bits).
+        """
+        return {"value": self._values, "wall_clock_time": self._wall_clock_times, "cpu_time": self._cpu_times}[name]
+
+    def __len__(self):
+        return len(self._wall_clock_times)
+
+    def _record(self, index: int) -> dict:
+        return {"value": self._values[index], "wall_clock_time": self._wall_clock_times[index],
+                "cpu_time": self._cpu_times[index]}
+
+
+def open_solution_sink(path):
+    """
+    Open a file in which solutions are streamed, one JSON object per line.
+
+    Args:
+        path (str | Path): The path of the file, compressed if it ends with .gz, .xz, .lzma or .bz2.
+
+    Returns:
+        TextIO: The file, opened for writing.
+    """
+    path = Path(path)
+    return SINK_OPENERS.get(path.suffix, open)(path, "wt")
+
+
+def read_solution_sink(path) -> Iterator[dict]:
+    """
+    Read the solutions streamed in a file (see :func:`open_solution_sink`).
+
+    Args:
+        path (str | Path): The path of the file.
+
+    Returns:
+        Iterator[dict]: The solutions, with the times at which they were found.
+    """
+    path = Path(path)
+    with SINK_OPENERS.get(path.suffix, open)(path, "rt") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+class AssignmentLog(_Records):
+    """
+    The solutions found by a solver, with the wall-clock and CPU times at which they were found.
+
+    The solutions are delta encoded (see :class:`xcsp.solver.solutions.DeltaSolutions`): large successive
+    solutions which differ in a few values only cost these values. To enumerate many solutions in
+    bounded memory, the log may instead keep only the last solutions, while all of them are streamed
+    to a sink and counted. Distinct solutions are counted with a 128-bit
+    BLAKE2b digest of each of them, so that the solutions themselves are not kept.
+    """
+
+    __slots__ = ("_solutions", "_wall_clock_times", "_cpu_times", "_checks", "_sink", "_digests", "_total")
+
+    def __init__(self, keep_last: int | None = None, sink=None, count_distinct: bool = False):
+        """
+        Args:
+            keep_last (int | None): The number of solutions kept (the last ones), None to keep all of them.
+            sink (TextIO | None): A file in which all the solutions are written (see :func:`open_solution_sink`).
+            count_distinct (bool): Whether distinct solutions are counted.
+        """
+        if keep_last is None:
+            self._solutions = DeltaSolutions()
+            self._wall_clock_times = array("d")
+            self._cpu_times = array("d")
+        else:
+            self._solutions = deque(maxlen=keep_last)
+            self._wall_clock_times = deque(maxlen=keep_last)
+            self._cpu_times = deque(maxlen=keep_last)
+        self._checks = dict()
+        self._sink = sink
+        self._digests = set() if count_distinct else None
+        self._total = 0
+
+    def append(self, solution: str, wall_clock_time: float, cpu_time: float):
+        """
+        Add a solution at the end of the log.
+
+        Args:
+            solution (str): The solution, as printed by the solver.
+            wall_clock_time (float): The wall-clock time at which it was found, in seconds.
+            cpu_time (float): The CPU time at which it was found, in seconds.
+        """
+        self._total += 1
+        if self._digests is not None:
+            self._digests.add(blake2b(solution.encode(), digest_size=16).digest())
+        if self._sink is not None:
+            self._sink.write(f'{{"solution": {json.dumps(solution)}, "wall_clock_time": {wall_clock_time!r}, '
+                             f'"cpu_time": {cpu_time!r}}}\n')
+        self._solutions.append(solution)
+        self._wall_clock_times.append(wall_clock_time)
+        self._cpu_times.append(cpu_time)
+
+    @property
+    def total(self) -> int:
+        """The number of solutions added to the log, including those which are no longer kept."""
+        return self._total
+
+    @property
+    def distinct(self) -> int | None:
+        """The number of distinct solutions added to the log, or None if they are not counted."""
+        return len(self._digests) if self._digests is not None else None
+
+    def set_check_status(self, index: int, status):
+        """
+        Record the result of the check of a solution.
+
+        Args:
+            index (int): The index of the solution (negative indices count from the end).
+            status (CheckStatus): The result of the check.
+        """
+        self._checks[range(len(self))[index]] = status
+
+    def column(self, name: str):
+        """
+        Return a column of the log, without copying it.
+
+        Args:
+            name (str): "solution", "wall_clock_time" or "cpu_time".
+
+        Returns:
+            DeltaSolutions | array | deque: The column.
+        """
+        return {"solution": self._solutions, "wall_clock_time": self._wall_clock_times,
+                "cpu_time": self._cpu_times}[name]
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def _record(self, index: int, solution: str | None = None) -> dict:
+        record = {"solution": self._solutions[index] if solution is None else solution,
+                  "wall_clock_time": self._wall_clock_times[index], "cpu_time": self._cpu_times[index]}
+        if index in self._checks:
+            record["status_check"] = self._checks[index]
+        return record
+
+    def __iter__(self):
+        # The solutions are decoded one after the other, rather than each from its keyframe.
+        for index, solution in enumerate(self._solutions):
+            yield self._record(index, solution)
+
+    def to_list(self) -> list:
+        return list(self)
+
+
+class SolveResult(Mapping):
+    """The result of a solver run, which reads as the dictionary of its fields."""
+
+    __slots__ = ("_fields", "_instance_path")
+
+    def __init__(self, instance_path=None, **fields):
+        """
+        Args:
+            instance_path (str | Path | None): The path of the solved instance, from which the solutions are decoded.
+            **fields: The fields of the result.
+        """
+        self._fields = fields
+        self._instance_path = instance_path
+
+    def __getitem__(self, key):
+        return self._fields[key]
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        return f"SolveResult({self._fields!r})"
+
+    def to_dict(self) -> dict:
+        """Return the result as a plain dictionary, whose bounds and assignments are lists of dictionaries."""
+        return {key: value.to_list() if isinstance(value, _Records) else value for key, value in self._fields.items()}
+
+    def _layout(self, layout):
+        from xcsp.solver.instantiation import load_layout
+        if layout is not None:
+            return layout
+        if self._instance_path is None:
+            raise ValueError("The instance of the result is unknown, a layout of its variables is needed.")
+        return load_layout(self._instance_path)
+
+    def decode_solution(self, index: int = -1, layout=None) -> dict:
+        """
+        Decode a solution into one NumPy array per variable (requires numpy).
+
+        Args:
+            index (int): The index of the solution in the assignments (the last one by default).
+            layout (VariableLayout | None): The variables of the instance (by default, read from the solved instance
+                and cached, see :func:`xcsp.solver.instantiation.load_layout`).
+
+        Returns:
+            Dict[str, np.ndarray]: The value of each variable, with the shape of its array.
+        """
+        layout = self._layout(layout)
+        return layout.views(layout.decode(self._fields["assignments"][index]["solution"]))
+
+    def decode_solutions(self, layout=None):
+        """
+        Decode all the solutions into a matrix (requires numpy).
+
+        Args:
+            layout (VariableLayout | None): The variables of the instance (see :meth:`decode_solution`).
+
+        Returns:
+            np.ndarray: One row per solution, one column per variable (see :meth:`VariableLayout.decode`).
+        """
+        return self._layout(layout).decode_all(record["solution"] for record in self._fields["assignments"])
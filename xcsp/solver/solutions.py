@@ -0,0 +1,247 @@
+"""
+Delta encoding of the successive solutions of a solver.
+
+On large optimization problems, each solution printed by a solver (a multi-megabyte ``<instantiation>``)
+usually differs from the previous one in a few values only. The solutions are thus stored as the
+vectors of their values: a keyframe stores a whole vector, and each next solution only stores the
+positions and the values which changed since the previous one. A new keyframe is stored when the
+changes since the last one exceed a fraction of the size of the vector, so that any solution is
+rebuilt (from its keyframe) in time linear in its size.
+
+The ``<list>`` of the variables is stored once, as a template shared by the solutions. The text
+around the list and the values (the ``<instantiation>`` element, which may hold the cost of the
+solution, and the whitespace) and the separators of the values, when they are not single spaces,
+are stored once per distinct value, as a frame. The solutions whose values are not written in
+canonical form (e.g. ``007``, or ``v*3``), or which are too small to be worth it, are stored as they are.
+"""
+import re
+from array import array
+from collections.abc import Sequence
+
+RAW = 0
+KEYFRAME = 1
+DELTA = 2
+
+# Value standing for "*" (an undefined value) in the vectors.
+UNDEFINED = -2 ** 63
+
+_LIST = re.compile(r"<list>(.*?)</list>", re.DOTALL)
+_VALUES = re.compile(r"<values>(.*?)</values>", re.DOTALL)
+# Values which are rebuilt exactly from their integers: no sign, leading zero or compact form.
+_CANONICAL = re.compile(r"(?:-?[1-9][0-9]*|0|\*)(?:\s+(?:-?[1-9][0-9]*|0|\*))*", re.ASCII)
+_SEPARATOR = re.compile(r"\s+")
+
+_CHUNK = 1024
+
+
+def _separators(text: str, tokens) -> str:
+    """Return the separators of the values of a text, joined by commas unless they are all the same."""
+    if len(tokens) <= 1 or (text.count(" ") == len(tokens) - 1
+                            and len(text) == sum(map(len, tokens)) + len(tokens) - 1):
+        return " "
+    separators = _SEPARATOR.findall(text)
+    return separators[0] if separators.count(separators[0]) == len(separators) else ",".join(separators)
+
+
+def _parse(solution: str):
+    variables, values = _LIST.search(solution), _VALUES.search(solution)
+    if variables is None or values is None or variables.end() > values.start():
+        return None
+    text = values.group(1)
+    stripped = text.strip()
+    if stripped and _CANONICAL.fullmatch(stripped) is None:
+        return None
+    tokens = stripped.split()
+    try:
+        vector = array("q", map(int, tokens)) if "*" not in stripped else array(
+            "q", (UNDEFINED if token == "*" else int(token) for token in tokens))
+    except OverflowError:
+        return None
+    leading = len(text) - len(text.lstrip())
+    values_start, values_end = values.start(1) + leading, values.start(1) + leading + len(stripped)
+    frame = (solution[:variables.start(1)], solution[variables.end(1):values_start], solution[values_end:],
+             _separators(stripped, tokens))
+    return variables.group(1), frame, vector
+
+
+def _format(variables: str, frame, values) -> str:
+    head, middle, tail, separators = frame
+    tokens = ("*" if v == UNDEFINED else str(v) for v in values) if UNDEFINED in values else map(str, values)
+    if "," not in separators:
+        text = separators.join(tokens)
+    else:
+        text = "".join(token + separator for token, separator in zip(tokens, separators.split(",") + [""]))
+    return f"{head}{variables}{middle}{text}{tail}"
+
+
+def _differences(previous, current) -> array:
+    """Return the positions at which two vectors of the same size differ."""
+    positions = array("q")
+    for start in range(0, len(current), _CHUNK):
+        # Chunks are compared at once, only the chunks which differ are compared value by value.
+        end = min(start + _CHUNK, len(current))
+        if previous[start:end] != current[start:end]:
+            positions.extend(i for i in range(start, end) if previous[i] != current[i])
+    return positions
+
+
+def _vector(data, start: int, length: int) -> array:
+    values = array("q")
+    values.frombytes(memoryview(data[start:start + length]).cast("B"))
+    return values
+
+
+class DeltaSolutions(Sequence):
+    """
+    A sequence of solutions, stored as keyframes and deltas in flat arrays.
+
+    For each solution, :attr:`kinds` tells how it is stored (:data:`RAW`, :data:`KEYFRAME` or :data:`DELTA`),
+    :attr:`template_ids` and :attr:`frame_ids` give its template and its frame, and :attr:`starts` and :attr:`lengths` locate it: in
+    :attr:`raw` for a raw solution, in :attr:`data` for the values of a keyframe, or for the changed
+    positions (followed by the new values) of a delta. :attr:`keyframes` gives the keyframe of each solution.
+    """
+
+    def __init__(self, min_length: int = 1024, max_delta_ratio: float = 2.0):
+        """
+        Args:
+            min_length (int): The length from which solutions are delta encoded (shorter ones are stored as they are).
+            max_delta_ratio (float): The number of changes since the last keyframe above which a new keyframe is
+                stored, relative to the number of values.
+        """
+        self.min_length = min_length
+        self.max_delta_ratio = max_delta_ratio
+        self.kinds = array("b")
+        self.template_ids = array("q")
+        self.frame_ids = array("q")
+        self.starts = array("q")
+        self.lengths = array("q")
+        self.keyframes = array("q")
+        self.data = array("q")
+        self.templates = []
+        self.frames = []
+        self.raw = []
+        self._template_index = dict()
+        self._frame_index = dict()
+        self._previous = None
+        self._changes = 0
+
+    @staticmethod
+    def from_columns(kinds, template_ids, frame_ids, starts, lengths, keyframes, data, templates, frames,
+                     raw) -> "DeltaSolutions":
+        """
+        Create a (read-only) sequence of solutions from its columns (see :class:`DeltaSolutions`).
+
+        The columns may be arrays, or NumPy arrays (e.g. loaded from a store).
+
+        Returns:
+            DeltaSolutions: The solutions.
+        """
+        solutions = DeltaSolutions()
+        solutions.kinds, solutions.template_ids, solutions.frame_ids = kinds, template_ids, frame_ids
+        solutions.starts, solutions.lengths, solutions.keyframes = starts, lengths, keyframes
+        solutions.data, solutions.templates, solutions.frames, solutions.raw = data, templates, frames, raw
+        return solutions
+
+    def restart(self):
+        """Store the next solution as a keyframe (e.g. when it comes from another run)."""
+        self._previous = None
+
+    def _add(self, kind: int, template: int, frame: int, start: int, length: int, keyframe: int):
+        self.kinds.append(kind)
+        self.template_ids.append(template)
+        self.frame_ids.append(frame)
+        self.starts.append(start)
+        self.lengths.append(length)
+        self.keyframes.append(keyframe)
+
+    def append(self, solution: str):
+        """
+        Add a solution at the end of the sequence.
+
+        Args:
+            solution (str): The solution, as printed by the solver.
+        """
+        index = len(self.kinds)
+        parsed = _parse(solution) if len(solution) >= self.min_length else None
+        if parsed is None:
+            self._add(RAW, -1, -1, len(self.raw), len(solution), index)
+            self.raw.append(solution)
+            self._previous = None
+            return
+        variables, frame, values = parsed
+        template = self._template_index.get(variables)
+        if template is None:
+            template = self._template_index[variables] = len(self.templates)
+            self.templates.append(variables)
+        frame_id = self._frame_index.get(frame)
+        if frame_id is None:
+            frame_id = self._frame_index[frame] = len(self.frames)
+            self.frames.append(frame)
+        previous = self._previous
+        self._previous = (template, values)
+        if previous is not None and previous[0] == template and len(previous[1]) == len(values):
+            positions = _differences(previous[1], values)
+            if self._changes + len(positions) <= self.max_delta_ratio * len(values):
+                self._changes += len(positions)
+                self._add(DELTA, template, frame_id, len(self.data), len(positions), self.keyframes[-1])
+                self.data.extend(positions)
+                self.data.extend(values[p] for p in positions)
+                return
+        self._changes = 0
+        self._add(KEYFRAME, template, frame_id, len(self.data), len(values), index)
+        self.data.extend(values)
+
+    def _apply(self, values: array, index: int):
+        start, length = int(self.starts[index]), int(self.lengths[index])
+        for position, value in zip(self.data[start:start + length], self.data[start + length:start + 2 * length]):
+            values[int(position)] = int(value)
+
+    def _text(self, index: int, values) -> str:
+        return _format(self.templates[int(self.template_ids[index])], self.frames[int(self.frame_ids[index])], values)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def _values(self, index: int) -> array:
+        keyframe = int(self.keyframes[index])
+        values = _vector(self.data, int(self.starts[keyframe]), int(self.lengths[keyframe]))
+        for i in range(keyframe + 1, index + 1):
+            self._apply(values, i)
+        return values
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            return list(self.decode(start, stop)) if step == 1 else [self[i] for i in range(start, stop, step)]
+        index = range(len(self))[index]
+        if self.kinds[index] == RAW:
+            return self.raw[int(self.starts[index])]
+        return self._text(index, self._values(index))
+
+    def __iter__(self):
+        return self.decode(0, len(self))
+
+    def decode(self, start: int, stop: int):
+        """
+        Rebuild the solutions of a range, applying the deltas one after the other.
+
+        Args:
+            start (int): The index of the first solution.
+            stop (int): The index after the last solution.
+
+        Returns:
+            Iterator[str]: The solutions.
+        """
+        values = None
+        for index in range(start, stop):
+            kind = self.kinds[index]
+            if kind == RAW:
+                values = None
+                yield self.raw[int(self.starts[index])]
+                continue
+            if kind == DELTA and values is not None:
+                # The previous solution is the one this delta applies to.
+                self._apply(values, index)
+            else:
+                values = self._values(index)
+            yield self._text(index, values)
@@ -22,10 +22,13 @@ from typing import Dict
 import psutil
 from loguru import logger
 
-from xcsp.solver.cache import CACHE
+from xcsp.solver.registry import REGISTRY, SolverEntry
+from xcsp.solver.results import AssignmentLog, BoundTrajectory, SolveResult, open_solution_sink
+from xcsp.utils import metrics
 from xcsp.utils.json import CustomEncoder
+from xcsp.utils.profile import step
 import xcsp.utils.paths as paths
-from xcsp.utils.system import kill_process, term_process
+from xcsp.utils.system import kill_process, term_process, wait_cpu_time
 
 ANSWER_PREFIX = "s" + chr(32)
 OBJECTIVE_PREFIX = "o" + chr(32)
@@ -86,6 +89,9 @@ class Solver:
         self._time_limit = None
         self._print_intermediate_assignment = False
         self._json_output = False
+        self._solution_sink = None
+        self._keep_last_solutions = None
+        self._count_distinct = False
 
     @property
     def name(self):
@@ -167,6 +173,34 @@ class Solver:
             self._print_intermediate_assignment = activate
             self._args["print_intermediate_assignment"] = self._options["print_intermediate_assignment"]
 
+    def set_solution_sink(self, path):
+        """
+        Stream all the solutions found by the solver to a file, as JSON lines.
+
+        Args:
+            path (str | Path | None): The path of the file (compressed if it ends with .gz, .xz or .bz2),
+                or None to disable the sink.
+        """
+        self._solution_sink = path
+
+    def set_keep_last_solutions(self, number: int | None):
+        """
+        Keep only the last solutions found by the solver in the result, so that its memory is bounded.
+
+        Args:
+            number (int | None): The number of solutions kept, or None to keep all of them.
+        """
+        self._keep_last_solutions = number if number is None or number >= 0 else None
+
+    def set_count_distinct(self, activate: bool):
+        """
+        Enable or disable counting the distinct solutions found by the solver (with a 128-bit hash of each of them).
+
+        Args:
+            activate (bool): True to count distinct solutions.
+        """
+        self._count_distinct = bool(activate)
+
     def add_complementary_options(self, options):
         """
         Manually set additional command-line options for the solver.
@@ -231,6 +265,136 @@ class Solver:
         """
         self._is_timeout = is_timeout
 
+    def _read_output(self, process, keep_solver_output, wall_start, cpu_start, sink=None):
+        """
+        Parse the standard output of the solver until it ends.
+
+        Returns:
+            tuple: The status announced by the solver, its bounds and its assignments.
+        """
+        bounds = BoundTrajectory()
+        assignments = AssignmentLog(self._keep_last_solutions, sink, self._count_distinct)
+        status = ResultStatusEnum.UNKNOWN
+        for line in process.stdout:
+            line = line.rstrip()
+
+            current_wall = time.time()
+            current_cpu = psutil.cpu_times()
+            wall_clock_time = current_wall - wall_start
+            cpu_time = (current_cpu.user - cpu_start.user) + (current_cpu.system - cpu_start.system)
+
+            if line.startswith(ANSWER_PREFIX):
+                tokens = line.split()
+                if len(tokens) > 1:
+                    status = ResultStatusEnum[tokens[1].replace(" ", "_")]
+
+            elif line.startswith(OBJECTIVE_PREFIX):
+                tokens = line.split()
+                if len(tokens) > 1:
+                    try:
+                        value = int(tokens[1])
+                        bounds.append(value, wall_clock_time, cpu_time)
+                        status = ResultStatusEnum.SATISFIABLE
+                        if not self._json_output:
+                            print(f"o {value}")
+                    except ValueError:
+                        pass
+
+            elif line.startswith(SOLUTION_PREFIX):
+                assign = line[2:].strip()
+                assignments.append(assign, wall_clock_time, cpu_time)
+                if self._print_intermediate_assignment and not self._json_output:
+                    print(f"v {assign}", file=sys.stdout)
+
+            if keep_solver_output:
+                if self._prefix:
+                    print(f"{self._prefix} {line}", file=self._stdout)
+                else:
+                    print(line, file=self._stdout)
+        return status, bounds, assignments
+
+    def _check_solution(self, instance_path, keep_solver_output):
+        """Check the last solution found by the solver with the solution checker, if available."""
+        solution_check_status = CheckStatus.NO_CHECK
+        logger.info("Checking solution....")
+        solution_checker_jar = None 
+        all_paths = paths.get_system_tools_dir()
+        all_paths.extend([paths.get_user_tools_dir()])
+        for st in all_paths:
+            logger.debug("Searching for solution checker in: " + str(st))
+            if not st.exists():
+                logger.debug("No solution checker found")
+                continue
+            p = st / "xcsp3-solutionChecker-2.5.jar"
+            if not p.exists():
+                logger.debug(f"Solution checker jar not found at {p}")
+                continue
+            solution_checker_jar=p
+
+        if solution_checker_jar is not None:
+            last_solution = self._solutions["assignments"][-1]["solution"]
+            cmd_line = [shutil.which("java"), "-jar", solution_checker_jar, instance_path]
+            logger.info(cmd_line)
+            process_check = psutil.Popen(
+                cmd_line,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.PIPE,
+                text=True,
+            )
+            wall_start_check = time.time()
+            cpu_start_check = psutil.cpu_times()
+
+            try:
+                stdout, stderr = process_check.communicate(input=last_solution)
+                if keep_solver_output:
+                    for line in stdout.splitlines():
+                        line = line.strip()
+                        if self._prefix:
+                            print(f"{self._prefix} {line}", file=self._stdout)
+                        else:
+                            print(line, file=self._stdout)
+                    for line in stderr.splitlines():
+                        line = line.strip()
+                        print(line, file=self._stderr)
+                process_check.wait()
+            except Exception as e:
+                logger.exception("An error occurred during solver execution")
+                process_check.kill()
+                raise e
+            wall_end_check = time.time()
+            cpu_end_check = psutil.cpu_times()
+
+            final_wall_clock_time_check = wall_end_check - wall_start_check
+            final_cpu_time_check = (cpu_end_check.user - cpu_start_check.user) + (
+                        cpu_end_check.system - cpu_start_check.system)
+
+            if process_check.returncode != 0:
+                solution_check_status = CheckStatus.INVALID
+            elif process_check.returncode == 0:
+                solution_check_status = CheckStatus.VALID
+
+            self._solutions["assignments"].set_check_status(-1, solution_check_status)
+
+            logger.info(
+                f"Solution checked completed. Wall-clock time: {final_wall_clock_time_check:.2f}s | CPU time: {final_cpu_time_check:.2f}s")
+        else:
+            logger.error('Impossible to find the jar of the solution checker.')
+
+    def _forward_stderr(self, stream):
+        """
+        Print the standard error of the solver as it is written.
+
+        The standard error used to be read once the standard output was closed: a solver writing more
+        than the capacity of a pipe (64 KiB on Linux) on its standard error then blocked forever, and so
+        did the launcher. It is thus read by a thread, or discarded when the output of the solver is not kept.
+
+        Args:
+            stream: The standard error of the solver.
+        """
+        for line in stream:
+            print(line.rstrip(), file=self._stderr)
+
     def solve(self, instance_path, keep_solver_output=False, check=False, delay=5):
         """
         Launch and monitor the solver on the given instance.
@@ -243,8 +407,19 @@ class Solver:
             keep_solver_output (bool): If True, solver stdout is printed live.
             check (bool): If True, checks the final solution using a solution checker.
         Returns:
-            dict: A dictionary summarizing the solver run including solutions, bounds, times.
+            SolveResult: A mapping summarizing the solver run including solutions, bounds, times
+                (see :meth:`SolveResult.to_dict` for its plain dictionary form).
         """
+        key = f"{self._name}@{self._version}"
+        metrics.RUNS_STARTED.inc(solver=key)
+        try:
+            with step("solve", "solve", solver=key, instance=str(instance_path)):
+                return self._solve(key, instance_path, keep_solver_output, check, delay)
+        except Exception:
+            metrics.RUNS_FAILED.inc(solver=key, reason="exception")
+            raise
+
+    def _solve(self, key, instance_path, keep_solver_output, check, delay):
         command = list(self._command_line)
         for index, elt in enumerate(command):
             if elt == '{{instance}}':
@@ -255,12 +430,21 @@ class Solver:
 
         logger.debug("Each elt of command line : " + ' '.join([f"'{elt}'" for elt in command]))
 
-        process = psutil.Popen(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
+        spawn_start = time.perf_counter()
+        with step("spawn", "phase"):
+            process = psutil.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE if keep_solver_output else subprocess.DEVNULL,
+                text=True,
+            )
+        metrics.SPAWN_LATENCY.observe(time.perf_counter() - spawn_start)
+        metrics.ACTIVE_PROCESSES.inc()
+        # The standard error is read concurrently, so that a solver filling it cannot block.
+        stderr_reader = None
+        if keep_solver_output:
+            stderr_reader = threading.Thread(target=self._forward_stderr, args=(process.stderr,), daemon=True)
+            stderr_reader.start()
 
         delay_trigger = None
         if self._time_limit is not None:
@@ -276,55 +460,18 @@ class Solver:
 
         wall_start = time.time()
         cpu_start = psutil.cpu_times()
-
-        bounds = []
-        assignments = []
-        status = ResultStatusEnum.UNKNOWN
+        sink = None
+        solver_cpu_time = None
 
         try:
-            for line in process.stdout:
-                line = line.rstrip()
-
-                current_wall = time.time()
-                current_cpu = psutil.cpu_times()
-                wall_clock_time = current_wall - wall_start
-                cpu_time = (current_cpu.user - cpu_start.user) + (current_cpu.system - cpu_start.system)
-
-                if line.startswith(ANSWER_PREFIX):
-                    tokens = line.split()
-                    if len(tokens) > 1:
-                        status = ResultStatusEnum[tokens[1].replace(" ", "_")]
-
-                elif line.startswith(OBJECTIVE_PREFIX):
-                    tokens = line.split()
-                    if len(tokens) > 1:
-                        try:
-                            value = int(tokens[1])
-                            bounds.append({"value": value, "wall_clock_time": wall_clock_time, "cpu_time": cpu_time})
-                            status = ResultStatusEnum.SATISFIABLE
-                            if not self._json_output:
-                                print(f"o {value}")
-                        except ValueError:
-                            pass
-
-                elif line.startswith(SOLUTION_PREFIX):
-                    assign = line[2:].strip()
-                    assignments.append({"solution": assign, "wall_clock_time": wall_clock_time, "cpu_time": cpu_time})
-                    if self._print_intermediate_assignment and not self._json_output:
-                        print(f"v {assign}", file=sys.stdout)
-
-                if keep_solver_output:
-                    if self._prefix:
-                        print(f"{self._prefix} {line}", file=self._stdout)
-                    else:
-                        print(line, file=self._stdout)
-
-            if keep_solver_output:
-                for line in process.stderr:
-                    line = line.rstrip()
-                    print(line, file=self._stderr)
-
-            process.wait()
+            if self._solution_sink is not None:
+                sink = open_solution_sink(self._solution_sink)
+            with step("stdout loop", "phase"):
+                status, bounds, assignments = self._read_output(process, keep_solver_output, wall_start, cpu_start,
+                                                                sink)
+                solver_cpu_time = wait_cpu_time(process)
+                if stderr_reader is not None:
+                    stderr_reader.join()
 
             if timeout_trigger is not None:
                 timeout_trigger.cancel()
@@ -335,6 +482,10 @@ class Solver:
             logger.exception("An error occurred during solver execution")
             process.kill()
             raise e
+        finally:
+            metrics.ACTIVE_PROCESSES.dec()
+            if sink is not None:
+                sink.close()
 
         wall_end = time.time()
         cpu_end = psutil.cpu_times()
@@ -342,84 +493,31 @@ class Solver:
         final_wall_clock_time = wall_end - wall_start
         final_cpu_time = (cpu_end.user - cpu_start.user) + (cpu_end.system - cpu_start.system)
 
-        self._solutions = {
-            "status": status,
-            "bounds": bounds,
-            "assignments": assignments,
-            "wall_clock_time": final_wall_clock_time,
-            "cpu_time": final_cpu_time
-        }
-        solution_check_status = CheckStatus.NO_CHECK
+        self._solutions = SolveResult(
+            instance_path,
+            solver=self._name,
+            version=self._version,
+            instance=Path(instance_path).name,
+            time_limit=self._time_limit,
+            status=status,
+            bounds=bounds,
+            assignments=assignments,
+            nb_solutions=assignments.total,
+            nb_distinct_solutions=assignments.distinct,
+            wall_clock_time=final_wall_clock_time,
+            cpu_time=final_cpu_time,
+            exit_code=process.returncode,
+            timeout=self._is_timeout,
+        )
         if check and self._solutions is not None and len(self._solutions["assignments"]) > 0:
-            logger.info("Checking solution....")
-            solution_checker_jar = None 
-            all_paths = paths.get_system_tools_dir()
-            all_paths.extend([paths.get_user_tools_dir()])
-            for st in all_paths:
-                logger.debug("Searching for solution checker in: " + str(st))
-                if not st.exists():
-                    logger.debug("No solution checker found")
-                    continue
-                p = st / "xcsp3-solutionChecker-2.5.jar"
-                if not p.exists():
-                    logger.debug(f"Solution checker jar not found at {p}")
-                    continue
-                solution_checker_jar=p
-
-            if solution_checker_jar is not None:
-                last_solution = self._solutions["assignments"][-1]["solution"]
-                cmd_line = [shutil.which("java"), "-jar", solution_checker_jar, instance_path]
-                logger.info(cmd_line)
-                process_check = psutil.Popen(
-                    cmd_line,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    stdin=subprocess.PIPE,
-                    text=True,
-                )
-                wall_start_check = time.time()
-                cpu_start_check = psutil.cpu_times()
-
-                try:
-                    stdout, stderr = process_check.communicate(input=last_solution)
-                    if keep_solver_output:
-                        for line in stdout.splitlines():
-                            line = line.strip()
-                            if self._prefix:
-                                print(f"{self._prefix} {line}", file=self._stdout)
-                            else:
-                                print(line, file=self._stdout)
-                        for line in stderr.splitlines():
-                            line = line.strip()
-                            print(line, file=self._stderr)
-                    process_check.wait()
-                except Exception as e:
-                    logger.exception("An error occurred during solver execution")
-                    process_check.kill()
-                    raise e
-                wall_end_check = time.time()
-                cpu_end_check = psutil.cpu_times()
-
-                final_wall_clock_time_check = wall_end_check - wall_start_check
-                final_cpu_time_check = (cpu_end_check.user - cpu_start_check.user) + (
-                            cpu_end_check.system - cpu_start_check.system)
-
-                if process_check.returncode != 0:
-                    solution_check_status = CheckStatus.INVALID
-                elif process_check.returncode == 0:
-                    solution_check_status = CheckStatus.VALID
-
-                self._solutions["assignments"][-1]["status_check"] = solution_check_status
-
-                logger.info(
-                    f"Solution checked completed. Wall-clock time: {final_wall_clock_time_check:.2f}s | CPU time: {final_cpu_time_check:.2f}s")
-            else:
-                logger.error('Impossible to find the jar of the solution checker.')
+            with step("check", "phase"):
+                self._check_solution(instance_path, keep_solver_output)
 
-        if self._json_output:
-            print(json.dumps(self._solutions, indent=2, cls=CustomEncoder))
-        else:
-            print(f"s {status.value}")
+        with step("serialize", "phase"):
+            if self._json_output:
+                print(json.dumps(self._solutions.to_dict(), indent=2, cls=CustomEncoder))
+            else:
+                print(f"s {status.value}")
         if process.returncode != 0 and not self._is_timeout:
             logger.error(f"An error occurred during solver execution. Solver exit with code {process.returncode}")
             status = ResultStatusEnum.ERROR
@@ -429,6 +527,17 @@ class Solver:
             logger.info(
                 f"Resolution completed successfully. Wall-clock time: {final_wall_clock_time:.2f}s | CPU time: {final_cpu_time:.2f}s")
 
+        metrics.RUNS_FINISHED.inc(solver=key, status=status.name)
+        if solver_cpu_time is not None:
+            # The CPU time of the solver process itself, not that of the whole machine during the run.
+            metrics.SOLVER_CPU_SECONDS.inc(solver_cpu_time, solver=key)
+        if status == ResultStatusEnum.ERROR:
+            metrics.RUNS_FAILED.inc(solver=key, reason="exit_code")
+        elif status == ResultStatusEnum.TIMEOUT:
+            metrics.TIMEOUTS.inc(solver=key)
+        elif status == ResultStatusEnum.MEMOUT:
+            metrics.MEMOUTS.inc(solver=key)
+
         self._print_final_summary(status, bounds, assignments, final_wall_clock_time, final_cpu_time)
         return self._solutions
 
@@ -452,17 +561,13 @@ class Solver:
             split = name.split('@')
             name_solver = split[0]
             version_solver = split[1]
-        solvers = Solver.available_solvers()
-        alias_solvers = dict()
-        for k, v in solvers.items():
-            for a in v.alias:
-                alias_solvers[f"{v.name.upper()}@{a}"] = v
-        key = f"{name_solver.upper()}@{version_solver}"
-        if key not in solvers and key not in alias_solvers:
+        with step("lookup", "phase"):
+            entry = REGISTRY.get(name_solver, version_solver)
+        if entry is None:
             raise ValueError(
                 f"Impossible to found an installed solver with the name {name_solver} and the version {version_solver}")
 
-        return solvers.get(key, alias_solvers.get(key))
+        return Solver.from_entry(entry)
 
     @staticmethod
     def available_solvers() -> Dict[str, 'Solver']:
@@ -472,13 +577,20 @@ class Solver:
         Returns:
             dict: Mapping of name@version to Solver instances.
         """
-        solvers = dict()
-        for k, s in CACHE.items():
-            for vv in s["versions"].keys():
-                solvers[f"{s['name_solver'].upper()}@{vv}"] = (
-                    Solver(s["name_solver"], s["id_solver"], vv, s["versions"][vv]['cmd'],
-                           s["versions"][vv]['options'], s["versions"][vv].get('alias')))
-        return solvers
+        return {entry.key: Solver.from_entry(entry) for entry in REGISTRY.entries()}
+
+    @staticmethod
+    def from_entry(entry: SolverEntry) -> 'Solver':
+        """
+        Create a Solver instance from an entry of the solver registry.
+
+        Args:
+            entry (SolverEntry): The registry entry describing an installed solver version.
+
+        Returns:
+            Solver: A new solver instance for this entry.
+        """
+        return Solver(entry.name, entry.id, entry.version, entry.cmd, entry.options, entry.alias)
 
     @staticmethod
     def create_from_cli(args):
@@ -512,6 +624,9 @@ class Solver:
         s.set_json_output(args.get("json_output"))
         s.all_solutions(args.get("all_solutions"))
         s.add_complementary_options(args.get('solver_options', list()))
+        s.set_solution_sink(args.get("solutions_file"))
+        s.set_keep_last_solutions(args.get("keep_last"))
+        s.set_count_distinct(args.get("count_distinct"))
         return s
 
     def _print_final_summary(self, status, bounds, assignments, final_wall_clock_time, final_cpu_time):
@@ -520,12 +635,12 @@ class Solver:
 
         Args:
             status (ResultStatusEnum): Final solver status.
-            bounds (list): List of objective values encountered.
-            assignments (list): List of intermediate or final solutions.
+            bounds (BoundTrajectory): Objective values encountered.
+            assignments (AssignmentLog): Intermediate or final solutions.
             final_wall_clock_time (float): Total wall-clock time in seconds.
             final_cpu_time (float): Total CPU time in seconds.
         """
-        nb_solutions = max(len(assignments), len(bounds))
+        nb_solutions = max(assignments.total, len(bounds))
         nb_bounds = len(bounds)
         best_objective = None
         if nb_bounds > 0:
@@ -554,6 +669,8 @@ class Solver:
             f"{nb_solutions} solutions" if nb_solutions > 0 else "No solutions",
         ]
 
+        if assignments.distinct is not None:
+            summary_parts.append(f"{assignments.distinct} distinct")
         if best_objective is not None:
             summary_parts.append(f"Best objective: {best_objective}")
 
@@ -0,0 +1,213 @@
+"""Simulated XCSP3 solver, for load and stress testing XCSP Launcher.
+
+The simulator ignores the instance it is given and prints solutions following the XCSP3
+output format ('c', 'o', 'v' and 's' lines), while its behaviour can be tuned: rate of the
+solutions, size of the assignments, volume of the standard error, child processes, reaction
+to SIGTERM and memory growth.
+
+The behaviour is read from a JSON file (given with ``--config`` or in the environment variable
+``XCSP_SIMULATOR_CONFIG``), whose keys are those of :data:`DEFAULTS`; command line options take
+precedence over it. Only the standard library is used, so that this file can be installed and
+run as any solver (see ``simulator.xsc.yaml``).
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+
+DEFAULTS = {
+    # "cop" (solutions improve an objective) or "csp" (solutions only).
+    "problem": "cop",
+    # Number of solutions found before the search completes.
+    "solutions": 10,
+    # Solutions found per second (0 for as fast as possible).
+    "rate": 0.0,
+    # Objective value of the first solution (each next solution decreases it by one).
+    "first_objective": 1000,
+    # Number of variables in each assignment ('v' line), 0 for no assignment.
+    "assignment_size": 10,
+    # Whether the assignment of each solution is printed, or only the one of the last solution.
+    "intermediate": False,
+    # Whether all solutions of a "csp" are enumerated (otherwise, the search stops at the first one).
+    "all_solutions": False,
+    # Number of lines written on the standard error with each solution.
+    "stderr_lines": 0,
+    # Number of child processes, which share the outputs of the simulator and live as long as it does.
+    "children": 0,
+    # Reaction to SIGTERM: "exit" (print the status and exit), "ignore" or "die" (default action).
+    "on_sigterm": "exit",
+    # MiB of memory allocated (and kept) with each solution.
+    "memory_growth": 0,
+    # Whether the simulator keeps running after its last solution, until it is interrupted.
+    "hang": False,
+    # Final status when the search completes (derived from the problem and the solutions by default).
+    "status": None,
+    # Exit code of the simulator.
+    "exit_code": 0,
+    # Seed of the values of the assignments.
+    "seed": 0,
+    # Time limit in seconds, after which the simulator stops as if it received SIGTERM.
+    "time": None,
+}
+
+_interrupted = False
+
+
+def _on_sigterm(signum, frame):
+    global _interrupted
+    _interrupted = True
+
+
+def load_config(argv=None) -> dict:
+    """
+    Build the configuration of the simulator.
+
+    Args:
+        argv: The command line arguments (defaults to ``sys.argv[1:]``).
+
+    Returns:
+        dict: The configuration, with the keys of :data:`DEFAULTS` and the path of the instance.
+    """
+    parser = argparse.ArgumentParser(description="Simulated XCSP3 solver.")
+    parser.add_argument("instance", help="Path of the instance (ignored).")
+    parser.add_argument("--config", help="JSON file describing the behaviour of the simulator.",
+                        default=os.environ.get("XCSP_SIMULATOR_CONFIG"))
+    parser.add_argument("--problem", choices=["cop", "csp"])
+    parser.add_argument("--solutions", type=int)
+    parser.add_argument("--number-of-solutions", type=int, dest="limit",
+                        help="Stop after the given number of solutions.")
+    parser.add_argument("--rate", type=float)
+    parser.add_argument("--first-objective", type=int)
+    parser.add_argument("--assignment-size", type=int)
+    parser.add_argument("--intermediate", action="store_const", const=True)
+    parser.add_argument("--all-solutions", action="store_const", const=True)
+    parser.add_argument("--stderr-lines", type=int)
+    parser.add_argument("--children", type=int)
+    parser.add_argument("--on-sigterm", choices=["exit", "ignore", "die"])
+    parser.add_argument("--memory-growth", type=int)
+    parser.add_argument("--hang", action="store_const", const=True)
+    parser.add_argument("--status")
+    parser.add_argument("--exit-code", type=int)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--time", type=float)
+    args = vars(parser.parse_args(argv))
+
+    config = dict(DEFAULTS)
+    if args["config"]:
+        with open(args["config"]) as f:
+            config.update(json.load(f))
+    unknown = set(config) - set(DEFAULTS)
+    if unknown:
+        parser.error(f"unknown configuration keys: {', '.join(sorted(unknown))}")
+    config.update({k: v for k, v in args.items() if k in DEFAULTS and v is not None})
+    if args["limit"] is not None and args["limit"] > 0:
+        config["solutions"] = min(config["solutions"], args["limit"])
+    config["instance"] = args["instance"]
+    return config
+
+
+def _spawn_children(count: int) -> list:
+    # The children inherit the standard outputs, as the workers of a parallel solver would.
+    return [subprocess.Popen([sys.executable, "-c", "import time\nwhile True: time.sleep(60)"])
+            for _ in range(count)]
+
+
+def _sleep_until(deadline: float, time_limit: float | None):
+    """Sleep until the deadline, the time limit or an interruption."""
+    while not _interrupted:
+        now = time.monotonic()
+        if time_limit is not None and now >= time_limit:
+            return
+        remaining = deadline - now
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, 0.05))
+
+
+def run(config: dict) -> int:
+    """
+    Run the simulator.
+
+    Args:
+        config (dict): The configuration of the simulator (see :func:`load_config`).
+
+    Returns:
+        int: The exit code of the simulator.
+    """
+    global _interrupted
+    _interrupted = False
+    if config["on_sigterm"] == "exit":
+        signal.signal(signal.SIGTERM, _on_sigterm)
+    elif config["on_sigterm"] == "ignore":
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    start = time.monotonic()
+    time_limit = start + config["time"] if config["time"] is not None else None
+    rng = random.Random(config["seed"])
+    out = sys.stdout
+    cop = config["problem"] == "cop"
+    nb_solutions = config["solutions"] if cop or config["all_solutions"] else min(1, config["solutions"])
+    period = 1 / config["rate"] if config["rate"] > 0 else 0
+    ballast = []
+    noise = "c " + "simulated noise " * 4 + "\n"
+    # Assignments are drawn from a small pool, so that printing them costs (almost) nothing.
+    pool = [" ".join(str(rng.randrange(100)) for _ in range(config["assignment_size"])) for _ in range(16)]
+    children = _spawn_children(config["children"])
+
+    out.write(f"c simulator of XCSP3 solver, instance {config['instance']}\n")
+    out.flush()
+    found = 0
+    assignment = None
+    try:
+        while found < nb_solutions and not _interrupted:
+            if period:
+                _sleep_until(start + (found + 1) * period, time_limit)
+            if _interrupted or (time_limit is not None and time.monotonic() >= time_limit):
+                break
+            found += 1
+            if config["memory_growth"] > 0:
+                ballast.append(bytearray(b"\x01") * (config["memory_growth"] * 1024 * 1024))
+            if config["stderr_lines"] > 0:
+                sys.stderr.write(noise * config["stderr_lines"])
+            if config["assignment_size"] > 0:
+                values = pool[found % len(pool)]
+                assignment = f"v <instantiation> <list> x[] </list> <values> {values} </values> </instantiation>\n"
+            if cop:
+                out.write(f"o {config['first_objective'] - found + 1}\n")
+            if assignment is not None and (config["intermediate"] or not cop):
+                out.write(assignment)
+            out.flush()
+
+        completed = found == nb_solutions and not _interrupted
+        if completed and config["hang"]:
+            _sleep_until(float("inf"), time_limit)
+            completed = False
+
+        if completed and config["status"] is not None:
+            status = config["status"]
+        elif found == 0:
+            status = "UNSATISFIABLE" if completed else "UNKNOWN"
+        else:
+            status = "OPTIMUM FOUND" if completed and cop else "SATISFIABLE"
+        out.write(f"s {status}\n")
+        if cop and assignment is not None and not config["intermediate"]:
+            out.write(assignment)
+        out.write(f"c {found} solutions in {time.monotonic() - start:.3f} seconds\n")
+        out.flush()
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+    return config["exit_code"]
+
+
+def main(argv=None):
+    sys.exit(run(load_config(argv)))
+
+
+if __name__ == "__main__":
+    main()
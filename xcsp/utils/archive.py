@@ -1,52 +1,348 @@
+"""Archive utilities for XCSP Launcher.
+
+Archives are extracted in a single pass, directly into their destination: when all the
+members share a single top-level directory, this directory is stripped on the fly.
+Tar archives can also be extracted while they are being downloaded.
+"""
+import copy
+import lzma
+import os
+import queue
+import shutil
 import tarfile
+import threading
 import zipfile
 from pathlib import Path
-import tempfile
-import lzma
-import shutil
 
+from loguru import logger
+
+from xcsp.utils.http import DOWNLOADS
+from xcsp.utils.storage import remove_entry
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TAR_EXTENSIONS = [".tar.gz", ".tgz", ".tar.xz", ".tar.bz2", ".tar.zst", ".tar"]
 
 ALL_ARCHIVE_EXTENSIONS = [
-    ".tar.gz", ".tar.xz", ".tar.bz2", ".zip", ".tar"
+    ".tar.gz", ".tar.xz", ".tar.bz2", ".tar.zst", ".zip", ".tar"
 ]
 
 
+def is_tar_archive(path) -> bool:
+    """Tell whether a file name denotes a tar archive (possibly compressed)."""
+    return any(str(path).endswith(ext) for ext in TAR_EXTENSIONS)
+
+
+class _PrefixStripper:
+    """
+    Compute the destination of each member of an archive read sequentially.
+
+    The first member decides whether the archive is assumed to have a single top-level
+    directory, which is then stripped from the names of the members. If a later member
+    breaks this assumption, the members already extracted are moved back under this
+    directory (with renames only) and the remaining members are extracted unchanged.
+    """
+
+    def __init__(self, dst_path: Path):
+        self._dst_path = dst_path
+        self._prefix = None
+        self._strip = None
+        self.created = set()
+        """Top-level entries created in the destination."""
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        name = name.replace("\\", "/").lstrip("/")
+        while name.startswith("./"):
+            name = name[2:]
+        return name.rstrip("/")
+
+    def map(self, name: str, is_dir: bool) -> str | None:
+        """
+        Compute the name under which a member is extracted.
+
+        Args:
+            name (str): The name of the member in the archive.
+            is_dir (bool): Whether the member is a directory.
+
+        Returns:
+            str | None: The name of the member relative to the destination, or None if
+                nothing has to be extracted for this member.
+        """
+        name = self._normalize(name)
+        if not name or name == ".":
+            return None
+        top, _, rest = name.partition("/")
+        if self._strip is None:
+            self._strip = is_dir or bool(rest)
+            self._prefix = top
+        if self._strip:
+            if top == self._prefix:
+                if rest:
+                    self.created.add(rest.split("/")[0])
+                return rest or None
+            self._relocate()
+        self.created.add(top)
+        return name
+
+    def map_link(self, linkname: str) -> str:
+        """Compute the target of a hard link (which is a path inside the archive)."""
+        if self._strip:
+            normalized = self._normalize(linkname)
+            if normalized.startswith(self._prefix + "/"):
+                return normalized[len(self._prefix) + 1:]
+        return linkname
+
+    def _relocate(self):
+        """Move the members extracted so far under the top-level directory they were stripped from."""
+        logger.debug(f"The archive has several top-level entries, moving {self._prefix} back into place.")
+        tmp = self._dst_path / f".{self._prefix}.xcsp-extract"
+        tmp.mkdir()
+        for name in self.created:
+            os.rename(self._dst_path / name, tmp / name)
+        os.rename(tmp, self._dst_path / self._prefix)
+        self.created = {self._prefix}
+        self._strip = False
+
+    def cleanup(self):
+        """Remove everything extracted so far."""
+        for name in self.created:
+            remove_entry(self._dst_path / name)
+        self.created = set()
+
+
+def _extract_tar_member(tar: tarfile.TarFile, member: tarfile.TarInfo, dst_path: Path):
+    if hasattr(tarfile, "tar_filter"):
+        tar.extract(member, dst_path, filter="tar")
+    else:
+        tar.extract(member, dst_path)
+
+
+def _extract_tar_stream(fileobj, archive_name: str, stripper: _PrefixStripper, dst_path: Path):
+    """Extract a tar archive read sequentially from a file object."""
+    if str(archive_name).endswith(".tar.zst"):
+        if zstandard is None:
+            raise ValueError(f"Extracting {archive_name} requires the zstandard package "
+                             f"(pip install 'xcsp[zstd]').")
+        fileobj = zstandard.ZstdDecompressor().stream_reader(fileobj)
+    with tarfile.open(fileobj=fileobj, mode="r|*") as tar:
+        for member in tar:
+            name = stripper.map(member.name, member.isdir())
+            if name is None:
+                continue
+            member = copy.copy(member)
+            member.name = name
+            if member.islnk():
+                member.linkname = stripper.map_link(member.linkname)
+            _extract_tar_member(tar, member, dst_path)
+
+
+def _extract_zip(src_path: Path, stripper: _PrefixStripper, dst_path: Path):
+    with zipfile.ZipFile(src_path, 'r') as zip_ref:
+        for info in zip_ref.infolist():
+            name = stripper.map(info.filename, info.is_dir())
+            if name is None:
+                continue
+            info = copy.copy(info)
+            info.filename = name + "/" if info.is_dir() else name
+            zip_ref.extract(info, dst_path)
+
+
 def extract_archive(src_path: Path, dst_path: Path):
     """
-    Extracts an archive (tar.gz, tar.xz, zip, etc.) to dst_path.
+    Extracts an archive (tar.gz, tar.xz, tar.zst, zip, etc.) to dst_path.
     If the archive contains a single root directory, its contents are flattened.
     """
     src_path = Path(src_path)
     dst_path = Path(dst_path)
     dst_path.mkdir(parents=True, exist_ok=True)
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-
-        # 1. Extract archive into temporary location
+    stripper = _PrefixStripper(dst_path)
+    try:
         if src_path.suffix == ".zip":
-            with zipfile.ZipFile(src_path, 'r') as zip_ref:
-                zip_ref.extractall(tmpdir)
-        elif src_path.suffixes[-2:] in [[".tar", ".gz"], [".tar", ".xz"], [".tar", ".bz2"]]:
-            with tarfile.open(src_path, 'r:*') as tar_ref:
-                tar_ref.extractall(tmpdir)
-        elif src_path.suffix == ".tar":
-            with tarfile.open(src_path, 'r') as tar_ref:
-                tar_ref.extractall(tmpdir)
+            _extract_zip(src_path, stripper, dst_path)
+        elif is_tar_archive(src_path.name):
+            with open(src_path, "rb") as f:
+                _extract_tar_stream(f, src_path.name, stripper, dst_path)
         else:
             raise ValueError(f"Unsupported archive format: {src_path.suffixes}")
+    except BaseException:
+        stripper.cleanup()
+        raise
+
+
+class _ChunkPipe:
+    """A bounded, in-memory pipe between a thread writing chunks and a thread reading them."""
+
+    def __init__(self, max_chunks: int = 64):
+        self._chunks = queue.Queue(maxsize=max_chunks)
+        self._buffer = bytearray()
+        self._closed = False
+        self._eof = False
+        self.broken = False
+        """Set when one side gives up: the chunks written afterwards are dropped."""
+
+    def write(self, chunk: bytes | None):
+        while not self.broken:
+            try:
+                self._chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def close(self):
+        """Signal the end of the chunks, after the last one written (None is queued as the end marker)."""
+        if not self._closed:
+            self._closed = True
+            self.write(None)
+
+    def _next_chunk(self):
+        while True:
+            try:
+                return self._chunks.get(timeout=0.1)
+            except queue.Empty:
+                # Only the end marker ends the chunks, unless the writer gave up.
+                if self.broken:
+                    return None
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = self._next_chunk()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+class StreamingExtractor:
+    """
+    Extract a tar archive from the chunks of its content, while it is being downloaded.
+
+    The extraction runs in a background thread, started when the first chunk is written.
+    """
+
+    def __init__(self, archive_name: str, dst_path: Path):
+        """
+        Initialize the extractor.
+
+        Args:
+            archive_name (str): The name of the archive (used to detect its compression).
+            dst_path (Path): The directory in which the archive is extracted.
+        """
+        self._archive_name = archive_name
+        self._dst_path = Path(dst_path)
+        self._stripper = _PrefixStripper(self._dst_path)
+        self._pipe = _ChunkPipe()
+        self._thread = None
+        self._error = None
+        self._aborted = False
+
+    def _run(self):
+        try:
+            _extract_tar_stream(self._pipe, self._archive_name, self._stripper, self._dst_path)
+            # Consume the padding at the end of the archive, so that the writer never blocks.
+            while self._pipe.read(1024 * 1024):
+                pass
+        except BaseException as e:
+            self._error = e
+            self._pipe.broken = True
+
+    def write(self, chunk: bytes):
+        """Feed the next chunk of the archive."""
+        if self._aborted or self._pipe.broken:
+            return
+        if self._thread is None:
+            self._dst_path.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._pipe.write(chunk)
+
+    def abort(self):
+        """Stop the extraction and remove what has been extracted so far."""
+        self._aborted = True
+        self._pipe.broken = True
+        self._pipe.close()
+        if self._thread is not None:
+            self._thread.join()
+        self._stripper.cleanup()
+
+    def finish(self) -> bool:
+        """
+        Wait for the end of the extraction.
+
+        Returns:
+            bool: Whether the whole archive has been extracted. If not, nothing remains of
+                the extraction in the destination.
+        """
+        if self._aborted or self._thread is None:
+            self._stripper.cleanup()
+            return False
+        self._pipe.close()
+        self._thread.join()
+        if self._error is not None:
+            logger.debug(f"Streaming extraction of {self._archive_name} failed: {self._error}")
+            self._stripper.cleanup()
+            return False
+        return True
+
+
+def download_and_extract(url: str, archive_path: Path, dst_path: Path, sha256: str | None = None,
+                         manager=DOWNLOADS) -> Path:
+    """
+    Download an archive and extract it to dst_path.
+
+    Tar archives are extracted while they are downloaded. The downloaded archive is kept
+    at archive_path, and is extracted again from there if the streaming extraction could
+    not be completed (e.g. the archive was found in the download cache).
+
+    Args:
+        url (str): The URL of the archive.
+        archive_path (Path): Where the archive is downloaded.
+        dst_path (Path): The directory in which the archive is extracted.
+        sha256 (str | None): The expected SHA-256 digest of the archive, if known.
+        manager (DownloadManager): The download manager to use.
+
+    Returns:
+        Path: The path of the downloaded archive.
+    """
+    archive_path = Path(archive_path)
+    extractor = StreamingExtractor(archive_path.name, dst_path) if is_tar_archive(archive_path.name) else None
+    try:
+        path = manager.download(url, archive_path, sha256, sink=extractor)
+    except BaseException:
+        if extractor is not None:
+            extractor.abort()
+        raise
+    if extractor is None or not extractor.finish():
+        extract_archive(path, dst_path)
+    return path
+
+
+INSTANCE_OPENERS = {".lzma": lzma.open, ".xz": lzma.open}
+
+
+def open_instance(path):
+    """
+    Open an instance for reading, decompressing it on the fly if it ends with .lzma or .xz.
+
+    Args:
+        path (str | Path): The path of the instance.
+
+    Returns:
+        BinaryIO: The (decompressed) content of the instance.
+    """
+    path = Path(path)
+    return INSTANCE_OPENERS.get(path.suffix, open)(path, "rb")
 
-        # 2. Flatten if single top-level directory
-        children = list(tmpdir.iterdir())
-        if len(children) == 1 and children[0].is_dir():
-            inner = children[0]
-            for item in inner.iterdir():
-                shutil.move(str(item), dst_path / item.name)
-        else:
-            for item in tmpdir.iterdir():
-                shutil.move(str(item), dst_path / item.name)
 
 def decompress_lzma_file(input_path, output_path):
     with lzma.open(input_path, 'rb') as compressed_file:
         with open(output_path, 'wb') as decompressed_file:
-            shutil.copyfileobj(compressed_file, decompressed_file)
\ No newline at end of file
+            shutil.copyfileobj(compressed_file, decompressed_file)
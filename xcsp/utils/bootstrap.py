@@ -3,14 +3,213 @@ Bootstrap module for XCSP Launcher.
 
 This module is responsible for checking whether the user has installed any solvers
 and optionally running the bootstrap process to install default solvers.
+The bootstrap process builds an install plan from the system configuration files,
+so that solvers sharing no dependency are installed concurrently.
 """
 
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import Dict, List
+
+import yaml
 from loguru import logger
+from tqdm import tqdm
 
 import xcsp.utils.paths as paths
+from xcsp.utils.log import init_log
+from xcsp.utils.metrics import QUEUE_DEPTH
+from xcsp.utils.placeholder import available_cores
+from xcsp.utils.profile import Profiler, active_profiler, set_active_profiler
+
+
+class InstallTask:
+    """A solver configuration to install during the bootstrap."""
+
+    def __init__(self, config_path: Path, id_solver: str, dependencies: set):
+        self.config_path = config_path
+        self.id_solver = id_solver
+        self.dependencies = dependencies
+
+    def __repr__(self):
+        return f"InstallTask({self.id_solver}, {self.config_path})"
+
+
+def dependency_key(dep: dict) -> str | None:
+    """
+    Return a key identifying a dependency declared in the ``build.dependencies`` section.
+
+    Two dependencies with the same key are fetched from the same location.
+
+    Args:
+        dep (dict): The dependency as declared in the configuration.
+
+    Returns:
+        str | None: The key of the dependency, or None if it has no source.
+    """
+    source = dep.get("git") or dep.get("url")
+    if source is None:
+        return None
+    source = source.strip().rstrip("/")
+    if source.endswith(".git"):
+        source = source[:-4]
+    return source.lower()
+
+
+def load_install_tasks(config_files: List[Path]) -> List[InstallTask]:
+    """
+    Load the solver configurations and turn them into install tasks.
+
+    Configurations declaring an id already seen are ignored, the first one winning.
+
+    Args:
+        config_files (list[Path]): The configuration files, by decreasing priority.
+
+    Returns:
+        list[InstallTask]: The tasks to run, one per distinct solver id.
+    """
+    tasks = dict()
+    for file in config_files:
+        try:
+            with open(file, "r") as f:
+                config = yaml.safe_load(f) or dict()
+        except (OSError, yaml.YAMLError) as e:
+            logger.error(f"Unable to read solver configuration {file}: {e}")
+            continue
+        id_solver = config.get("id", str(file))
+        if id_solver in tasks:
+            logger.warning(f"Solver '{id_solver}' from {file} is already configured by {tasks[id_solver].config_path}.")
+            continue
+        build = config.get("build") or dict()
+        dependencies = {k for k in map(dependency_key, build.get("dependencies") or []) if k is not None}
+        tasks[id_solver] = InstallTask(Path(file), id_solver, dependencies)
+    return list(tasks.values())
+
+
+def build_install_plan(tasks: List[InstallTask]) -> List[List[InstallTask]]:
+    """
+    Group the install tasks so that tasks sharing a dependency belong to the same group.
+
+    The tasks of a group are run one after the other, so that a shared dependency is fetched
+    by the first installation and reused by the next ones.
+    Distinct groups are independent and can be run concurrently.
+
+    Args:
+        tasks (list[InstallTask]): The tasks to schedule.
+
+    Returns:
+        list[list[InstallTask]]: The groups, largest first, each preserving the original task order.
+    """
+    parent = list(range(len(tasks)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[str, int] = dict()
+    for index, task in enumerate(tasks):
+        for dep in task.dependencies:
+            if dep in owner:
+                parent[find(index)] = find(owner[dep])
+            else:
+                owner[dep] = index
+
+    groups: Dict[int, List[InstallTask]] = dict()
+    for index, task in enumerate(tasks):
+        groups.setdefault(find(index), []).append(task)
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def _install_group(group: List[InstallTask], level: str, build_jobs: int, profile: bool = False):
+    """
+    Install the solvers of a group sequentially (run in a worker process).
+
+    Returns:
+        tuple: For each solver, its id, the error raised by its installation (None on success) and its duration;
+            and, if profiled, the steps recorded in the worker with the time at which their profiler started.
+    """
+    from xcsp.builder.build import BUILD_JOBS
+    from xcsp.commands.install import install, RepoSource
+
+    init_log(level)
+    BUILD_JOBS.set_total(build_jobs)
+    profiler = Profiler() if profile else None
+    set_active_profiler(profiler)
+    results = []
+    for task in group:
+        start = timer()
+        logger.info(f"Installing solver {task.config_path}...")
+        error = None
+        try:
+            install({"subcommand": "install", "config": str(task.config_path.absolute()), "url": None,
+                     "repo": None, "name": None, "id": None, "source": RepoSource.GITHUB})
+        except Exception as e:
+            logger.exception(e)
+            error = str(e)
+        results.append((task.id_solver, error, timer() - start))
+    set_active_profiler(None)
+    return results, (profiler.records(), profiler.epoch) if profiler is not None else None
+
+
+def run_bootstrap(config_files: List[Path], jobs: int | None = None, level: str = "INFO",
+                  build_jobs: int | None = None):
+    """
+    Install all the given solver configurations, running independent installations concurrently.
+
+    Args:
+        config_files (list[Path]): The solver configuration files to install.
+        jobs (int | None): Maximum number of concurrent installations (default: up to 4, bounded by the CPU count).
+        level (str): Log level of the worker processes.
+        build_jobs (int | None): Total number of build jobs, shared among the concurrent installations
+            (default: the number of available cores).
+
+    Returns:
+        dict: Mapping of solver ids to the error raised by their installation (None on success).
+    """
+    plan = build_install_plan(load_install_tasks(config_files))
+    nb_tasks = sum(len(g) for g in plan)
+    if nb_tasks == 0:
+        logger.info("Nothing to install.")
+        return dict()
+    jobs = jobs if jobs is not None and jobs > 0 else min(4, os.cpu_count() or 1)
+    jobs = min(jobs, len(plan))
+    build_jobs_per_worker = max(1, (build_jobs if build_jobs is not None and build_jobs > 0 else available_cores()) // jobs)
+    logger.info(f"Installing {nb_tasks} solvers in {len(plan)} independent groups with {jobs} jobs "
+                f"({build_jobs_per_worker} build jobs each).")
 
+    outcome = dict()
+    # When the launcher is profiled, the steps recorded by the workers are merged into its profile.
+    profiler = active_profiler()
+    parent = profiler.current() if profiler is not None else None
+    QUEUE_DEPTH.set(nb_tasks, queue="bootstrap")
+    with ProcessPoolExecutor(max_workers=jobs) as executor, tqdm(total=nb_tasks, unit="solver") as progress:
+        futures = {executor.submit(_install_group, group, level, build_jobs_per_worker, profiler is not None): group
+                   for group in plan}
+        for future in as_completed(futures):
+            try:
+                results, steps = future.result()
+            except Exception as e:
+                results = [(task.id_solver, str(e), 0.0) for task in futures[future]]
+                steps = None
+            if steps is not None:
+                profiler.merge(*steps, parent=parent)
+            for id_solver, error, elapsed in results:
+                outcome[id_solver] = error
+                progress.set_postfix_str(id_solver)
+                progress.update(1)
+                QUEUE_DEPTH.dec(queue="bootstrap")
+                if error is None:
+                    logger.success(f"Solver {id_solver} installed in {elapsed:.2f} seconds.")
+                else:
+                    logger.error(f"Installation of solver {id_solver} failed after {elapsed:.2f} seconds: {error}")
 
+    nb_failed = sum(1 for e in outcome.values() if e is not None)
+    logger.info(f"{nb_tasks - nb_failed}/{nb_tasks} solvers installed successfully.")
+    return outcome
 
 
 def check_bootstrap():
@@ -0,0 +1,104 @@
+"""Inter-process file locking and atomic file replacement utilities.
+
+These helpers allow several launcher processes (e.g. parallel ``xcsp install``) to
+safely update shared files stored in the cache directory.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """Context manager holding an exclusive lock on a lock file.
+
+    The lock is advisory: every process updating the protected resource must acquire it.
+    """
+
+    def __init__(self, lock_path: Path, poll_interval: float = 0.05):
+        """
+        Initialize the lock.
+
+        Args:
+            lock_path (Path): Path of the lock file (created if needed).
+            poll_interval (float): Delay between two attempts on platforms without blocking locks.
+        """
+        self._lock_path = Path(lock_path)
+        self._poll_interval = poll_interval
+        self._fd = None
+
+    def acquire(self):
+        """Block until the lock is acquired."""
+        self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if sys.platform == "win32":
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        time.sleep(self._poll_interval)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self):
+        """Release the lock if it is held."""
+        if self._fd is None:
+            return
+        try:
+            if sys.platform == "win32":
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, etype, value, traceback):
+        self.release()
+
+
+def atomic_write_json(path: Path, content, **kwargs):
+    """
+    Write a JSON document so that readers never observe a partially written file.
+
+    The content is written into a temporary file of the same directory which is then
+    renamed over the target path.
+
+    Args:
+        path (Path): The target file.
+        content: The JSON-serializable content.
+        **kwargs: Additional arguments given to :func:`json.dump`.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(content, f, **kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,202 @@
+"""Local mirrors of remote git repositories.
+
+Each remote repository cloned by the launcher (solver sources and git dependencies) is
+kept as a bare mirror in the cache directory. New clones are then made from the mirror,
+which only needs to fetch the objects added upstream since the last installation, and
+whose objects are hard-linked into the clone instead of being transferred again. The
+submodules of a clone are cloned from their own mirrors.
+
+A mirror created for a partial clone is blobless: it holds the commits and the trees only,
+and its clones fetch the file contents they check out from the remote repository.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from git import Repo, GitCommandError
+from loguru import logger
+from timeit import default_timer as timer
+
+import xcsp.utils.paths as paths
+from xcsp.utils.filelock import FileLock
+from xcsp.utils.http import is_offline
+
+
+def submodule_jobs() -> int:
+    """Return the number of submodules fetched in parallel."""
+    return min(8, os.cpu_count() or 1)
+
+
+def _is_partial(repo: Repo) -> bool:
+    """Tell whether a repository is a partial clone of its origin."""
+    return bool(repo.config_reader().get_value('remote "origin"', "promisor", default=False))
+
+
+def _set_promisor(repo: Repo, remote: str, url: str | None = None):
+    """Declare a remote from which the missing file contents of a repository are fetched."""
+    with repo.config_writer() as config:
+        if url is not None:
+            config.set_value(f'remote "{remote}"', "url", url)
+        config.set_value(f'remote "{remote}"', "promisor", "true")
+        config.set_value(f'remote "{remote}"', "partialclonefilter", "blob:none")
+        if remote == "origin":
+            config.set_value("core", "repositoryformatversion", "1")
+            config.set_value("extensions", "partialClone", "origin")
+
+
+class GitMirrors:
+    """Cache of bare mirrors of remote git repositories, keyed by their URL."""
+
+    def __init__(self, root: Path | None = None, enabled: bool | None = None):
+        """
+        Initialize the mirror cache.
+
+        Args:
+            root (Path | None): Directory of the mirrors (defaults to :func:`xcsp.utils.paths.get_git_mirror_dir`).
+            enabled (bool | None): Whether mirrors are used (defaults to the ``XCSP_GIT_MIRRORS``
+                environment variable, mirrors being enabled unless it is set to ``0``).
+        """
+        self._root = Path(root) if root is not None else None
+        self._enabled = enabled
+
+    @property
+    def root(self) -> Path:
+        return self._root if self._root is not None else paths.get_git_mirror_dir()
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is not None:
+            return self._enabled
+        return os.environ.get("XCSP_GIT_MIRRORS", "1").lower() not in ("0", "false", "no")
+
+    def mirror_path(self, url: str) -> Path:
+        """Return the path of the mirror of a remote repository."""
+        name = url.rstrip("/").split("/")[-1].removesuffix(".git")
+        return self.root / f"{name}-{hashlib.sha256(url.encode()).hexdigest()[:16]}.git"
+
+    def update(self, url: str, partial: bool = False) -> Path | None:
+        """
+        Create or update the mirror of a remote repository.
+
+        Args:
+            url (str): The URL of the remote repository.
+            partial (bool): Whether the mirror, if it has to be created, is blobless (an existing
+                mirror is kept as it is).
+
+        Returns:
+            Path | None: The path of the mirror, or None if the repository is not mirrored
+                (mirrors are disabled, the repository is local, or the mirror cannot be created).
+        """
+        if not self.enabled or os.path.exists(url):
+            return None
+        mirror = self.mirror_path(url)
+        with FileLock(mirror.with_name(f".{mirror.name}.lock")):
+            start = timer()
+            try:
+                if mirror.exists():
+                    if is_offline():
+                        return mirror
+                    Repo(mirror).git.fetch("--prune", "origin")
+                    logger.info(f"Mirror of {url} updated in {timer() - start:.2f} seconds.")
+                elif not is_offline():
+                    tmp = Path(tempfile.mkdtemp(dir=mirror.parent, prefix=f".{mirror.name}."))
+                    try:
+                        Repo.clone_from(url, tmp, mirror=True, multi_options=["--filter=blob:none"] if partial else [])
+                        if partial:
+                            # Clones fetch the new commits and trees of a blobless mirror with the same filter.
+                            Repo(tmp).git.config("uploadpack.allowFilter", "true")
+                        os.rename(tmp, mirror)
+                    finally:
+                        shutil.rmtree(tmp, ignore_errors=True)
+                    logger.info(f"Mirror of {url} created in {timer() - start:.2f} seconds.")
+                else:
+                    return None
+            except GitCommandError as e:
+                logger.warning(f"Unable to update the mirror of {url}: {e}")
+                return mirror if mirror.exists() else None
+        return mirror
+
+    def clone(self, url: str, dest: Path, partial: bool = False, submodules: bool = True) -> Repo:
+        """
+        Clone a remote repository, through its mirror when possible.
+
+        Args:
+            url (str): The URL of the remote repository.
+            dest (Path): The directory of the clone.
+            partial (bool): Whether a blobless clone is enough (file contents are then fetched on
+                checkout). A clone made from a blobless mirror is blobless too.
+            submodules (bool): Whether submodules are initialized (in parallel, from their mirrors when possible).
+
+        Returns:
+            Repo: The cloned repository, whose origin is the remote repository.
+        """
+        mirror = self.update(url, partial)
+        if mirror is not None:
+            partial_mirror = _is_partial(Repo(mirror))
+            repo = Repo.clone_from(str(mirror), dest, no_checkout=partial_mirror)
+            repo.remotes.origin.set_url(url)
+            if partial_mirror:
+                # The clone shares the packs of the mirror: the contents missing from both are fetched from the remote.
+                _set_promisor(repo, "origin")
+                repo.git.reset("--hard")
+            if submodules and (Path(dest) / ".gitmodules").exists():
+                self._update_submodules(repo)
+            return repo
+        options = ["--filter=blob:none"] if partial and not os.path.exists(url) else []
+        if submodules:
+            options += ["--recurse-submodules", f"--jobs={submodule_jobs()}"]
+        return Repo.clone_from(url, dest, multi_options=options)
+
+    def fetch(self, repo: Repo, url: str):
+        """
+        Update the remote branches and the tags of an existing clone, through the mirror when possible.
+
+        Args:
+            repo (Repo): The clone.
+            url (str): The URL of its remote repository.
+        """
+        mirror = self.update(url)
+        if mirror is not None and _is_partial(Repo(mirror)):
+            if _is_partial(repo):
+                # Only the new commits and trees are fetched, from a promisor remote (not a path, whose
+                # promisor settings git would store under an invalid remote name).
+                _set_promisor(repo, "mirror", str(mirror))
+                repo.git.fetch("--tags", "--force", "mirror", "+refs/heads/*:refs/remotes/origin/*")
+                return
+            # A complete clone cannot be updated from a blobless mirror.
+            mirror = None
+        if mirror is not None:
+            repo.git.fetch("--tags", "--force", str(mirror), "+refs/heads/*:refs/remotes/origin/*")
+        elif not is_offline():
+            repo.git.fetch("--tags", "--force", "origin")
+
+    def _update_submodules(self, repo: Repo):
+        """Initialize the submodules of a clone (recursively), cloning them from their mirrors when possible."""
+        repo.git.submodule("init")
+        try:
+            keys = repo.git.config("--get-regexp", r"^submodule\..*\.url$").splitlines()
+        except GitCommandError:
+            return
+        keys = [line.split(" ", 1) for line in keys]
+        with ThreadPoolExecutor(max_workers=submodule_jobs()) as executor:
+            mirrors = list(executor.map(self.update, [url for _, url in keys]))
+        for (key, _), mirror in zip(keys, mirrors):
+            if mirror is not None:
+                repo.git.config(key, str(mirror))
+        # Since git 2.38.1, local repositories (such as the mirrors) are only cloned as submodules if allowed.
+        with repo.git.custom_environment(GIT_CONFIG_COUNT="1", GIT_CONFIG_KEY_0="protocol.file.allow",
+                                         GIT_CONFIG_VALUE_0="always"):
+            repo.git.submodule("update", "--jobs", str(submodule_jobs()))
+        # The submodules are then fetched from their remote repositories again.
+        repo.git.submodule("sync")
+        for submodule in repo.submodules:
+            path = Path(repo.working_tree_dir) / submodule.path
+            if (path / ".gitmodules").exists():
+                self._update_submodules(Repo(path))
+
+
+MIRRORS = GitMirrors()
+"""Mirror cache shared by the whole launcher."""
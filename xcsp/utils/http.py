@@ -1,4 +1,49 @@
+"""HTTP utilities for XCSP Launcher.
+
+This module provides a download manager sharing a pool of HTTP connections between
+downloads, running downloads concurrently, resuming interrupted downloads with HTTP
+Range requests and verifying the SHA-256 checksum of the downloaded files.
+Downloaded files are kept in a content-addressed cache shared by all the solvers, which is
+looked up before any network access.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List, Tuple
+
 import requests
+import urllib3
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+import xcsp.utils.paths as paths
+from xcsp.utils.storage import evict_least_recently_used, touch
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+TARGET_CHUNK_DURATION = 0.25
+"""Chunks are resized so that reading one chunk takes about this duration (in seconds)."""
+
+DEFAULT_CACHE_MAX_SIZE = 2 * 1024 ** 3
+"""Default maximum size of the download cache (2 GiB)."""
+
+
+class ChecksumError(requests.RequestException):
+    """Raised when a downloaded file does not match its expected checksum."""
+
+
+class OfflineError(requests.RequestException):
+    """Raised when a file must be downloaded while the launcher runs offline."""
+
+
+def is_offline() -> bool:
+    """Tell whether network access is disabled (``XCSP_OFFLINE`` environment variable)."""
+    return os.environ.get("XCSP_OFFLINE", "").lower() not in ("", "0", "false", "no")
 
 
 def resolve_url(repo, source):
@@ -8,9 +53,352 @@ def resolve_url(repo, source):
         r += ".git"
     return "https://" + source.value + "/" + r
 
-def download(url, into):
-    response = requests.get(url, stream=True)
-    response.raise_for_status()  # Raise an error for bad responses
-    with open(into, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+
+def sha256_of(path: Path) -> str:
+    """Compute the SHA-256 digest (in hexadecimal) of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(MAX_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def target_path(url: str, into) -> Path:
+    """
+    Compute the path of the file a URL is downloaded into.
+
+    Args:
+        url (str): The downloaded URL.
+        into (str | Path): Either a file path, or an existing directory in which case the file
+            is named after the last component of the URL.
+
+    Returns:
+        Path: The path of the downloaded file.
+    """
+    into = Path(into)
+    if into.is_dir():
+        return into / url.rstrip("/").split("/")[-1]
+    return into
+
+
+def _link_or_copy(source: Path, target: Path):
+    """Atomically place a file at ``target``, as a hard link to ``source`` when possible, else as a copy."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    os.close(fd)
+    os.unlink(tmp)
+    try:
+        try:
+            os.link(source, tmp)
+        except OSError:
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+class DownloadCache:
+    """Size-bounded, content-addressed store of downloaded files.
+
+    Entries are keyed by the URL and the declared checksum of the file, so that a
+    configuration declaring a new checksum for the same URL never gets a stale file.
+    Files are delivered by hard links when the target is on the same filesystem: they
+    must be treated as read-only by their users.
+    """
+
+    def __init__(self, root: Path | None = None, max_size: int | None = None):
+        """
+        Initialize the download cache.
+
+        Args:
+            root (Path | None): Directory of the cache (defaults to :func:`xcsp.utils.paths.get_download_cache_dir`).
+            max_size (int | None): Maximum size of the cache, in bytes (defaults to the
+                ``XCSP_DOWNLOAD_CACHE_MAX_SIZE`` environment variable, in MiB, or 2 GiB).
+        """
+        self._root = Path(root) if root is not None else None
+        self.max_size = max_size
+
+    @property
+    def root(self) -> Path:
+        return self._root if self._root is not None else paths.get_download_cache_dir()
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        if os.environ.get("XCSP_DOWNLOAD_CACHE_MAX_SIZE"):
+            return int(os.environ["XCSP_DOWNLOAD_CACHE_MAX_SIZE"]) * 1024 * 1024
+        return DEFAULT_CACHE_MAX_SIZE
+
+    @max_size.setter
+    def max_size(self, value: int | None):
+        self._max_size = value
+
+    @staticmethod
+    def key(url: str, sha256: str | None = None) -> str:
+        """Compute the key of the entry storing the file downloaded from a URL."""
+        return hashlib.sha256(f"{url}\n{(sha256 or '').lower()}".encode()).hexdigest()
+
+    def fetch(self, url: str, sha256: str | None, target: Path) -> bool:
+        """
+        Place the cached copy of a file at the given target, if there is one.
+
+        Args:
+            url (str): The URL of the file.
+            sha256 (str | None): The declared SHA-256 digest of the file.
+            target (Path): Where to place the file.
+
+        Returns:
+            bool: Whether the file was in the cache.
+        """
+        entry = self.root / self.key(url, sha256)
+        if not entry.is_file():
+            return False
+        try:
+            _link_or_copy(entry, target)
+        except FileNotFoundError:
+            # Evicted in the meantime by another process.
+            return False
+        touch(entry)
+        logger.info(f"{url} found in the download cache.")
+        return True
+
+    def store(self, url: str, sha256: str | None, path: Path):
+        """
+        Add a downloaded file to the cache, and evict the least recently used entries if needed.
+
+        Args:
+            url (str): The URL of the file.
+            sha256 (str | None): The declared SHA-256 digest of the file.
+            path (Path): The downloaded file.
+        """
+        root = self.root
+        try:
+            _link_or_copy(path, root / self.key(url, sha256))
+        except OSError as e:
+            logger.warning(f"Unable to store {url} in the download cache: {e}")
+            return
+        evict_least_recently_used(root, self.max_size)
+
+
+class DownloadManager:
+    """Download files over a shared pool of HTTP connections."""
+
+    def __init__(self, pool_size: int = 16, retries: int = 3, timeout: float = 60,
+                 cache: DownloadCache | None = None, offline: bool | None = None):
+        """
+        Initialize the download manager.
+
+        Args:
+            pool_size (int): Maximum number of connections kept open per host.
+            retries (int): Number of attempts for each download before giving up.
+            timeout (float): Timeout (in seconds) for connecting and reading.
+            cache (DownloadCache | None): The cache of downloaded files, if any.
+            offline (bool | None): Whether network access is disabled (defaults to :func:`is_offline`).
+        """
+        self.cache = cache
+        self.offline = offline
+        self._pool_size = pool_size
+        self._retries = retries
+        self._timeout = timeout
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def offline(self) -> bool:
+        return self._offline if self._offline is not None else is_offline()
+
+    @offline.setter
+    def offline(self, value: bool | None):
+        self._offline = value
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the session shared by all the downloads."""
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self._pool_size, pool_maxsize=self._pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def download(self, url: str, into, sha256: str | None = None, sink=None) -> Path:
+        """
+        Download a file.
+
+        The download cache is looked up first. Otherwise, the content is written into a ``.part``
+        file next to the target. If the download is interrupted, the next attempt resumes it from
+        where it stopped (when the server supports Range requests).
+
+        Args:
+            url (str): The URL of the file.
+            into (str | Path): The target file, or an existing directory.
+            sha256 (str | None): The expected SHA-256 digest of the file, if known.
+            sink: An object whose ``write`` method receives the content of the file, in order,
+                while it is downloaded. It is not fed when the file is found on disk or in the
+                cache, and its ``abort`` method is called if the download has to restart from scratch.
+
+        Returns:
+            Path: The path of the downloaded file.
+
+        Raises:
+            requests.RequestException: If the file cannot be downloaded.
+            ChecksumError: If the downloaded file does not match the expected digest.
+            OfflineError: If the file is not in the cache while the manager is offline.
+        """
+        target = target_path(url, into)
+        sha256 = sha256.lower() if sha256 else None
+        if sha256 is not None and target.exists() and sha256_of(target) == sha256:
+            logger.info(f"{target} is already downloaded.")
+            return target
+        if self.cache is not None and self.cache.fetch(url, sha256, target):
+            return target
+        if self.offline:
+            raise OfflineError(f"{url} is not in the download cache and the launcher runs offline.")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        part = target.with_name(target.name + ".part")
+        if sink is not None and part.exists():
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(MAX_CHUNK_SIZE), b""):
+                    sink.write(chunk)
+
+        for attempt in range(1, self._retries + 1):
+            try:
+                self._fetch(url, part, sink)
+                break
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == self._retries:
+                    raise
+                logger.warning(f"Download of {url} interrupted ({e}), resuming (attempt {attempt + 1}/{self._retries}).")
+                time.sleep(min(2 ** attempt, 10) / 10)
+
+        if sha256 is not None:
+            actual = sha256_of(part)
+            if actual != sha256:
+                part.unlink(missing_ok=True)
+                raise ChecksumError(f"Checksum mismatch for {url}: expected {sha256}, got {actual}.")
+        os.replace(part, target)
+        if self.cache is not None:
+            self.cache.store(url, sha256, target)
+        return target
+
+    def _fetch(self, url: str, part: Path, sink=None):
+        """Download (or resume the download of) a URL into a partial file."""
+        offset = part.stat().st_size if part.exists() else 0
+        # The content is asked (and written) as is, without any Content-Encoding: the size of the partial file
+        # is then an offset in the bytes sent by the server, as expected by the Range requests.
+        headers = {"Accept-Encoding": "identity"}
+        if offset > 0:
+            headers["Range"] = f"bytes={offset}-"
+        with self.session.get(url, stream=True, headers=headers, timeout=self._timeout) as response:
+            if offset > 0 and response.status_code == 416:
+                logger.debug(f"{url} was already completely downloaded.")
+                return
+            response.raise_for_status()
+            if offset > 0 and response.status_code != 206:
+                logger.debug(f"The server does not support resuming the download of {url}, restarting it.")
+                offset = 0
+                if sink is not None:
+                    sink.abort()
+                    sink = None
+            elif offset > 0:
+                logger.info(f"Resuming the download of {url} from byte {offset}.")
+            with open(part, "ab" if offset > 0 else "wb") as f:
+                for chunk in iter_adaptive_chunks(response):
+                    f.write(chunk)
+                    if sink is not None:
+                        sink.write(chunk)
+
+    def download_all(self, downloads: Iterable[Tuple[str, object, str | None]], jobs: int | None = None) -> List:
+        """
+        Download several files concurrently.
+
+        Args:
+            downloads: Triples (url, into, sha256) describing the files to download.
+            jobs (int | None): Maximum number of concurrent downloads (defaults to the pool size).
+
+        Returns:
+            list: For each download (in the same order), either the path of the downloaded file
+                or the exception raised while downloading it.
+        """
+        return self.run_all(lambda d: self.download(*d), downloads, jobs)
+
+    def run_all(self, function: Callable, items: Iterable, jobs: int | None = None) -> List:
+        """
+        Apply a downloading function to several items concurrently.
+
+        Args:
+            function (Callable): The function to apply to each item.
+            items: The items.
+            jobs (int | None): Maximum number of concurrent calls (defaults to the pool size).
+
+        Returns:
+            list: For each item (in the same order), either the result of the function or the
+                exception it raised.
+        """
+        items = list(items)
+        if not items:
+            return []
+        jobs = max(1, min(jobs if jobs is not None else self._pool_size, len(items)))
+
+        def run(item):
+            try:
+                return function(item)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(run, items))
+
+
+def iter_adaptive_chunks(response: requests.Response):
+    """
+    Iterate over the content of a streamed response, with chunks whose size adapts to the throughput.
+
+    Args:
+        response (requests.Response): A response obtained with ``stream=True``.
+
+    Yields:
+        bytes: The successive chunks of the content, as sent by the server (i.e. not decoded, so that their
+            sizes add up to the offsets used by Range requests).
+    """
+    chunk_size = MIN_CHUNK_SIZE
+    while True:
+        start = time.perf_counter()
+        try:
+            chunk = response.raw.read(chunk_size, decode_content=False)
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.ConnectionError(e)
+        if not chunk:
+            return
+        yield chunk
+        elapsed = time.perf_counter() - start
+        if elapsed < TARGET_CHUNK_DURATION / 2 and chunk_size < MAX_CHUNK_SIZE:
+            chunk_size = min(chunk_size * 2, MAX_CHUNK_SIZE)
+        elif elapsed > TARGET_CHUNK_DURATION * 2 and chunk_size > MIN_CHUNK_SIZE:
+            chunk_size = max(chunk_size // 2, MIN_CHUNK_SIZE)
+
+
+DOWNLOADS = DownloadManager(cache=DownloadCache())
+"""Download manager shared by the whole launcher."""
+
+
+def download(url, into, sha256=None):
+    """
+    Download a file with the shared download manager.
+
+    Args:
+        url (str): The URL of the file.
+        into (str | Path): The target file, or an existing directory.
+        sha256 (str | None): The expected SHA-256 digest of the file, if known.
+
+    Returns:
+        Path: The path of the downloaded file.
+    """
+    return DOWNLOADS.download(url, into, sha256)
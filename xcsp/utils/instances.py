@@ -0,0 +1,317 @@
+"""
+Metadata of XCSP3 instances, and their persistent index.
+
+The metadata of an instance (type, numbers of variables and constraints, types of the constraints,
+sizes of the domains, objectives) is read in a single streaming pass with ``iterparse``, through
+lzma for compressed instances: the elements are discarded as soon as they are read, so that the
+memory used does not depend on the size of the instance.
+
+The index is a JSON file, in which the metadata are keyed by the SHA-256 of the content of the
+instances, and the files are mapped to these hashes together with their size and modification
+time. Files which did not change are thus neither hashed nor parsed again, and renamed or copied
+instances are not parsed again either.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from loguru import logger
+
+import xcsp.utils.paths as paths
+from xcsp.utils.archive import open_instance
+from xcsp.utils.filelock import FileLock, atomic_write_json
+
+INDEX_VERSION = 1
+
+INSTANCE_EXTENSIONS = [".xml", ".xml.lzma", ".xml.xz"]
+
+_INDEX = re.compile(r"\[(\d+)\]")
+
+# Elements which contain constraints, rather than being constraints.
+_CONTAINERS = {"constraints", "block"}
+
+
+def default_index_file() -> Path:
+    """Return the path of the default instance index, in the cache directory."""
+    return paths.get_cache_dir() / "instance_index.json"
+
+
+def is_instance(path) -> bool:
+    """Tell whether a file name denotes an XCSP3 instance (possibly compressed)."""
+    return any(str(path).endswith(ext) for ext in INSTANCE_EXTENSIONS)
+
+
+def content_hash(path) -> str:
+    """Return the SHA-256 of the content of a file, as stored (i.e. compressed for compressed instances)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _domain_size(text: str) -> int:
+    size = 0
+    for token in text.split():
+        if ".." in token:
+            low, high = token.split("..")
+            size += int(high) - int(low) + 1
+        else:
+            size += 1
+    return size
+
+
+def read_metadata(path) -> dict:
+    """
+    Read the metadata of an instance.
+
+    Args:
+        path (str | Path): The path of the instance (possibly compressed with lzma).
+
+    Returns:
+        dict: The type of the instance, its numbers of variables and constraints, the number of constraints of
+            each type, the smallest and largest domain sizes, and its objectives.
+    """
+    metadata = {"type": None, "variables": 0, "arrays": 0, "constraints": 0, "constraint_types": dict(),
+                "min_domain_size": None, "max_domain_size": None, "objectives": []}
+    types = metadata["constraint_types"]
+    domains = dict()
+    stack = []
+    group_template, group_args = None, 0
+
+    def add_domain(size):
+        for key, better in (("min_domain_size", min), ("max_domain_size", max)):
+            metadata[key] = size if metadata[key] is None else better(metadata[key], size)
+
+    with open_instance(path) as f:
+        for event, element in ElementTree.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if not stack:
+                    metadata["type"] = element.get("type")
+                stack.append(element)
+                continue
+            stack.pop()
+            parent = stack[-1] if stack else None
+            tag = element.tag
+            if tag == "var":
+                metadata["variables"] += 1
+                size = domains[element.get("as")] if element.get("as") else _domain_size(element.text or "")
+                domains[element.get("id")] = size
+                add_domain(size)
+            elif tag == "array":
+                metadata["arrays"] += 1
+                metadata["variables"] += math.prod(int(d) for d in _INDEX.findall(element.get("size")))
+                if (element.text or "").strip():
+                    # Otherwise, the domains are given by its (already read) domain elements.
+                    add_domain(_domain_size(element.text))
+            elif tag == "domain" and parent is not None and parent.tag == "array":
+                add_domain(_domain_size(element.text or ""))
+            elif parent is not None and parent.tag == "group":
+                # A group is a template constraint, instantiated once for each of its args.
+                if tag == "args":
+                    group_args += 1
+                elif group_template is None:
+                    group_template = tag
+            elif tag == "group" and parent is not None and parent.tag in _CONTAINERS:
+                types[group_template] = types.get(group_template, 0) + group_args
+                metadata["constraints"] += group_args
+                group_template, group_args = None, 0
+            elif tag in ("minimize", "maximize") and parent is not None and parent.tag == "objectives":
+                metadata["objectives"].append({"goal": tag, "type": element.get("type", "expression")})
+            elif parent is not None and parent.tag in _CONTAINERS and tag not in _CONTAINERS:
+                types[tag] = types.get(tag, 0) + 1
+                metadata["constraints"] += 1
+            if parent is not None:
+                # The element is no longer needed: it is removed to keep the memory used bounded.
+                parent.remove(element)
+    return metadata
+
+
+def _read_entry(path: str) -> dict:
+    try:
+        return read_metadata(path)
+    except (ElementTree.ParseError, OSError, EOFError, ValueError) as e:
+        return {"error": str(e)}
+
+
+def find_instances(roots: Iterable) -> List[Path]:
+    """
+    Find the instances in files and directories (recursively).
+
+    Args:
+        roots (Iterable[str | Path]): The files and directories.
+
+    Returns:
+        List[Path]: The absolute paths of the instances, sorted.
+    """
+    found = set()
+    for root in roots:
+        root = Path(root).resolve()
+        if root.is_dir():
+            for directory, _, files in os.walk(root):
+                found.update(Path(directory) / name for name in files if is_instance(name))
+        elif is_instance(root):
+            found.add(root)
+    return sorted(found)
+
+
+class InstanceIndex:
+    """A persistent index of the metadata of instances, keyed by the hash of their content."""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str | Path | None): The JSON file of the index (by default, see :func:`default_index_file`).
+        """
+        self.path = Path(path) if path is not None else default_index_file()
+        self.instances, self.files = self._read()
+
+    def _read(self):
+        if not self.path.exists():
+            return dict(), dict()
+        with open(self.path) as f:
+            content = json.load(f)
+        if content.get("version") != INDEX_VERSION:
+            logger.warning(f"Ignoring the index {self.path}, written by another version.")
+            return dict(), dict()
+        return content["instances"], content["files"]
+
+    def _lock(self) -> FileLock:
+        return FileLock(self.path.with_name(self.path.name + ".lock"))
+
+    def lookup(self, path) -> dict | None:
+        """
+        Return the metadata of an indexed instance.
+
+        Args:
+            path (str | Path): The path of the instance.
+
+        Returns:
+            dict | None: Its metadata, or None if it is not indexed or was modified since.
+        """
+        path = Path(path).resolve()
+        entry = self.files.get(str(path))
+        if entry is None or not path.exists():
+            return None
+        stat = path.stat()
+        if (entry["size"], entry["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+            return None
+        return self.instances.get(entry["hash"])
+
+    def update(self, roots: Iterable, workers: int | None = None, rebuild: bool = False) -> dict:
+        """
+        Index the instances found in files and directories, and save the index.
+
+        Only the files which were modified since they were indexed are hashed, and only the instances whose hash
+        is not indexed are parsed, in parallel. The files which no longer exist under the given roots are
+        removed from the index.
+
+        Args:
+            roots (Iterable[str | Path]): The files and directories of the instances.
+            workers (int | None): The number of processes hashing and parsing the instances (default: number of cores).
+            rebuild (bool): Whether all the instances are parsed again.
+
+        Returns:
+            dict: The number of instances which are "unchanged", "hashed", "parsed", "failed" and "removed".
+        """
+        roots = [Path(root).resolve() for root in roots]
+        found = find_instances(roots)
+        stats = {"unchanged": 0, "hashed": 0, "parsed": 0, "failed": 0, "removed": 0}
+        # The changes made by this update, merged into the index file when it is saved.
+        files, removed, instances = dict(), set(), dict()
+
+        to_hash = []
+        for path in found:
+            stat = path.stat()
+            entry = self.files.get(str(path))
+            if entry is not None and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                stats["unchanged"] += 1
+            else:
+                files[str(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": None}
+                to_hash.append(path)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path, digest in zip(to_hash, executor.map(content_hash, to_hash, chunksize=16)):
+                files[str(path)]["hash"] = digest
+            stats["hashed"] = len(to_hash)
+
+            to_parse = dict()
+            for path in found:
+                digest = files.get(str(path), self.files.get(str(path)))["hash"]
+                if (rebuild or digest not in self.instances) and digest not in to_parse:
+                    to_parse[digest] = path
+            paths_to_parse = [str(path) for path in to_parse.values()]
+            for (digest, path), metadata in zip(to_parse.items(), executor.map(_read_entry, paths_to_parse)):
+                if "error" in metadata:
+                    logger.warning(f"Impossible to read the instance {path}: {metadata['error']}")
+                    # The files of the instance are not indexed, so that they are read again next time.
+                    for file in found:
+                        if files.get(str(file), self.files.get(str(file)))["hash"] == digest:
+                            files.pop(str(file), None)
+                            removed.add(str(file))
+                    stats["failed"] += 1
+                    continue
+                metadata["name"] = path.name
+                instances[digest] = metadata
+                stats["parsed"] += 1
+
+        indexed = set(str(path) for path in found)
+        for file in self.files:
+            if file not in indexed and any(Path(file).is_relative_to(root) for root in roots):
+                removed.add(file)
+                stats["removed"] += 1
+        self.save(files, removed, instances)
+        return stats
+
+    def save(self, files: Dict[str, dict] | None = None, removed: Iterable[str] = (),
+             instances: Dict[str, dict] | None = None):
+        """
+        Merge changes into the index file, and reload it.
+
+        The index file is re-read under an exclusive lock, so that the entries written meanwhile by other
+        processes (e.g. indexing other directories) are kept.
+
+        Args:
+            files (Dict[str, dict] | None): The files added or updated, with their size, modification time and hash.
+            removed (Iterable[str]): The files removed from the index.
+            instances (Dict[str, dict] | None): The metadata added or updated, by hash.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock():
+            current_instances, current_files = self._read()
+            current_files.update(files or dict())
+            for file in removed:
+                current_files.pop(file, None)
+            current_instances.update(instances or dict())
+            referenced = set(entry["hash"] for entry in current_files.values())
+            current_instances = {digest: metadata for digest, metadata in current_instances.items()
+                                 if digest in referenced}
+            atomic_write_json(self.path, {"version": INDEX_VERSION, "instances": current_instances,
+                                          "files": current_files})
+        self.instances, self.files = current_instances, current_files
+
+    def entries(self, roots: Iterable | None = None) -> List[dict]:
+        """
+        Return the indexed instances, with their path and hash.
+
+        Args:
+            roots (Iterable[str | Path] | None): Only return the instances under these files and directories.
+
+        Returns:
+            List[dict]: The metadata of the instances, sorted by path.
+        """
+        roots = [Path(root).resolve() for root in roots] if roots is not None else None
+        entries = []
+        for file, entry in sorted(self.files.items()):
+            if roots is not None and not any(Path(file).is_relative_to(root) for root in roots):
+                continue
+            if entry["hash"] in self.instances:
+                entries.append(dict(self.instances[entry["hash"]], name=Path(file).name, path=file,
+                                    hash=entry["hash"]))
+        return entries
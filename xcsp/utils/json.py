@@ -1,10 +1,15 @@
 import enum
 import json
+from collections.abc import Mapping, Sequence
 
 
 class CustomEncoder(json.JSONEncoder):
-    """Custom JSON encoder to handle enum serialization."""
+    """Custom JSON encoder to handle enum serialization, and mappings and sequences which are not dicts or lists."""
     def default(self, obj):
         if isinstance(obj, enum.Enum):
             return obj.value
+        if isinstance(obj, Mapping):
+            return dict(obj)
+        if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)):
+            return list(obj)
         return super().default(obj)
\ No newline at end of file
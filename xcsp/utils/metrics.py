@@ -0,0 +1,204 @@
+"""Metrics of XCSP Launcher, exposed in the Prometheus text format.
+
+The launcher counts the solver runs it starts and finishes, the solver processes currently
+running, the timeouts, the spawn latency of the solvers, ... in the metrics declared in this
+module. When it drives long executions (e.g. with ``--metrics-port``), these metrics can be
+scraped over HTTP by Prometheus (or read with ``curl``) while it is running, see
+:func:`start_metrics_server`.
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRICS: List["Metric"] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """A metric, whose samples are identified by the values of its labels."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[tuple, float] = dict()
+        self._lock = threading.Lock()
+        METRICS.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"Metric {self.name} expects the labels {self.labels}, got {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _label_string(self, key: tuple, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labels, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def value(self, **labels) -> float:
+        """Return the current value of the sample with the given labels."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        if not values and not self.labels:
+            values[()] = 0.0
+        return [f"{self.name}{self._label_string(key)} {_format_value(value)}" for key, value in sorted(values.items())]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """A metric which can only increase."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only be increased.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """A metric which can go up and down."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """A metric counting observations in buckets, along with their number and sum."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._observations: Dict[tuple, list] = dict()
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._observations.get(key, ([0] * len(self.buckets), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._observations[key] = (counts, total + value)
+
+    def value(self, **labels) -> float:
+        """Return the number of observations with the given labels."""
+        with self._lock:
+            counts, _ = self._observations.get(self._key(labels), ([0], 0.0))
+            return float(sum(counts))
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            observations = {key: (list(counts), total) for key, (counts, total) in self._observations.items()}
+        lines = []
+        for key, (counts, total) in sorted(observations.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = self._label_string(key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_string(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._label_string(key)} {cumulative}")
+        return lines
+
+
+RUNS_STARTED = Counter("xcsp_runs_started_total", "Number of solver runs started.", ("solver",))
+RUNS_FINISHED = Counter("xcsp_runs_finished_total", "Number of solver runs finished, by final status.",
+                        ("solver", "status"))
+RUNS_FAILED = Counter("xcsp_runs_failed_total",
+                      "Number of solver runs which failed, because the solver exited with an error or the launcher "
+                      "raised an exception.", ("solver", "reason"))
+ACTIVE_PROCESSES = Gauge("xcsp_active_solver_processes", "Number of solver processes currently running.")
+QUEUE_DEPTH = Gauge("xcsp_queue_depth", "Number of tasks waiting or running in a queue of the launcher.", ("queue",))
+TIMEOUTS = Counter("xcsp_timeouts_total", "Number of solver runs interrupted by their time limit.", ("solver",))
+TIMEOUT_SIGNALS = Counter("xcsp_timeout_signals_total", "Number of signals sent to solvers reaching their time limit.",
+                          ("signal",))
+MEMOUTS = Counter("xcsp_memouts_total", "Number of solver runs which ran out of memory.", ("solver",))
+SPAWN_LATENCY = Histogram("xcsp_spawn_latency_seconds", "Time taken to spawn the solver processes.")
+SOLVER_CPU_SECONDS = Counter("xcsp_solver_cpu_seconds_total", "CPU time of the solver runs, in seconds.", ("solver",))
+
+
+def render() -> str:
+    """
+    Render all the metrics in the Prometheus text exposition format.
+
+    Returns:
+        str: The metrics, one block (HELP, TYPE and samples) per metric.
+    """
+    return "".join(metric.render() for metric in METRICS)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.trace(f"Metrics endpoint: {format % args}")
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve the metrics over HTTP (on ``/metrics``) from a background thread.
+
+    Args:
+        port (int): The port to listen on (0 to pick a free one).
+        host (str): The address to listen on (default: only the local host).
+
+    Returns:
+        ThreadingHTTPServer: The running server; its ``server_address`` gives the port actually used,
+        and ``shutdown()`` stops it.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    logger.info(f"Metrics available at http://{server.server_address[0]}:{server.server_address[1]}/metrics")
+    return server
@@ -19,6 +19,35 @@ def get_cache_dir() -> Path:
     """Return the directory where cache files are stored."""
     return Path(user_cache_dir(__title__, __title__))
 
+def get_build_cache_dir() -> Path:
+    """Return the directory where build artifacts are cached.
+
+    The location can be overridden with the ``XCSP_BUILD_CACHE_DIR`` environment variable,
+    e.g. to share the cache between several nodes.
+    """
+    if os.environ.get("XCSP_BUILD_CACHE_DIR"):
+        return Path(os.environ["XCSP_BUILD_CACHE_DIR"])
+    return get_cache_dir() / "builds"
+
+def get_download_cache_dir() -> Path:
+    """Return the directory where downloaded files are cached.
+
+    The location can be overridden with the ``XCSP_DOWNLOAD_CACHE_DIR`` environment variable,
+    e.g. to share the cache between several nodes.
+    """
+    if os.environ.get("XCSP_DOWNLOAD_CACHE_DIR"):
+        return Path(os.environ["XCSP_DOWNLOAD_CACHE_DIR"])
+    return get_cache_dir() / "downloads"
+
+def get_git_mirror_dir() -> Path:
+    """Return the directory where the bare mirrors of solver repositories are stored.
+
+    The location can be overridden with the ``XCSP_GIT_MIRROR_DIR`` environment variable.
+    """
+    if os.environ.get("XCSP_GIT_MIRROR_DIR"):
+        return Path(os.environ["XCSP_GIT_MIRROR_DIR"])
+    return get_cache_dir() / "git-mirrors"
+
 def get_solver_install_dir() -> Path:
     """Return the directory where solver sources are downloaded and compiled."""
     return Path(user_data_dir(__title__, __title__)) / "solvers"
@@ -103,6 +132,9 @@ def print_path_summary():
     table.add_row("🧪 Solver config dir", str(get_solver_config_dir()))
     table.add_row("⚙️ User preferences", str(get_user_preferences_dir()))
     table.add_row("🧠 Cache directory (logs)", str(get_cache_dir()))
+    table.add_row("📦 Build cache directory", str(get_build_cache_dir()))
+    table.add_row("📥 Download cache directory", str(get_download_cache_dir()))
+    table.add_row("🪞 Git mirrors directory", str(get_git_mirror_dir()))
 
     console.print(table)
 
@@ -1,3 +1,4 @@
+import os
 import shlex
 import shutil
 import re
@@ -26,14 +27,36 @@ def normalize_placeholders(text: str) -> str:
     return pattern.sub(lambda m: "{{"+ m.group(1).lower() +"}}", text)
 
 
-def replace_placeholder(cmd):
+def available_cores() -> int:
+    """ Return the number of cores available to the current process."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def replace_parallelism_placeholders(cmd, jobs=None):
+    """ Replace the placeholders {{cores}} and {{jobs}} in a command string.
+    Args:
+        cmd (str): The command string containing placeholders.
+        jobs (int): The number of jobs granted to the command (defaults to the number of available cores).
+    Returns:
+        str: The command string with {{cores}} replaced by the number of available cores,
+            and {{jobs}} by the number of jobs.
+    """
+    cores = available_cores()
+    cmd = normalize_placeholders(cmd)
+    return cmd.replace("{{cores}}", str(cores)).replace("{{jobs}}", str(jobs if jobs is not None else cores))
+
+
+def replace_placeholder(cmd, jobs=None):
     """ Replace placeholders in a command string with their corresponding values.
     Args:
         cmd (str): The command string containing placeholders.
+        jobs (int): The value of the {{jobs}} placeholder (defaults to the number of available cores).
     Returns:
         list: A list of command arguments with placeholders replaced.
     """
-    cmd = normalize_placeholders(cmd)
+    cmd = replace_parallelism_placeholders(cmd, jobs)
     for k, v in PLACEHOLDERS.items():
         cmd = cmd.replace(k, str(v))
     return shlex.split(cmd)
@@ -75,6 +98,19 @@ def replace_dir(cmd, dir, key):
     return normalize_placeholders(cmd).replace("{{"+key+"}}", dir)
 
 def replace_core_placeholder(cmd, executable, bin_dir, options):
+    """
+    Replace the placeholders {{executable}}, {{bin_dir}} and {{options}} in a command template.
+
+    Args:
+        cmd (str): The command template.
+        executable (str | Path): The executable of the solver.
+        bin_dir (str | Path): The binary directory of the solver.
+        options (str | None): The options always given to the solver (``always_include_options``),
+            split as a shell would. Without them, {{options}} is removed from the command.
+
+    Returns:
+        list[str]: The command, as a list of arguments.
+    """
     cmds = cmd.split()
     result = []
     for item in cmds:
@@ -88,7 +124,7 @@ def replace_core_placeholder(cmd, executable, bin_dir, options):
             result.append(r)
             continue
         if "{{options}}" in r:
-            for opt in shlex.split(options):
+            for opt in shlex.split(options or ""):
                 result.append(opt.strip())
             continue
         result.append(r)
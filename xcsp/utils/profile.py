@@ -0,0 +1,344 @@
+"""Step profiling for XCSP Launcher.
+
+A :class:`Profiler` records the steps of a long operation (e.g. the installation of a solver):
+for each step, its wall-clock time, the CPU time spent in the launcher thread running it and in
+the processes it spawned, and the peak memory of these processes.
+Steps can be nested and run from several threads: each thread has its own stack of steps.
+
+The whole launcher can also be profiled (see :func:`profile_launcher`): its functions are then
+profiled with cProfile, while its main phases (solver lookup, spawn, output parsing, ...) are
+recorded as steps. The steps can be exported as a trace in the Chrome Trace Event format, which
+can be opened in Perfetto (https://ui.perfetto.dev) or chrome://tracing, where each thread of each
+process is a track.
+"""
+import cProfile
+import itertools
+import sys
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+
+class StepRecord:
+    """Measurements of a single step."""
+
+    __slots__ = ("id", "name", "category", "attrs", "pid", "tid", "thread", "start", "wall", "cpu", "max_rss",
+                 "parent")
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name: str, category: str, attrs: dict, start: float, parent: "StepRecord | None"):
+        self.id = next(StepRecord._ids)
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.pid = os.getpid()
+        self.tid = threading.get_native_id()
+        self.thread = threading.current_thread().name
+        self.start = start
+        self.wall = None
+        self.cpu = 0.0
+        self.max_rss = None
+        self.parent = parent
+
+    def add_child_usage(self, cpu: float, max_rss: int | None):
+        """
+        Account for the resources used by a process spawned during this step (and its ancestors).
+
+        Args:
+            cpu (float): CPU time (user and system) of the process, in seconds.
+            max_rss (int | None): Peak resident memory of the process, in bytes.
+        """
+        record = self
+        while record is not None:
+            record.cpu += cpu
+            if max_rss is not None:
+                record.max_rss = max(record.max_rss or 0, max_rss)
+            record = record.parent
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "category": self.category,
+            "attrs": self.attrs,
+            "pid": self.pid,
+            "tid": self.tid,
+            "thread": self.thread,
+            "start": self.start,
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "max_rss": self.max_rss,
+            "parent": self.parent.id if self.parent is not None else None,
+        }
+
+
+class Profiler:
+    """Thread-safe recorder of steps."""
+
+    def __init__(self):
+        self._records: List[StepRecord] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self.epoch = time.time()
+        self.started_at = datetime.fromtimestamp(self.epoch)
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def current(self) -> StepRecord | None:
+        """Return the innermost step running in the calling thread."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def step(self, name: str, category: str = "step", **attrs):
+        """
+        Record a step.
+
+        Args:
+            name (str): The name of the step (steps with the same name are aggregated in summaries).
+            category (str): The category of the step.
+            **attrs: Additional information about the step (e.g. the version being installed).
+
+        Yields:
+            StepRecord: The record of the step.
+        """
+        stack = self._stack()
+        record = StepRecord(name, category, attrs, time.perf_counter() - self._origin, self.current())
+        stack.append(record)
+        cpu_start = time.thread_time()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - self._origin - record.start
+            # Child processes were already accounted for, in this step and its ancestors.
+            record.cpu += time.thread_time() - cpu_start
+            stack.pop()
+            with self._lock:
+                self._records.append(record)
+
+    def records(self) -> List[StepRecord]:
+        """Return the steps recorded so far, in the order they ended."""
+        with self._lock:
+            return list(self._records)
+
+    def merge(self, records: List[StepRecord], epoch: float, parent: StepRecord | None = None):
+        """
+        Add the steps recorded by another profiler, possibly in another process.
+
+        Args:
+            records (list): The steps recorded by the other profiler (they are modified).
+            epoch (float): The time (since the Epoch) at which the other profiler started.
+            parent (StepRecord | None): The step under which the top-level steps of the other profiler ran.
+        """
+        offset = epoch - self.epoch
+        for record in records:
+            # Identifiers are only unique within a process.
+            record.id = next(StepRecord._ids)
+            record.start += offset
+            if record.parent is None:
+                record.parent = parent
+        with self._lock:
+            self._records.extend(records)
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "steps": [r.to_dict() for r in sorted(self.records(), key=lambda r: r.start)],
+        }
+
+    def save(self, path: Path) -> Path:
+        """Write the profile as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        return path
+
+    def to_trace(self) -> dict:
+        """
+        Export the recorded steps in the Chrome Trace Event format.
+
+        Returns:
+            dict: The trace, with one complete event per step (timestamps in microseconds since the Epoch).
+        """
+        events = []
+        threads = dict()
+        for record in sorted(self.records(), key=lambda r: r.start):
+            args = dict(record.attrs)
+            args["cpu"] = round(record.cpu, 6)
+            if record.max_rss is not None:
+                args["max_rss"] = record.max_rss
+            events.append({"name": record.name, "cat": record.category, "ph": "X", "pid": record.pid,
+                           "tid": record.tid, "ts": round((self.epoch + record.start) * 1e6),
+                           "dur": round(record.wall * 1e6), "args": args})
+            threads[(record.pid, record.tid)] = record.thread
+        for pid in sorted({pid for pid, _ in threads}):
+            name = "xcsp" if pid == os.getpid() else f"xcsp worker {pid}"
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}})
+        for (pid, tid), name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_trace(self, path: Path) -> Path:
+        """Write the recorded steps as a trace in the Chrome Trace Event format."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_trace(), f, default=str)
+        return path
+
+    def summary(self, exclude_categories=()) -> Dict[str, dict]:
+        """
+        Aggregate the recorded steps by name.
+
+        Args:
+            exclude_categories: Categories of steps left out of the summary.
+
+        Returns:
+            dict: For each step name (by decreasing total wall time), the number of calls,
+                the total and maximum wall time, the total CPU time and the peak memory.
+        """
+        summary = defaultdict(lambda: {"calls": 0, "wall": 0.0, "max_wall": 0.0, "cpu": 0.0, "max_rss": None})
+        for record in self.records():
+            if record.category in exclude_categories:
+                continue
+            entry = summary[record.name]
+            entry["calls"] += 1
+            entry["wall"] += record.wall
+            entry["max_wall"] = max(entry["max_wall"], record.wall)
+            entry["cpu"] += record.cpu
+            if record.max_rss is not None:
+                entry["max_rss"] = max(entry["max_rss"] or 0, record.max_rss)
+        return dict(sorted(summary.items(), key=lambda item: -item[1]["wall"]))
+
+    def print_summary(self, title: str, total: float | None = None, exclude_categories=(),
+                      console: Console | None = None):
+        """
+        Print the summary of the recorded steps as a table.
+
+        Args:
+            title (str): The title of the table.
+            total (float | None): The duration of the whole operation, used to compute the share of each step.
+            exclude_categories: Categories of steps left out of the summary.
+            console (Console | None): The console on which the table is printed (standard output by default).
+        """
+        table = Table(title=title)
+        table.add_column("Step")
+        table.add_column("Calls", justify="right")
+        table.add_column("Wall (s)", justify="right")
+        table.add_column("Max wall (s)", justify="right")
+        table.add_column("CPU (s)", justify="right")
+        table.add_column("Peak memory", justify="right")
+        if total:
+            table.add_column("Share", justify="right")
+        for name, entry in self.summary(exclude_categories).items():
+            row = [name, str(entry["calls"]), f"{entry['wall']:.2f}", f"{entry['max_wall']:.2f}",
+                   f"{entry['cpu']:.2f}", format_size(entry["max_rss"])]
+            if total:
+                row.append(f"{100 * entry['wall'] / total:.1f}%")
+            table.add_row(*row)
+        (console or Console()).print(table)
+
+
+def format_size(size: int | None) -> str:
+    """Format a size in bytes for humans."""
+    if size is None:
+        return "-"
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+_ACTIVE: Profiler | None = None
+
+
+def active_profiler() -> Profiler | None:
+    """Return the profiler recording the steps of the current operation, if any."""
+    return _ACTIVE
+
+
+def set_active_profiler(profiler: Profiler | None):
+    """Set the profiler recording the steps of the current operation (None to stop profiling)."""
+    global _ACTIVE
+    _ACTIVE = profiler
+
+
+@contextmanager
+def step(name: str, category: str = "step", **attrs):
+    """
+    Record a step with the active profiler (does nothing if there is none).
+
+    Yields:
+        StepRecord | None: The record of the step, or None if no profiler is active.
+    """
+    profiler = _ACTIVE
+    if profiler is None:
+        yield None
+        return
+    with profiler.step(name, category, **attrs) as record:
+        yield record
+
+
+def record_child_usage(cpu: float, max_rss: int | None):
+    """Account for the resources used by a process spawned in the current step of the calling thread."""
+    profiler = _ACTIVE
+    record = profiler.current() if profiler is not None else None
+    if record is not None:
+        record.add_child_usage(cpu, max_rss)
+
+
+@contextmanager
+def profile_launcher(name: str, output: Path | None = None, trace: Path | None = None):
+    """
+    Profile the launcher while running a command.
+
+    Args:
+        name (str): The name of the command.
+        output (Path | None): If given, the functions of the launcher are profiled with cProfile, and
+            the stats are written to this file when the command ends; the phases recorded with
+            :func:`step` are then saved next to it (as JSON) and summarized on the standard error
+            (the standard output may hold results).
+        trace (Path | None): If given, the file to which the steps are exported in the Chrome Trace Event format.
+
+    Yields:
+        Profiler: The profiler recording the steps.
+    """
+    profiler = Profiler()
+    previous = active_profiler()
+    set_active_profiler(profiler)
+    functions = cProfile.Profile() if output is not None else None
+    if functions is not None:
+        functions.enable()
+    try:
+        with profiler.step(name, "command") as command:
+            yield profiler
+    finally:
+        if functions is not None:
+            functions.disable()
+        set_active_profiler(previous)
+        console = Console(file=sys.stderr)
+        if functions is not None:
+            output = Path(output)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            functions.dump_stats(output)
+            profiler.save(output.with_suffix(".json"))
+            profiler.print_summary(f"Profile of '{name}'", command.wall, exclude_categories=("command",),
+                                   console=console)
+            console.print(f"Profile saved in {output} (see python -m pstats).")
+        if trace is not None:
+            console.print(f"Trace saved in {profiler.save_trace(trace)} (open it with https://ui.perfetto.dev).")
@@ -0,0 +1,93 @@
+"""Utilities for size-bounded on-disk caches.
+
+A cache is a directory whose direct children are the cached entries (files or directories).
+The modification time of an entry is used as its last access time, so that the least
+recently used entries are evicted first when the cache exceeds its size limit.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import List, Tuple
+
+from loguru import logger
+
+
+def entry_size(path: Path) -> int:
+    """
+    Compute the size in bytes of a cache entry.
+
+    Args:
+        path (Path): A file or a directory.
+
+    Returns:
+        int: The size of the file, or the total size of the files in the directory.
+    """
+    path = Path(path)
+    if path.is_symlink() or path.is_file():
+        return path.lstat().st_size
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def touch(path: Path):
+    """Mark a cache entry as recently used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def remove_entry(path: Path):
+    """Remove a cache entry, ignoring entries already removed (e.g. by another process)."""
+    path = Path(path)
+    try:
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def evict_least_recently_used(root: Path, max_size: int, ignore_prefix: str = ".") -> List[Path]:
+    """
+    Remove the least recently used entries of a cache until its size is at most ``max_size``.
+
+    Args:
+        root (Path): The cache directory.
+        max_size (int): The maximum size of the cache, in bytes.
+        ignore_prefix (str): Entries whose name starts with this prefix (temporary entries,
+            lock files) are never evicted nor counted.
+
+    Returns:
+        list[Path]: The evicted entries.
+    """
+    root = Path(root)
+    if not root.exists():
+        return []
+    entries: List[Tuple[float, int, Path]] = []
+    for child in root.iterdir():
+        if child.name.startswith(ignore_prefix):
+            continue
+        try:
+            entries.append((child.lstat().st_mtime, entry_size(child), child))
+        except OSError:
+            continue
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    for _, size, child in sorted(entries, key=lambda e: e[0]):
+        if total <= max_size:
+            break
+        logger.debug(f"Evicting cache entry {child} ({size} bytes).")
+        remove_entry(child)
+        total -= size
+        evicted.append(child)
+    if evicted:
+        logger.info(f"Evicted {len(evicted)} entries from {root}.")
+    return evicted
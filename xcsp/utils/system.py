@@ -1,6 +1,14 @@
+import os
 import platform
+import subprocess
+import sys
 from loguru import logger
 import psutil
+
+from xcsp.utils.metrics import TIMEOUT_SIGNALS
+from xcsp.utils.profile import record_child_usage
+
+
 def is_system_compatible(system_config) -> bool:
     """
     Check if the current system is compatible with the given system config.
@@ -34,11 +42,30 @@ def normalized_system_name():
 
 
 def kill_process(process, timeout, solver):
+    """
+    Kill a solver which did not stop after its time limit, together with the processes it spawned.
+
+    The processes spawned by a solver (e.g. the workers of a parallel solver) inherit its standard
+    output: if they survived it, the launcher would wait for them to close it.
+
+    Args:
+        process (psutil.Process): The process of the solver.
+        timeout (float): The time limit of the solver, in seconds.
+        solver: The solver, marked as timed out.
+    """
     try:
         if process.is_running():
             logger.warning(f"Solver exceeded time limit of {timeout}s. Killing process.")
+            # The children are listed first: they are no longer those of the solver once it is killed.
+            children = process.children(recursive=True)
             process.kill()
+            for child in children:
+                try:
+                    child.kill()
+                except psutil.NoSuchProcess:
+                    pass
             logger.info(f"Process killed successfully after exceeding time limit.")
+            TIMEOUT_SIGNALS.inc(signal="SIGKILL")
             solver.set_is_timeout(True)
         else:
             logger.info("Process already terminated before timeout.")
@@ -55,6 +82,7 @@ def term_process(process, timeout, solver):
             logger.warning(f"Send a SIGTERM to process after {timeout}s.")
             process.terminate()
             logger.info(f"SIGTERM send successfully.")
+            TIMEOUT_SIGNALS.inc(signal="SIGTERM")
             solver.set_is_timeout(True)
         else:
             logger.info("Process already terminated before timeout.")
@@ -63,4 +91,60 @@ def term_process(process, timeout, solver):
     except psutil.AccessDenied:
         logger.error("Permission denied while trying to terminate the process.")
     except Exception as e:
-        logger.exception(f"An error occurred while trying to terminate the process: {e}")
\ No newline at end of file
+        logger.exception(f"An error occurred while trying to terminate the process: {e}")
+
+
+def wait_cpu_time(process) -> float | None:
+    """
+    Wait for the end of a process started with :class:`psutil.Popen`, and measure the CPU time it used.
+
+    The process is first waited for without being reaped (``os.waitid`` with ``WNOWAIT``), so that
+    its CPU times (including those of the processes it waited for) can still be read, then it is
+    reaped as usual.
+
+    Args:
+        process (psutil.Popen): The process.
+
+    Returns:
+        float | None: The CPU time of the process, in seconds, or None if it cannot be measured on this system.
+    """
+    cpu_time = None
+    if hasattr(os, "waitid"):
+        try:
+            os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+            times = process.cpu_times()
+            cpu_time = times.user + times.system + times.children_user + times.children_system
+        except (OSError, psutil.Error):
+            pass
+    process.wait()
+    return cpu_time
+
+
+def run_with_usage(args, **kwargs) -> int:
+    """
+    Run a command and wait for it, accounting for the resources it used in the current profiling step.
+
+    On POSIX systems, the CPU time and the peak memory of the process (including the processes it
+    waited for) are read with ``os.wait4``; elsewhere, only the wall time of the step is known.
+
+    Args:
+        args: The command, as accepted by :class:`subprocess.Popen`.
+        **kwargs: Additional arguments for :class:`subprocess.Popen`.
+
+    Returns:
+        int: The exit code of the command.
+    """
+    process = subprocess.Popen(args, **kwargs)
+    if not hasattr(os, "wait4"):
+        return process.wait()
+    try:
+        _, status, usage = os.wait4(process.pid, 0)
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in kilobytes on Linux, in bytes on macOS.
+    max_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    record_child_usage(usage.ru_utime + usage.ru_stime, max_rss)
+    return process.returncode
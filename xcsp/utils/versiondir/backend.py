@@ -1,32 +1,72 @@
+import hashlib
 import os.path
+import re
+import threading
 from abc import ABC, abstractmethod
+from pathlib import Path
 
-from git import Repo
+from git import Repo, GitCommandError
 from loguru import logger
 from timeit import default_timer as timer
 
-from xcsp.utils.archive import extract_archive
-from xcsp.utils.http import download
+from xcsp.utils.archive import download_and_extract
+from xcsp.utils.gitmirror import MIRRORS, submodule_jobs
+from xcsp.utils.http import DOWNLOADS
 from xcsp.utils.system import normalized_system_name
 import requests
 
-def _download(v, version_path):
+WORKTREES_DIR = ".worktrees"
+"""Name of the directory, inside a cloned solver, holding the worktree of each version."""
+
+
+def _version_url(v):
     url = v.get("urls", dict()).get(normalized_system_name())
     if url is None:
         logger.error(
             f"The version {v.get('version')} has no URL for the current system {normalized_system_name()}.")
+    return url
+
+
+def _version_checksum(v):
+    """Return the expected SHA-256 digest of the archive of a version, if the configuration declares one."""
+    checksum = v.get("sha256")
+    if isinstance(checksum, dict):
+        return checksum.get(normalized_system_name())
+    return checksum
+
+
+def _download_and_extract_version(v, repo_path):
+    """Download the archive of a version into its tmp directory, and extract it into its source directory."""
+    url = _version_url(v)
+    if url is None:
         return None
-    logger.info(f"Downloading version {v.get('version')} from {url} to {version_path}/tmp")
-    archive_name = url.split("/")[-1]
-    try:
-        path = version_path / "tmp" / archive_name
-        download(url, path)
-        logger.info(f"Version {v.get('version')} downloaded successfully.")
-        return path
-    except requests.RequestException as e:
-        logger.error(f"Failed to download version {v.get('version')} from {url}: {e}")
-        return None
+    version_path = repo_path / v.get("version")
+    start = timer()
+    path = download_and_extract(url, version_path / "tmp" / url.split("/")[-1], version_path / "source",
+                                _version_checksum(v))
+    logger.success(f"Version {v.get('version')} downloaded and extracted in {timer() - start:.2f} seconds.")
+    return path
+
+
+def _download_versions(versions, repo_path):
+    """
+    Download and extract the archives of several versions concurrently.
+
+    Args:
+        versions (list): The versions, as described in the solver configuration.
+        repo_path (Path): The directory in which each version has its own directory.
 
+    Returns:
+        list: For each version, the path of its downloaded archive, or None if it cannot be installed.
+    """
+    results = DOWNLOADS.run_all(lambda v: _download_and_extract_version(v, repo_path), versions)
+    archives = []
+    for v, result in zip(versions, results):
+        if isinstance(result, Exception):
+            logger.opt(exception=result).error(f"Failed to download and extract version {v.get('version')}: {result}")
+            result = None
+        archives.append(result)
+    return archives
 
 
 class Backend(ABC):
@@ -70,19 +110,76 @@ class Backend(ABC):
     def get_cwd(self):
         return self._cwd
 
+    def supports_isolated_versions(self) -> bool:
+        """
+        Tell whether each version can be checked out into its own directory,
+        allowing several versions to be built concurrently.
+        """
+        return False
+
+    def resolve_revision(self, version: str) -> str | None:
+        """
+        Resolve a version to an immutable revision identifier (e.g. a commit hash).
+
+        Returns:
+            str | None: The revision, or None if the backend cannot identify it.
+        """
+        return None
+
+    def checkout(self, version: str) -> Path:
+        """
+        Make the sources of a version available and return their path.
+
+        The default implementation switches the shared working directory to the version,
+        so that versions must be processed one at a time.
+
+        Args:
+            version (str): The version to check out.
+
+        Returns:
+            Path: The source path of the version.
+        """
+        self.change_version(version)
+        return Path(self.get_source_path())
+
+    def release(self, version: str):
+        """
+        Release the sources of a version checked out with :meth:`checkout`.
+
+        Args:
+            version (str): The version to release.
+        """
+        self.restore()
+
+    def cleanup(self):
+        """
+        Remove the temporary data created while checking out versions.
+        """
+        pass
+
 
 class GitVersionBackend(Backend):
     def init(self):
         start_time = timer()
-        logger.info(f"Cloning the solver from {self._meta.get('git')} into {self._repo_path}")
-        self._repo = self._repo = Repo(self._repo_path) if os.path.exists(self._repo_path) else Repo.clone_from(
-            self._meta.get("git"), self._repo_path, recursive=True)
-        # o = self._repo.remotes.origin
-        # o.pull()
-        logger.info(f"Repository cloned in {timer() - start_time:.2f} seconds.")
+        url = self._meta.get("git")
+        if os.path.exists(self._repo_path):
+            self._repo = Repo(self._repo_path)
+            try:
+                MIRRORS.fetch(self._repo, url)
+            except GitCommandError as e:
+                logger.warning(f"Unable to fetch the new revisions of {url}: {e}")
+            logger.info(f"Repository updated in {timer() - start_time:.2f} seconds.")
+        else:
+            logger.info(f"Cloning the solver from {url} into {self._repo_path}")
+            # Only tagged versions are built: file contents can be fetched lazily, when checked out.
+            partial = all(v.get("git_tag") for v in self._meta.get("versions", []))
+            self._repo = MIRRORS.clone(url, self._repo_path, partial=partial)
+            logger.info(f"Repository cloned in {timer() - start_time:.2f} seconds.")
         self._original_version = self._repo.active_branch.name if not self._repo.head.is_detached else self._repo.head.object.hexsha
         self._current_version = self._original_version
         self._cwd = self._repo_path
+        self._worktree_lock = threading.Lock()
+        self._exclude_worktrees()
 
     def change_version(self, version: str):
         self._repo.git.checkout(version)
@@ -91,45 +188,92 @@ class GitVersionBackend(Backend):
     def get_source_path(self):
         return self.get_cwd()
 
+    def _exclude_worktrees(self):
+        """Hide the worktree directory from the status of the main working tree."""
+        exclude = Path(self._repo.git_dir) / "info" / "exclude"
+        entry = f"/{WORKTREES_DIR}/"
+        content = exclude.read_text() if exclude.exists() else ""
+        if entry not in content.splitlines():
+            exclude.parent.mkdir(parents=True, exist_ok=True)
+            with open(exclude, "a") as f:
+                f.write(("" if content.endswith("\n") or not content else "\n") + entry + "\n")
+
+    def _worktree_path(self, version: str) -> Path:
+        return Path(self._repo_path) / WORKTREES_DIR / re.sub(r"[^A-Za-z0-9._-]", "_", version)
+
+    def supports_isolated_versions(self) -> bool:
+        return True
+
+    def resolve_revision(self, version: str) -> str | None:
+        try:
+            return self._repo.git.rev_parse(f"{version}^{{commit}}")
+        except GitCommandError:
+            logger.warning(f"Unable to resolve the revision of version {version}.")
+            return None
+
+    def checkout(self, version: str) -> Path:
+        """
+        Check out a version into its own git worktree.
+
+        An existing worktree already at the right revision is reused as is.
+        """
+        path = self._worktree_path(version)
+        revision = self.resolve_revision(version)
+        with self._worktree_lock:
+            if path.exists():
+                try:
+                    current = Repo(path).head.commit.hexsha
+                except Exception:
+                    current = None
+                if current is not None and current == revision:
+                    logger.info(f"Reusing the up-to-date worktree of version {version} in {path}.")
+                    return path
+                logger.info(f"Removing the outdated worktree of version {version} in {path}.")
+                self._repo.git.worktree("remove", "--force", str(path))
+            self._repo.git.worktree("prune")
+            start_time = timer()
+            self._repo.git.worktree("add", "--detach", "--force", str(path), revision or version)
+            Repo(path).git.submodule("update", "--init", "--recursive", "--jobs", str(submodule_jobs()))
+            logger.info(f"Worktree of version {version} created in {timer() - start_time:.2f} seconds.")
+        return path
+
+    def release(self, version: str):
+        path = self._worktree_path(version)
+        with self._worktree_lock:
+            if path.exists():
+                self._repo.git.worktree("remove", "--force", str(path))
+
+    def cleanup(self):
+        with self._worktree_lock:
+            self._repo.git.worktree("prune")
+            root = Path(self._repo_path) / WORKTREES_DIR
+            if root.exists() and not any(root.iterdir()):
+                root.rmdir()
+
 
 
 
 class ArchiveVersionBackend(Backend):
     def init(self):
         global_timer = timer()
-        for index, v in enumerate(self._meta.get("versions", [])):
-            logger.info(f"Starting to initialize (download and extract) version: {v.get('version')}")
+        versions = self._meta.get("versions", [])
+        for index, v in enumerate(versions):
             version_path = self._repo_path / v.get("version")
-            version_path.mkdir(parents=True, exist_ok=True)
-
             if index == 0:
                 self._current_version = v.get("version")
                 self._original_version = v.get("version")
                 self._cwd = version_path
+            (version_path / "tmp").mkdir(parents=True, exist_ok=True)
+            (version_path / "source").mkdir(parents=True, exist_ok=True)
 
-
-            tmp_path = version_path / "tmp"
-            tmp_path.mkdir(parents=True, exist_ok=True)
-
-            source_path = version_path / "source"
-            source_path.mkdir(parents=True, exist_ok=True)
-
-            download_timer = timer()
-            archive_name = _download(v, version_path)
-            logger.success(f"Download completed in {timer() - download_timer:.2f} seconds for version {v.get('version')}.")
+        archives = _download_versions(versions, self._repo_path)
+        for v, archive_name in zip(versions, archives):
             if archive_name is None:
-                logger.error(f"Failed to download version {v.get('version')}. Skipping.")
-                continue
-            try:
-                extract_timer = timer()
-                extract_archive(archive_name, source_path)
-                logger.success(f"Archive {archive_name} extracted successfully for version {v.get('version')} in {timer() - extract_timer:.2f} seconds.")
-            except Exception as e:
-                logger.error(f"Failed to extract archive {archive_name} for version {v.get('version')}: {e}")
-                logger.exception(e)
-                continue
-            logger.success(f"Version {v.get('version')} initialized successfully in {timer() - global_timer:.2f} seconds.")
+                logger.error(f"Failed to initialize version {v.get('version')}. Skipping.")
+            else:
+                logger.success(f"Version {v.get('version')} initialized successfully.")
         logger.info("All versions processed in {:.2f} seconds.".format(timer() - global_timer))
+
     def change_version(self, version: str):
         version_path = self._repo_path / version
         if not version_path.is_dir() or not version_path.exists():
@@ -140,6 +284,28 @@ class ArchiveVersionBackend(Backend):
     def get_source_path(self):
         return self.get_cwd() / "source"
 
+    def supports_isolated_versions(self) -> bool:
+        return True
+
+    def resolve_revision(self, version: str) -> str | None:
+        """Identify a version by the SHA-256 digest of its downloaded archive."""
+        tmp_path = self._repo_path / version / "tmp"
+        archives = sorted(p for p in tmp_path.iterdir() if p.is_file()) if tmp_path.exists() else []
+        if not archives:
+            return None
+        digest = hashlib.sha256()
+        for archive in archives:
+            with open(archive, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        return f"sha256:{digest.hexdigest()}"
+
+    def checkout(self, version: str) -> Path:
+        return self._repo_path / version / "source"
+
+    def release(self, version: str):
+        pass
+
 
 class LocalUserVersionBackend(Backend):
     def init(self):
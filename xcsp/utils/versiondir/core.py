@@ -8,9 +8,8 @@ class VersionDirectory:
         self._root_path = root_path
         self._meta_info = meta_info
         local_path = meta_info.get("path", None)
-        is_local_git = (local_path / ".git").exists() if local_path else False
         self._impl = None
-        if local_path or is_local_git:
+        if local_path:
             self._impl = LocalUserVersionBackend(self._root_path, self._meta_info)
         elif meta_info.get("git",None) is not None:
             self._impl = GitVersionBackend(self._root_path, self._meta_info)
@@ -44,4 +43,34 @@ class VersionDirectory:
         """
         Returns the source path of the current version.
         """
-        return self._impl.get_source_path()
\ No newline at end of file
+        return self._impl.get_source_path()
+
+    def supports_isolated_versions(self) -> bool:
+        """
+        Returns True if versions can be checked out (and built) concurrently.
+        """
+        return self._impl.supports_isolated_versions()
+
+    def resolve_revision(self, version: str) -> str | None:
+        """
+        Returns an immutable identifier of the given version, if available.
+        """
+        return self._impl.resolve_revision(version)
+
+    def checkout(self, version: str) -> Path:
+        """
+        Makes the sources of the given version available and returns their path.
+        """
+        return self._impl.checkout(version)
+
+    def release(self, version: str) -> None:
+        """
+        Releases the sources of a version previously checked out.
+        """
+        self._impl.release(version)
+
+    def cleanup(self) -> None:
+        """
+        Removes the temporary data created while checking out versions.
+        """
+        self._impl.cleanup()
\ No newline at end of file